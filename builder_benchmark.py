@@ -0,0 +1,53 @@
+import runpy
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+from pyreporter import Report, DocX, TextDocX, ReportBuilder
+
+DEMO_LIST = ['hydro_demo.py', 'load_demo.py', 'pier_demo.py', 'ushell_demo.py']
+WRITER_LIST = [('DocX', DocX), ('TextDocX', TextDocX), ('ReportBuilder', ReportBuilder)]
+REPEAT = 5
+
+
+# the demos build their reports and save them, save is replaced to keep
+# the report instead.
+def load_report(path):
+    report_list = list()
+    save = Report.save
+    Report.save = lambda self, path=None: report_list.append(self)
+    try:
+        runpy.run_path(path, run_name='__main__')
+    finally:
+        Report.save = save
+    return report_list[-1]
+
+
+def save_with(report, writer_class):
+    report.set_writer(writer_class())
+    return report.save(BytesIO())
+
+
+def measure(report, writer_class):
+    best = None
+    for i in range(REPEAT):
+        start = time.perf_counter()
+        save_with(report, writer_class)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    save_with(report, writer_class)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+if __name__ == '__main__':
+    demo_list = sys.argv[1:] or DEMO_LIST
+    print(f'{"demo":<20}{"writer":<16}{"time (ms)":>12}{"peak (KiB)":>12}')
+    for demo in demo_list:
+        report = load_report(demo)
+        for name, writer_class in WRITER_LIST:
+            best, peak = measure(report, writer_class)
+            print(f'{demo:<20}{name:<16}{best * 1000:>12.1f}{peak / 1024:>12.0f}')
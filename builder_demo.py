@@ -1,22 +1,18 @@
 from pyreporter.docbuilder import ReportBuilder
+from pyreporter.profiler import Profiler
 
 
 if __name__ == '__main__':
-    import cProfile, pstats, io
-    pr = cProfile.Profile()
-    pr.enable()
-    rep = ReportBuilder()
-    rep.heading(1, 'hello')
-    rep.paragraph('hello')
-    rep.heading(2, 'hello again')
-    rep.paragraph('hello again')
-    rep.heading(3, 'hello again again')
-    rep.paragraph('hello again again')
-    rep.save('builder_demo.docx')
-    pr.disable()
-    s = io.StringIO()
-    sortby = 'cumulative'
-    ps = pstats.Stats(pr, stream=s).sort_stats(sortby)
-    ps.print_stats()
-    print(s.getvalue())
+    import pstats
+    with Profiler(cprofile=True) as profiler:
+        rep = ReportBuilder()
+        rep.heading(1, 'hello')
+        rep.paragraph('hello')
+        rep.heading(2, 'hello again')
+        rep.paragraph('hello again')
+        rep.heading(3, 'hello again again')
+        rep.paragraph('hello again again')
+        rep.save('builder_demo.docx')
+    print(profiler.format_summary())
+    pstats.Stats(profiler.cprofile).sort_stats('cumulative').print_stats(20)
 
@@ -0,0 +1,40 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+REPEAT = 20
+
+# the modules left until they are used, which import pyreporter should not
+# load
+LAZY_LIST = ['PIL', 'pyreporter.docbuilder', 'pyreporter.textdocx', 'pyreporter.xlsx',
+             'pyreporter.cache', 'pyreporter.volume']
+
+# the bytecode is written, as an installed package has it, or every run
+# would compile the modules again
+ENVIRON = {k: v for k, v in os.environ.items() if k != 'PYTHONDONTWRITEBYTECODE'}
+
+
+# cumulative import time of pyreporter in microseconds, from -X importtime
+# of a fresh interpreter.
+def import_time(module):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, check=True, env=ENVIRON)
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s*\d+ \|\s*(\d+) \| (\S+)$', line)
+        if match and match.group(2) == module:
+            return int(match.group(1))
+
+
+if __name__ == '__main__':
+    module = sys.argv[1] if len(sys.argv) > 1 else 'pyreporter'
+    # the first run compiles the modules
+    import_time(module)
+    times = [import_time(module) for i in range(REPEAT)]
+    print(f'{module}: median {statistics.median(times) / 1000:.1f} ms, '
+          f'min {min(times) / 1000:.1f} ms over {REPEAT} runs')
+    check = subprocess.run([sys.executable, '-c', f'import sys, {module}; '
+                            f'print(*[m for m in {LAZY_LIST!r} if m in sys.modules])'],
+                           capture_output=True, text=True, check=True, env=ENVIRON)
+    print(f'lazy modules imported: {check.stdout.strip() or "none"}')
@@ -1,2 +1,13 @@
 from .docx import DocX
 from .reporter import Report, Block, Content, Paragraph, Figure, Math, DefaultCover, Definition, Procedure, Note, VariableValue
+
+# the other writers are imported when they are first asked for, as
+# pyreporter.TextDocX, so a report written by DocX never loads them.
+_LAZY_WRITERS = {'TextDocX': 'textdocx', 'ReportBuilder': 'docbuilder'}
+
+
+def __getattr__(name):
+    if name in _LAZY_WRITERS:
+        import importlib
+        return getattr(importlib.import_module(f'.{_LAZY_WRITERS[name]}', __name__), name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
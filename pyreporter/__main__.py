@@ -0,0 +1,4 @@
+import sys
+from .batch import main
+
+sys.exit(main())
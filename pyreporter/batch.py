@@ -0,0 +1,177 @@
+import os
+import sys
+import json
+import hashlib
+import time
+import runpy
+import importlib
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+__all__ = ['Job', 'JobResult', 'load_manifest', 'job_key', 'read_checkpoint', 'run_batch', 'main']
+
+# a job either runs a script, which saves its report by itself, or calls
+# a factory 'module:callable' with params and saves the returned report
+# to output.
+# script jobs get params as the global 'params', and argv as sys.argv[1:].
+Job = namedtuple('Job', ['name', 'script', 'factory', 'params', 'output', 'argv', 'cwd'])
+JobResult = namedtuple('JobResult', ['name', 'seconds', 'error'])
+
+
+# manifest is a json file, either a list of jobs or {"jobs": [...]}.
+# relative paths are taken from the directory of the manifest.
+# a job is named by its name, or by its output or script, with '#' and its
+# number in the manifest when jobs share the output or script, as the jobs
+# running one script with different params. names are unique.
+def load_manifest(path):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data['jobs']
+
+    default_list = [item.get('output') or item.get('script') for item in data]
+    base = os.path.dirname(os.path.abspath(path))
+    job_list = list()
+    name_set = set()
+    for i, item in enumerate(data, start=1):
+        assert ('script' in item) != ('factory' in item), f'job {i}: needs either script or factory'
+        script = item.get('script')
+        output = item.get('output')
+        assert script is not None or output is not None, f'job {i}: factory job needs an output'
+        name = item.get('name')
+        if not name:
+            name = default_list[i - 1]
+            if default_list.count(name) > 1:
+                name = f'{name}#{i}'
+        assert name not in name_set, f'job {i}: the name {name} is taken by another job'
+        name_set.add(name)
+        cwd = os.path.join(base, item.get('cwd', '.'))
+        job_list.append(Job(
+            name=name,
+            script=None if script is None else os.path.join(base, script),
+            factory=item.get('factory'),
+            params=item.get('params', dict()),
+            output=None if output is None else os.path.join(cwd, output),
+            argv=[str(arg) for arg in item.get('argv', list())],
+            cwd=cwd))
+    return job_list
+
+
+def _load_factory(spec):
+    module_name, _, attr = spec.partition(':')
+    obj = importlib.import_module(module_name)
+    for name in attr.split('.'):
+        obj = getattr(obj, name)
+    return obj
+
+
+def run_job(job: Job) -> JobResult:
+    start = time.perf_counter()
+    old_cwd, old_argv, old_path = os.getcwd(), sys.argv, list(sys.path)
+    try:
+        os.chdir(job.cwd)
+        sys.path.insert(0, job.cwd)
+        if job.script is not None:
+            sys.argv = [job.script] + job.argv
+            runpy.run_path(job.script, init_globals={'params': job.params}, run_name='__main__')
+        else:
+            report = _load_factory(job.factory)(**job.params)
+            report.save(job.output)
+        error = None
+    except SystemExit as e:
+        # sys.exit() or sys.exit(0) of a script is its normal end
+        error = None if e.code in (0, None) else traceback.format_exc()
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        # workers are reused by the next jobs
+        os.chdir(old_cwd)
+        sys.argv = old_argv
+        sys.path[:] = old_path
+    return JobResult(job.name, time.perf_counter() - start, error)
+
+
+# the identity of a job in the checkpoint, its name, unique in the manifest,
+# with what it runs, so a job whose params or output changed is run again.
+def job_key(job):
+    identity = [job.name, job.script, job.factory, job.params, job.output, job.argv, job.cwd]
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+# the keys of the jobs done, a json object of the key and the name of a job
+# per line of the checkpoint file
+def read_checkpoint(path):
+    if path is None or not os.path.exists(path):
+        return set()
+    done_set = set()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            # a line cut by a broken run is left out, and so are the names
+            # alone written by older versions, whose jobs run again
+            if line.endswith('\n'):
+                entry = json.loads(line)
+                if isinstance(entry, dict):
+                    done_set.add(entry['key'])
+    return done_set
+
+
+# run the jobs in a pool of worker processes, which stay alive for the
+# following jobs so the imports are paid once per worker.
+# results are yielded in the order they finish.
+# with a checkpoint file, the jobs done are appended to it as they finish,
+# and the jobs found in it are skipped, so a batch started again goes on
+# where it broke.
+def run_batch(job_list, processes=None, checkpoint=None):
+    done_set = read_checkpoint(checkpoint)
+    job_list = [job for job in job_list if job_key(job) not in done_set]
+    if len(job_list) == 0:
+        return
+    with ProcessPoolExecutor(processes) as pool:
+        future_dict = {pool.submit(run_job, job): job for job in job_list}
+        for future in as_completed(future_dict):
+            result = future.result()
+            if checkpoint is not None and result.error is None:
+                entry = {'key': job_key(future_dict[future]), 'name': result.name}
+                with open(checkpoint, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            yield result
+
+
+def main(argv=None):
+    import argparse
+    from .merge import add_merge_command
+
+    parser = argparse.ArgumentParser(prog='python -m pyreporter')
+    sub = parser.add_subparsers(dest='command', required=True)
+    batch = sub.add_parser('batch', help='generate reports listed in a job manifest')
+    batch.add_argument('manifest', help='json file of the jobs')
+    batch.add_argument('-j', '--processes', type=int, default=None,
+                       help='number of worker processes, all the cores by default')
+    batch.add_argument('--checkpoint', default=None,
+                       help='file of the jobs done, which are skipped when the batch is run again')
+    batch.set_defaults(run=_run_batch)
+    add_merge_command(sub)
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+def _run_batch(args):
+    job_list = load_manifest(args.manifest)
+    start = time.perf_counter()
+    failed = list()
+    done_set = read_checkpoint(args.checkpoint)
+    skipped = len([job for job in job_list if job_key(job) in done_set])
+    if skipped > 0:
+        print(f'{skipped} jobs done before, skipped')
+    for result in run_batch(job_list, args.processes, args.checkpoint):
+        status = 'ok' if result.error is None else 'FAILED'
+        print(f'{status:<6} {result.seconds:8.2f}s  {result.name}', flush=True)
+        if result.error is not None:
+            failed.append(result)
+
+    for result in failed:
+        print(f'\n{result.name} failed:\n{result.error}', file=sys.stderr)
+    print(f'{len(job_list) - len(failed)}/{len(job_list)} jobs done '
+          f'in {time.perf_counter() - start:.2f}s')
+    return 1 if failed else 0
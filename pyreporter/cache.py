@@ -0,0 +1,77 @@
+import os
+import pickle
+import shutil
+import hashlib
+from tempfile import NamedTemporaryFile
+from .fragment import Fragment, MarkCollector
+from .docx import FigureFile, COPY_CHUNK_SIZE, open_figure
+
+__all__ = ['ContentHasher', 'RenderCache']
+
+# bump it when the rendered xml or the pickled fragment changes.
+CACHE_VERSION = 1
+
+
+# hash everything of a slice of report that goes into the rendered xml:
+# element types, text, formula structure, captured values, figure data,
+# and the pattern of marks it defines and refers to.
+class ContentHasher(MarkCollector):
+    def __init__(self, seed=''):
+        super().__init__()
+        self._hash = hashlib.sha256(f'{CACHE_VERSION}:{seed}'.encode('utf-8'))
+
+    def node(self, kind, *values):
+        self._hash.update(repr((kind,) + values).encode('utf-8'))
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+    def visit_figure(self, figure, format_, width, height, title):
+        self._hash_figure(figure)
+        super().visit_figure(figure, format_, width, height, title)
+
+    def visit_inline_figure(self, *, figure, format_, width, height):
+        self._hash_figure(figure)
+        super().visit_inline_figure(figure=figure, format_=format_, width=width, height=height)
+
+    def _hash_figure(self, figure):
+        with open_figure(figure) as f:
+            chunk = f.read(COPY_CHUNK_SIZE)
+            while chunk:
+                self._hash.update(chunk)
+                chunk = f.read(COPY_CHUNK_SIZE)
+
+
+# disk cache of rendered fragments, one directory per key holding the
+# pickled fragment and copies of its media files.
+class RenderCache:
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key, name=''):
+        return os.path.join(self.directory, key, name)
+
+    def get(self, key):
+        try:
+            with open(self._path(key, 'fragment.pickle'), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, AttributeError, EOFError):
+            return None
+
+    def put(self, key, fragment: Fragment):
+        os.makedirs(self._path(key), exist_ok=True)
+
+        figures = list()
+        for rel_id, image_id, fig in fragment.figures:
+            path = self._path(key, os.path.basename(fig.path))
+            with open_figure(fig.figure) as src, open(path, 'wb') as dst:
+                shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+            figures.append((rel_id, image_id, FigureFile(path=fig.path, figure=path)))
+        stored = Fragment(fragment.body, fragment.footnotes, fragment.catalog, figures)
+
+        # write to a temporary file first, a broken run never leaves
+        # a half written fragment behind.
+        with NamedTemporaryFile('wb', dir=self._path(key), delete=False) as f:
+            pickle.dump(stored, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, self._path(key, 'fragment.pickle'))
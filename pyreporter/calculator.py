@@ -1,6 +1,7 @@
 import math
 from typing import List
 from collections import OrderedDict
+from .profiler import phase
 
 __all__ = ['Variable', 'FractionVariable', 'Number', 'Unit',
            'Formula', 'PiecewiseFormula', 'Calculator', 'TrailSolver', 'Equation',
@@ -8,6 +9,20 @@ __all__ = ['Variable', 'FractionVariable', 'Number', 'Unit',
            'Radical', 'Pr', 'Sq', 'Br', 'Sum']
 
 
+# math functions on numbers, and the ufuncs of numpy on the arrays of a
+# vectorized run, see Calculator.run.
+def _apply(function, ufunc, *values):
+    for value in values:
+        if _is_array(value):
+            import numpy
+            return getattr(numpy, ufunc)(*values)
+    return function(*values)
+
+
+def _is_array(value):
+    return hasattr(value, '__array_ufunc__')
+
+
 def wrapper_number(number):
     if isinstance(number, float) or isinstance(number, int):
         return Number(number)
@@ -155,7 +170,7 @@ class FlatDiv(Expression):
 
 class Pow(Expression):
     def calc(self):
-        self.value = math.pow(self.left.calc(), self.right.calc())
+        self.value = _apply(math.pow, 'power', self.left.calc(), self.right.calc())
         return self.value
 
     def visit(self, visitor):
@@ -164,7 +179,7 @@ class Pow(Expression):
 
 class Radical(Expression):
     def calc(self):
-        self.value = math.pow(self.left.calc(), 1 / self.right.calc())
+        self.value = _apply(math.pow, 'power', self.left.calc(), 1 / self.right.calc())
         return self.value
 
     def visit(self, visitor):
@@ -263,7 +278,7 @@ class GreaterOrEqual(Expression):
 
 class ToDegree(Expression):
     def calc(self):
-        self.value = math.degrees(self.left.calc())
+        self.value = _apply(math.degrees, 'degrees', self.left.calc())
         return self.value
 
     def visit(self, visitor):
@@ -272,7 +287,7 @@ class ToDegree(Expression):
 
 class ToRadian(Expression):
     def calc(self):
-        self.value = math.radians(self.left.calc())
+        self.value = _apply(math.radians, 'radians', self.left.calc())
         return self.value
 
     def visit(self, visitor):
@@ -281,7 +296,7 @@ class ToRadian(Expression):
 
 class Sin(Expression):
     def calc(self):
-        self.value = math.sin(self.left.calc())
+        self.value = _apply(math.sin, 'sin', self.left.calc())
         return self.value
 
     def visit(self, visitor):
@@ -290,7 +305,7 @@ class Sin(Expression):
 
 class Cos(Expression):
     def calc(self):
-        self.value = math.cos(self.left.calc())
+        self.value = _apply(math.cos, 'cos', self.left.calc())
         return self.value
 
     def visit(self, visitor):
@@ -299,7 +314,7 @@ class Cos(Expression):
 
 class Tan(Expression):
     def calc(self):
-        self.value = math.tan(self.left.calc())
+        self.value = _apply(math.tan, 'tan', self.left.calc())
         return self.value
 
     def visit(self, visitor):
@@ -308,7 +323,7 @@ class Tan(Expression):
 
 class Cot(Expression):
     def calc(self):
-        self.value = 1 / math.tan(self.left.calc())
+        self.value = 1 / _apply(math.tan, 'tan', self.left.calc())
         return self.value
 
     def visit(self, visitor):
@@ -317,7 +332,7 @@ class Cot(Expression):
 
 class ASin(Expression):
     def calc(self):
-        self.value = math.asin(self.left.calc())
+        self.value = _apply(math.asin, 'arcsin', self.left.calc())
         return self.value
 
     def visit(self, visitor):
@@ -326,7 +341,7 @@ class ASin(Expression):
 
 class ACos(Expression):
     def calc(self):
-        self.value = math.acos(self.left.calc())
+        self.value = _apply(math.acos, 'arccos', self.left.calc())
         return self.value
 
     def visit(self, visitor):
@@ -335,7 +350,7 @@ class ACos(Expression):
 
 class ATan(Expression):
     def calc(self):
-        self.value = math.atan(self.left.calc())
+        self.value = _apply(math.atan, 'arctan', self.left.calc())
         return self.value
 
     def visit(self, visitor):
@@ -344,7 +359,7 @@ class ATan(Expression):
 
 class ACot(Expression):
     def calc(self):
-        self.value = math.pi - math.atan(self.left.calc())
+        self.value = math.pi - _apply(math.atan, 'arctan', self.left.calc())
         return self.value
 
     def visit(self, visitor):
@@ -601,15 +616,46 @@ class PiecewiseFormula(FormulaBase):
 
         self.expression = None
 
+        # branch taken by every case of a vectorized run, -1 for none
+        self.branch = None
+
     def calc(self):
-        for exp, cond, long in zip(self.expression_list, self.condition_list, self.long_list):
-            if cond.calc():
+        for i, (exp, cond, long) in enumerate(zip(self.expression_list, self.condition_list, self.long_list)):
+            condition = cond.calc()
+            if _is_array(condition):
+                return self._calc_cases(i, condition)
+            if condition:
                 self.variable.set(exp.calc())
                 self.expression = exp
                 self.long = long
                 return self.variable.value
         return None
 
+    # every expression is taken over all the cases, the value of a case
+    # comes from the first branch whose condition holds, nan for none.
+    def _calc_cases(self, start, condition):
+        import numpy
+        condition_list = [condition] + [cond.calc() for cond in self.condition_list[start + 1:]]
+        condition_list = numpy.broadcast_arrays(*condition_list)
+        branch = numpy.full(condition_list[0].shape, -1)
+        for i in range(len(condition_list) - 1, -1, -1):
+            branch[condition_list[i]] = start + i
+        value = numpy.full(branch.shape, numpy.nan)
+        for i in numpy.unique(branch[branch >= 0]).tolist():
+            value = numpy.where(branch == i, self.expression_list[i].calc(), value)
+        self.branch = branch
+        self.variable.set(value)
+        return value
+
+    # take the branch of a case restored from a vectorized run
+    def set_branch(self, index):
+        if index < 0:
+            self.expression = None
+            self.long = False
+        else:
+            self.expression = self.expression_list[index]
+            self.long = self.long_list[index]
+
     def visit(self, visitor):
         return visitor.visit_piecewise_formula(self.variable, self.expression,
                                                self.expression_list, self.condition_list,
@@ -622,7 +668,12 @@ class ConditionFormula(Formula):
         self.condition = condition
 
     def calc(self):
-        if self.condition.calc():
+        condition = self.condition.calc()
+        if _is_array(condition):
+            import numpy
+            self.variable.set(numpy.where(condition, self.expression.calc(), numpy.nan))
+            return self.variable.value
+        if condition:
             return super().calc()
 
     def visit(self, visitor):
@@ -643,11 +694,23 @@ class Calculator:
         else:
             list_ = self.formula_list
 
-        for formula in list_:
-            formula.calc()
+        with phase('calc'):
+            for formula in list_:
+                formula.calc()
 
         return self.formula_list[0].variable.value
 
+    # evaluate all the cases in one vectorized pass, inputs maps variables
+    # to their values by case, see cases.py. needs numpy.
+    def run(self, inputs):
+        from .cases import run_cases
+        return run_cases(self, inputs)
+
+    # run the chunks of inputs one by one for the reducers, see cases.py
+    def reduce(self, chunks, reducer_list):
+        from .cases import reduce_cases
+        return reduce_cases(self, chunks, reducer_list)
+
     def visit(self, visitor):
         visitor.visit_calculator(self.formula_list, sequence=self.sequence)
 
@@ -664,6 +727,10 @@ class TrailSolver(Calculator):
         self.unknown_variable = unknown_var
 
     def solve(self, target_value, left=0.001, right=100, tol=1e-5, max_iter=100):
+        with phase('solve'):
+            return self._solve(target_value, left, right, tol, max_iter)
+
+    def _solve(self, target_value, left, right, tol, max_iter):
         target = self.get_target_variable()
         unknown_var = self.unknown_variable
 
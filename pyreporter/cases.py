@@ -0,0 +1,384 @@
+import os
+import json
+import numpy
+from collections import OrderedDict
+from contextlib import contextmanager
+from .calculator import PiecewiseFormula, Variable, Number, Mul, Div, FlatDiv, Pow
+from .loader import variable_names
+
+__all__ = ['CaseResult', 'run_cases', 'concat_results', 'iter_chunks', 'reduce_cases',
+           'Top', 'Maximum', 'Minimum', 'Histogram', 'load_results', 'result_from_state',
+           'variable_label', 'unit_text']
+
+_UNIT_SIGN = {Mul: '·', Div: '/', FlatDiv: '/', Pow: '^'}
+
+# operators of units by precedence, the others are joined by a space and
+# bind the least
+_UNIT_RANK = {Mul: 2, Div: 2, FlatDiv: 2, Pow: 3}
+
+
+def _unit_rank(unit):
+    if isinstance(unit, Variable):
+        return 4
+    if unit.right is None:
+        return _unit_rank(unit.left)
+    return _UNIT_RANK.get(type(unit), 1)
+
+
+# an operand in parentheses when it binds less than rank
+def _unit_operand(unit, rank):
+    text = unit_text(unit)
+    return f'({text})' if _unit_rank(unit) < rank else text
+
+
+# the unit as plain text, 'kN/m^2', 'kN/(m·s)', '(kN/m)^2'
+def unit_text(unit):
+    if unit is None:
+        return None
+    if isinstance(unit, Number):
+        return f'{unit.value}'
+    if isinstance(unit, Variable):
+        return unit.symbol
+    if unit.right is None:
+        return unit_text(unit.left)
+    # left to right, except the power which goes right to left
+    rank = _unit_rank(unit)
+    power = isinstance(unit, Pow)
+    return (f'{_unit_operand(unit.left, rank + power)}{_UNIT_SIGN.get(type(unit), " ")}'
+            f'{_unit_operand(unit.right, rank + (not power))}')
+
+
+# the label of a variable in tables and files, its inform or symbol, with
+# the unit.
+def variable_label(variable):
+    label = f'{variable.inform or variable}'
+    unit = unit_text(variable.unit)
+    return label if unit is None else f'{label}({unit})'
+
+
+# the names of the columns in files, the first of variable_names, made
+# unique by the count of the name before. 'case' is taken by the numbers
+# of the cases, a variable of that name is 'case#2'.
+def _column_name_list(variable_list):
+    ret = list()
+    count_dict = {'case': 1}
+    for variable in variable_list:
+        name = variable_names(variable)[0]
+        count_dict[name] = count_dict.get(name, 0) + 1
+        ret.append(name if count_dict[name] == 1 else f'{name}#{count_dict[name]}')
+    return ret
+
+
+def _column_meta(name, variable, column):
+    return {'name': name, 'symbol': variable.symbol, 'subscript': variable.subscript,
+            'index': variable.index if hasattr(variable, 'root') else None,
+            'unit': unit_text(variable.unit), 'inform': variable.inform, 'dtype': column.dtype.str}
+
+
+# columns of a vectorized run, an array per input and formula variable.
+# a case is put back on the variables by restore, for Procedure to render
+# it as if it was computed alone. index holds the number of every case in
+# the whole run, from 0, when the cases are run in chunks.
+class CaseResult:
+    def __init__(self, calculator, column_dict, branch_dict, input_list, index=None):
+        self.calculator = calculator
+        self.column_dict = column_dict  # type: OrderedDict
+        self.branch_dict = branch_dict
+        self.input_list = input_list
+        self.size = len(next(iter(column_dict.values()))) if len(column_dict) > 0 else 0
+        self.index = numpy.arange(self.size) if index is None else index
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, variable):
+        return self.column_dict[variable]
+
+    def __contains__(self, variable):
+        return variable in self.column_dict
+
+    @property
+    def variable_list(self):
+        return list(self.column_dict.keys())
+
+    def restore(self, index):
+        for variable, column in self.column_dict.items():
+            variable.value = column[index].item()
+        for formula, branch in self.branch_dict.items():
+            formula.set_branch(branch[index].item())
+
+    # the values of the variables and the branches of the formulas are put
+    # back as they were when the cases restored in the block are done.
+    @contextmanager
+    def keep_values(self):
+        value_list = [(variable, variable.value) for variable in self.column_dict]
+        branch_list = [(formula, formula.expression, formula.long) for formula in self.branch_dict]
+        try:
+            yield
+        finally:
+            for variable, value in value_list:
+                variable.value = value
+            for formula, expression, long in branch_list:
+                formula.expression = expression
+                formula.long = long
+
+    # positions of the cases in descending order of the variable, the
+    # governing one first, or ascending for not largest. nan goes last, and
+    # the earlier of equal cases first.
+    def order(self, variable, count=None, largest=True):
+        column = self.column_dict[variable]
+        if column.dtype == bool:
+            column = column.astype(float)
+        index = numpy.argsort(-column if largest else column, kind='stable')
+        return index if count is None else index[:count]
+
+    # the labels of the columns by name, for the files written by save
+    def column_meta(self, variable_list=None):
+        variable_list = self.variable_list if variable_list is None else variable_list
+        return [_column_meta(name, v, self.column_dict[v])
+                for name, v in zip(_column_name_list(variable_list), variable_list)]
+
+    # write the columns, all by default, with the case numbers as 'case':
+    # npz with the labels of the columns as json in '__columns__', csv,
+    # npy of a structured array, or an arrow ipc file with the labels as
+    # field metadata, which needs pyarrow.
+    def save(self, path, variable_list=None):
+        variable_list = self.variable_list if variable_list is None else variable_list
+        meta_list = self.column_meta(variable_list)
+        name_list = ['case'] + [meta['name'] for meta in meta_list]
+        column_list = [self.index] + [self.column_dict[v] for v in variable_list]
+        ext = os.path.splitext(os.fspath(path))[1].lower()
+        if ext == '.npz':
+            numpy.savez(path, __columns__=numpy.array(json.dumps(meta_list, ensure_ascii=False)),
+                        **dict(zip(name_list, column_list)))
+        elif ext in ('.arrow', '.feather', '.ipc'):
+            _save_arrow(path, name_list, column_list, meta_list)
+        else:
+            from .sweep import open_writer
+            writer = open_writer(path, name_list, [c.dtype for c in column_list])
+            try:
+                writer.write(column_list)
+            finally:
+                writer.close()
+
+    # the arrays of the result, for checkpoints and caches, which are put
+    # back on the variables of a calculator by result_from_state.
+    def get_state(self):
+        return (list(self.column_dict.values()), list(self.branch_dict.values()), self.index)
+
+    # the cases at the positions given, as a result of their own
+    def take(self, position):
+        return CaseResult(self.calculator,
+                          OrderedDict((v, c[position]) for v, c in self.column_dict.items()),
+                          OrderedDict((f, b[position]) for f, b in self.branch_dict.items()),
+                          self.input_list, self.index[position])
+
+
+def concat_results(result_list):
+    first = result_list[0]
+    return CaseResult(first.calculator,
+                      OrderedDict((v, numpy.concatenate([r.column_dict[v] for r in result_list]))
+                                  for v in first.column_dict),
+                      OrderedDict((f, numpy.concatenate([r.branch_dict[f] for r in result_list]))
+                                  for f in first.branch_dict),
+                      first.input_list, numpy.concatenate([r.index for r in result_list]))
+
+
+def _save_arrow(path, name_list, column_list, meta_list):
+    import pyarrow
+    import pyarrow.ipc
+    field_list = [pyarrow.field('case', pyarrow.from_numpy_dtype(column_list[0].dtype))]
+    for name, column, meta in zip(name_list[1:], column_list[1:], meta_list):
+        metadata = {k: f'{v}' for k, v in meta.items() if v is not None and k != 'name'}
+        field_list.append(pyarrow.field(name, pyarrow.from_numpy_dtype(column.dtype), metadata=metadata))
+    schema = pyarrow.schema(field_list)
+    table = pyarrow.Table.from_arrays([pyarrow.array(c) for c in column_list], schema=schema)
+    with pyarrow.ipc.new_file(os.fspath(path), schema) as writer:
+        writer.write_table(table)
+
+
+# the columns of a file written by CaseResult.save by name, with the labels
+# of the columns kept by npz and arrow, None for the others.
+def load_results(path):
+    ext = os.path.splitext(os.fspath(path))[1].lower()
+    if ext == '.npz':
+        with numpy.load(path) as data:
+            meta_list = json.loads(data['__columns__'].item())
+            column_dict = OrderedDict((name, data[name]) for name in data.files if name != '__columns__')
+        return column_dict, meta_list
+    if ext in ('.arrow', '.feather', '.ipc'):
+        import pyarrow.ipc
+        table = pyarrow.ipc.open_file(os.fspath(path)).read_all()
+        column_dict = OrderedDict((name, table.column(name).to_numpy()) for name in table.column_names)
+        meta_list = [dict({k.decode(): v.decode() for k, v in field.metadata.items()}, name=field.name)
+                     for field in table.schema if field.metadata]
+        return column_dict, meta_list
+    if ext == '.npy':
+        data = numpy.load(path)
+        return OrderedDict((name, data[name]) for name in data.dtype.names), None
+    with open(path, encoding='utf-8') as f:
+        name_list = f.readline().rstrip('\n').split(',')
+    data = numpy.loadtxt(path, delimiter=',', skiprows=1, ndmin=2)
+    return OrderedDict((name, data[:, i]) for i, name in enumerate(name_list)), None
+
+
+def _formula_list(calculator):
+    return calculator.formula_list[::-1] if calculator.sequence else list(calculator.formula_list)
+
+
+# the result of get_state for the calculator run over the inputs, with
+# the columns in the order of run_cases.
+def result_from_state(calculator, input_list, state):
+    column_list, branch_list, index = state
+    formula_list = _formula_list(calculator)
+    variable_list = list(OrderedDict.fromkeys(list(input_list) + [f.variable for f in formula_list]))
+    piecewise_list = [f for f in formula_list if isinstance(f, PiecewiseFormula)]
+    return CaseResult(calculator, OrderedDict(zip(variable_list, column_list)),
+                      OrderedDict(zip(piecewise_list, branch_list)), list(input_list), index)
+
+
+# evaluate the calculator once over all the cases, inputs maps the variables
+# to a value per case, the other variables keep their values for every case.
+# the values of the variables are put back after the run. start is the
+# number of the first case, for the chunks of a larger run.
+def run_cases(calculator, inputs, start=0) -> CaseResult:
+    column_dict = OrderedDict()
+    for variable, values in inputs.items():
+        column = numpy.asarray(values)
+        if column.dtype.kind in 'iub':
+            column = column.astype(float)
+        assert column.ndim == 1, f'values of {variable} are not 1-d'
+        column_dict[variable] = column
+    size_set = {len(column) for column in column_dict.values()}
+    assert len(size_set) == 1, 'the inputs have different counts of cases'
+    size = size_set.pop()
+
+    formula_list = _formula_list(calculator)
+    input_list = list(column_dict.keys())
+    saved = [(variable, variable.value) for variable in input_list]
+    saved += [(formula.variable, formula.variable.value) for formula in formula_list]
+    try:
+        for variable, column in column_dict.items():
+            variable.value = column
+        # branches not taken give nan or inf, as numpy does
+        with numpy.errstate(all='ignore'):
+            calculator.calc()
+
+        branch_dict = OrderedDict()
+        for formula in formula_list:
+            value = numpy.asarray(formula.variable.value)
+            column_dict[formula.variable] = numpy.array(numpy.broadcast_to(value, (size,)))
+            if isinstance(formula, PiecewiseFormula):
+                branch = formula.branch if formula.branch is not None else _scalar_branch(formula)
+                branch_dict[formula] = numpy.array(numpy.broadcast_to(branch, (size,)))
+                formula.branch = None
+    finally:
+        for variable, value in saved:
+            variable.value = value
+    return CaseResult(calculator, column_dict, branch_dict, input_list, numpy.arange(start, start + size))
+
+
+# the branch of a piecewise formula whose conditions are the same for
+# every case
+def _scalar_branch(formula):
+    for i, expression in enumerate(formula.expression_list):
+        if expression is formula.expression:
+            return i
+    return -1
+
+
+# the inputs, as arrays or memory maps, sliced to mappings of chunk_size
+# cases at most.
+def iter_chunks(inputs, chunk_size):
+    size = len(next(iter(inputs.values())))
+    for start in range(0, size, chunk_size):
+        yield OrderedDict((v, values[start:start + chunk_size]) for v, values in inputs.items())
+
+
+# run the calculator over the chunks of inputs one by one and feed the
+# reducers, only a chunk of results is held at a time.
+def reduce_cases(calculator, chunks, reducer_list):
+    start = 0
+    for inputs in chunks:
+        result = run_cases(calculator, inputs, start)
+        for reducer in reducer_list:
+            reducer.update(result)
+        start += len(result)
+    return reducer_list
+
+
+# the count cases of the largest, or the smallest, values of the variable
+# over all the chunks, with every column of them. restore puts one of them
+# back for Procedure, and cases goes to Report.add_cases as it is.
+class Top:
+    def __init__(self, variable, count=1, largest=True):
+        self.variable = variable
+        self.count = count
+        self.largest = largest
+        self.cases = None  # type: CaseResult
+
+    def update(self, result):
+        candidate = result.take(result.order(self.variable, self.count, self.largest))
+        if self.cases is not None:
+            candidate = concat_results([self.cases, candidate])
+        self.cases = candidate.take(candidate.order(self.variable, self.count, self.largest))
+
+    @property
+    def values(self):
+        return self.cases[self.variable]
+
+    @property
+    def index(self):
+        return self.cases.index
+
+    def restore(self, rank=0):
+        self.cases.restore(rank)
+
+    # the state of a reducer is kept by the checkpoints of run_sweep
+    def get_state(self):
+        return None if self.cases is None else self.cases.get_state()
+
+    def set_state(self, state, calculator, input_list):
+        self.cases = None if state is None else result_from_state(calculator, input_list, state)
+
+
+class Maximum(Top):
+    def __init__(self, variable):
+        super().__init__(variable, 1, largest=True)
+
+    @property
+    def value(self):
+        return self.values[0].item()
+
+
+class Minimum(Top):
+    def __init__(self, variable):
+        super().__init__(variable, 1, largest=False)
+
+    @property
+    def value(self):
+        return self.values[0].item()
+
+
+# counts of the values of the variable in the bins given by their edges,
+# as numpy.histogram, with the values outside the edges and nan counted
+# apart.
+class Histogram:
+    def __init__(self, variable, bins):
+        self.variable = variable
+        self.bins = numpy.asarray(bins, dtype=float)
+        self.counts = numpy.zeros(len(self.bins) - 1, dtype=numpy.int64)
+        self.outside = 0
+
+    def update(self, result):
+        column = result[self.variable]
+        counts = numpy.histogram(column, self.bins)[0]
+        self.counts += counts
+        self.outside += len(column) - int(counts.sum())
+
+    def get_state(self):
+        return self.counts.copy(), self.outside
+
+    def set_state(self, state, calculator, input_list):
+        counts, self.outside = state
+        self.counts = counts.copy()
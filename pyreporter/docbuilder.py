@@ -1,8 +1,15 @@
-from xml.etree.ElementTree import ElementTree as ET
-from xml.etree.ElementTree import Element
-from xml.etree.ElementTree import SubElement
+from xml.etree.ElementTree import Element, SubElement, tostring
 from zipfile import ZipFile, ZIP_DEFLATED
 from collections import UserList
+from io import BytesIO
+from .docx import (DocX, Cover, FigureFile, PAGE_WIDTH, MIN_TABLE_CELL_WIDTH, write_figure, read_part,
+                   forget_with)
+from .docx import Composite as ElementComposite
+from .fields import FieldResolver
+from .profiler import phase
+from . import reporter
+
+__all__ = ['ReportBuilder']
 
 
 def E(tag, attrib={}, text=None):
@@ -19,32 +26,31 @@ def SE(e, tag, attrib={}, text=None):
     return se
 
 
+# the ids are given in two phases. the builders and the visit methods only
+# make components holding the index objects of marks, footnotes,
+# relationships and images, which are numbered by the pools in build().
+# then every component writes itself into its parent with SubElement.
 class ContentBuilder:
     def __init__(self):
         self.mark_pool = IndexPool()
         self.order_pool = OrderPool()
-        self.footnote_id_pool = IndexPool()
+        # 0 and 1 are the separators of footnotes.xml
+        self.footnote_id_pool = IndexPool(start=2)
         self.doc_rel_pool = IndexPool()
         self.image_id_pool = IndexPool()
 
         self.relationship_list = list()
+        self.image_list = list()
         self.footnote_list = list()
         self.heading_list = list()
         self.content_list = list()
 
-    def heading(self, level=1, text=None):
-        mark = self.mark_pool.mark()
-        order = self.order_pool.order(level)
-        heading_in_catalog = HeadingInCatalog(mark, order, level)
-        heading_in_body = HeadingInBody(mark, order, level)
-
-        self.mark_pool.append(mark)
-        self.order_pool.append(order)
-        self.heading_list.append(heading_in_catalog)
-        self.content_list.append(heading_in_body)
-
-        builder = HeadingBuilder(heading_in_catalog, heading_in_body)
+        self.mark_dict = dict()
+        # math has no ids, its omml is made by DocX and kept as elements.
+        self.math_writer = DocX()
 
+    def heading(self, level=1, text=None):
+        builder = self._add_heading(level, self.mark_pool.mark())
         if text is not None:
             builder.text(text)
         return builder
@@ -53,41 +59,165 @@ class ContentBuilder:
         para = Paragraph()
         self.content_list.append(para)
 
-        builder = ParagraphBuilder(para)
+        builder = ParagraphBuilder(self, para)
         if text is not None:
             builder.text(text)
         return builder
 
-    def table(self):
-        pass
+    def table(self, content_by_rows, title=None, header_rows=0, split_rows=None):
+        return self.add(reporter.Table(content_by_rows, title, header_rows=header_rows, split_rows=split_rows))
 
-    def math(self):
-        pass
+    def math(self, *items):
+        self.add(reporter.StandaloneMath(*items))
 
-    def image(self):
-        pass
+    def image(self, file, height=None, title=None):
+        return self.add(reporter.StandaloneFigure(file, height=height, title=title))
 
     def canvas(self):
         pass
 
+    # add a report element, such as Definition or Note.
+    # the reference of the element is returned if it has one.
+    def add(self, element):
+        element.visit(self)
+        return getattr(element, 'reference', None)
+
+    def _add_heading(self, level, mark):
+        order = None
+        heading_in_catalog = None
+        if level <= 3:
+            order = self.order_pool.order(level)
+            heading_in_catalog = HeadingInCatalog(mark, order, level)
+            self.heading_list.append(heading_in_catalog)
+        heading_in_body = HeadingInBody(mark, order, level)
+        self.content_list.append(heading_in_body)
+        return HeadingBuilder(self, heading_in_body, heading_in_catalog)
+
+    def _add_footnote(self):
+        index = self.footnote_id_pool.footnote()
+        footnote = FootnoteInFootnotes(index)
+        self.footnote_list.append(footnote)
+        return FootnoteInDocument(index), footnote
 
+    def _retrieve_mark(self, obj):
+        if id(obj) not in self.mark_dict:
+            self.mark_dict[id(obj)] = self.mark_pool.mark()
+            forget_with(obj, self.mark_dict)
+        return self.mark_dict[id(obj)]
+
+    # ===============================================================
+    # visitor START
+    # ---------------------------------------------------------------
+
+    def visit_heading(self, *, content, level, heading):
+        builder = self._add_heading(level, self._retrieve_mark(heading))
+        builder.append(content.visit(self))
+
+    def visit_paragraph(self, content):
+        para = Paragraph()
+        para.append(content.visit(self))
+        self.content_list.append(para)
+
+    def visit_standalone_math(self, content):
+        self.content_list.append(MathParagraph([m.visit(self.math_writer) for m in content]))
+
+    def visit_math_definition(self, content, bookmark):
+        math_list = [m.visit(self.math_writer) for m in content]
+        self.content_list.append(MathDefinition(math_list, bookmark.visit(self)))
+
+    def visit_math_procedure(self, content):
+        self.content_list.append(MathParagraph([m.visit(self.math_writer) for m in content]))
+
+    def visit_math_note(self, var_list):
+        note_list = list()
+        for var in var_list:
+            unit = None if var.unit is None else var.unit.visit(self.math_writer)
+            note_list.append((var.visit(self.math_writer), var.inform, unit))
+        self.content_list.append(MathNote(note_list))
+
+    def visit_figure(self, figure, format_, width, height, title):
+        run = self.visit_inline_figure(figure=figure, format_=format_, width=width, height=height)
+        title = None if title is None else title.visit(self)
+        self.content_list.append(FigureParagraph(run, title))
+
+    def visit_table(self, content_by_rows, title, header_rows=0):
+        title = None if title is None else title.visit(self)
+        rows = [[cell.visit(self) for cell in row] for row in content_by_rows]
+        self.content_list.append(Table(len(content_by_rows[0]), title, rows, header_rows))
+
+    # the rows are kept until build, as strings.
+    def visit_data_table(self, header, rows, column_count, title):
+        title = None if title is None else title.visit(self)
+        rows = [tuple(row) for row in rows]
+        header_rows = 0
+        if header is not None:
+            rows.insert(0, tuple(header))
+            header_rows = 1
+        self.content_list.append(DataTable(column_count, title, rows, header_rows))
+
+    def visit_composite(self, list_):
+        ret = Composite()
+        for item in list_:
+            ret.append(item.visit(self))
+        return ret
+
+    def visit_text(self, text, font, size, italic, bold, underline):
+        return Text(text, font, size, italic, bold, underline)
+
+    def visit_inline_math(self, content):
+        return Prebuilt(self.math_writer.visit_inline_math(content))
+
+    def visit_inline_figure(self, *, figure, format_, width, height):
+        rel_index = self.doc_rel_pool.relationship()
+        image_index = self.image_id_pool.image()
+        self.image_list.append((image_index, format_, figure))
+        self.relationship_list.append(ImageRelationship(rel_index, image_index, format_))
+        return InlineFigure(rel_index, image_index, int(width * 914400), int(height * 914400))
+
+    def visit_bookmark(self, *, type_, bookmark, left, right):
+        return Bookmark(type_, self._retrieve_mark(bookmark), left, right)
+
+    def visit_reference(self, bookmark, brackets=True):
+        return Reference(self._retrieve_mark(bookmark), brackets)
+
+    def visit_footnote(self, content):
+        in_document, footnote = self._add_footnote()
+        footnote.append(content.visit(self))
+        return in_document
+
+    # ---------------------------------------------------------------
+    # visitor END
+    # ===============================================================
+
+
+# a writer for Report.set_writer, or built directly with heading(),
+# paragraph() and the other builder methods.
+# the report is rendered in one pass, set_cache and set_processes of
+# Report are not used with it.
 class ReportBuilder(ContentBuilder):
     def __init__(self):
         super().__init__()
         self.cover_list = list()
 
         self.header = None
+        self.header_rel_id = None
         self.file_list = list()
 
-    def set_cover(self):
-        pass
+    def set_cover(self, cover):
+        builder = Cover.get_cover_builder(cover.type_)
+        cover.visit(builder)
+        self.cover_list.append(Prebuilt(builder.elements))
 
     def set_header(self, text: str):
-        pass
+        self.header = Header(text)
+        self.header_rel_id = self.doc_rel_pool.relationship()
+
+    def visit_header(self, header):
+        self.set_header(header)
 
     def _build(self):
-        footer_rel_id = self.doc_rel_pool.relationship()
-        header_rel_id = self.doc_rel_pool.relationship()
+        resolver = FieldResolver()
+        rels_file = DocumentXMLRelsFile(self.relationship_list, self.header_rel_id, self.doc_rel_pool)
 
         lst = self.file_list
         lst.append(ContentTypeFile())
@@ -97,14 +227,16 @@ class ReportBuilder(ContentBuilder):
         lst.append(ItemProps1File())
         lst.append(AppFile())
         lst.append(CoreFile())
-        lst.append(DocumentXMLRelsFile(self.relationship_list, footer_rel_id, header_rel_id, self.doc_rel_pool))
+        lst.append(rels_file)
         lst.append(Theme1File())
-        lst.append(DocumentFile(self.cover_list, self.heading_list, self.content_list, footer_rel_id, header_rel_id))
+        lst.append(DocumentFile(self.cover_list, self.heading_list, self.content_list,
+                                rels_file.footer_rel_id, self.header_rel_id, resolver))
         lst.append(EndnotesFile())
         lst.append(FontTableFile())
         lst.append(FooterFile())
-        lst.append(FootnotesFile(self.footnote_list))
-        lst.append(HeaderFile(self.header))
+        lst.append(FootnotesFile(self.footnote_list, resolver))
+        if self.header is not None:
+            lst.append(HeaderFile(self.header))
         lst.append(NumberingFile())
         lst.append(SettingsFile())
         lst.append(StylesFile())
@@ -116,89 +248,103 @@ class ReportBuilder(ContentBuilder):
         self.doc_rel_pool.build()
         self.image_id_pool.build()
 
-    def save(self, path):
-        self._build()
-        with ZipFile(path, 'w', ZIP_DEFLATED) as zip_:
-            for file in self.file_list:
-                file.write(zip_)
+    # path could be a file name or a writable file object, the docx is
+    # returned as bytes when path is None, as DocX.save.
+    def save(self, path=None):
+        with phase('serialize'):
+            self._build()
+        file = BytesIO() if path is None else path
+        with ZipFile(file, 'w', ZIP_DEFLATED) as zip_:
+            # the parts are written to text and compressed one by one
+            with phase('write parts'):
+                for f in self.file_list:
+                    f.write(zip_)
+            with phase('write figures'):
+                for image_index, format_, figure in self.image_list:
+                    write_figure(zip_, FigureFile(f'word/media/{image_index.get_name()}.{format_}', figure))
+        if path is None:
+            return file.getvalue()
 
 
 class Builder:
     pass
 
 
-class CoverBuilder(Builder):
-    pass
-
-
 class HeadingBuilder(Builder):
-    def __init__(self, heading_in_catalog, heading_in_body):
-        self.heading_in_body = heading_in_catalog
-        self.heading_in_catalog = heading_in_body
+    def __init__(self, builder, heading_in_body, heading_in_catalog=None):
+        self.builder = builder
+        self.heading_in_body = heading_in_body
+        self.heading_in_catalog = heading_in_catalog
+
+    def append(self, component):
+        self.heading_in_body.append(component)
+        if self.heading_in_catalog is not None:
+            self.heading_in_catalog.append(component)
 
     def text(self, string: str):
-        text = Text(string)
-        self.heading_in_body.append(text)
-        self.heading_in_catalog.append(text)
+        self.append(Text(string))
 
-    def footnote(self):
-        pass
+    def footnote(self, text=None):
+        in_document, footnote = self.builder._add_footnote()
+        self.heading_in_body.append(in_document)
+        builder = FootnoteBuilder(self.builder, footnote)
+        if text is not None:
+            builder.text(text)
+        return builder
 
-    def math(self):
-        pass
+    def math(self, *items):
+        self.append(reporter.Math(*items).visit(self.builder))
 
 
 class ParagraphBuilder(Builder):
-    def __init__(self, paragraph):
+    def __init__(self, builder, paragraph):
+        self.builder = builder
         self.paragraph = paragraph
 
     def text(self, string: str, font=None, size=None, italic=None, bold=None, underline=None):
         self.paragraph.append(Text(string, font, size, italic, bold, underline))
 
-    def bookmark(self):
-        pass
+    # the returned reference is given to reference() of any builder.
+    def bookmark(self, type_, left=None, right=None):
+        mark = reporter.Bookmark(type_, left=left, right=right)
+        self.paragraph.append(mark.visit(self.builder))
+        return mark.reference
 
-    def reference(self):
-        pass
+    def reference(self, reference):
+        self.paragraph.append(reference.visit(self.builder))
 
-    def footnote(self):
-        pass
+    def footnote(self, text=None):
+        in_document, footnote = self.builder._add_footnote()
+        self.paragraph.append(in_document)
+        builder = FootnoteBuilder(self.builder, footnote)
+        if text is not None:
+            builder.text(text)
+        return builder
 
-    def math(self):
-        pass
+    def math(self, *items):
+        self.paragraph.append(reporter.Math(*items).visit(self.builder))
 
-    def image(self):
-        pass
+    def image(self, file, height=None):
+        self.paragraph.append(reporter.Figure(file, height=height).visit(self.builder))
 
     def canvas(self):
         pass
 
 
-class TableBuilder(Builder):
-    pass
-
-
-class MathBuilder(Builder):
-    pass
-
-
-class ImageBuilder(Builder):
-    pass
-
-
 class CanvasBuilder(Builder):
     pass
 
 
 class FootnoteBuilder(Builder):
-    def __init__(self, footnote):
+    def __init__(self, builder, footnote):
+        self.builder = builder
         self.footnote = footnote
 
     def text(self, string: str):
-        pass
+        self.footnote.append(Text(string))
 
-    def math(self):
-        pass
+    def math(self, *items):
+        self.footnote.append(reporter.Math(*items).visit(self.builder))
 
 
 class IndexRef:
@@ -328,6 +474,22 @@ class Composite(Component):
             item.build(base)
 
 
+# elements made already, as math and cover by DocX.
+class Prebuilt(Component):
+    def __init__(self, item):
+        self.item = item
+
+    def build(self, base):
+        _append(base, self.item)
+
+
+def _append(base, item):
+    if isinstance(item, ElementComposite):
+        base.extend(item.elements)
+    else:
+        base.append(item)
+
+
 # header
 class Header(Component):
     def __init__(self, text: str):
@@ -350,41 +512,42 @@ class HeadingInCatalog(Composite):
         self.level = level
 
     def build(self, base):
-        if self.level <= 3:
-            if self.order.is_first:
-                para = SE(base, 'w:p')
-                SE(SE(para, 'w:pPr'), 'w:jc', {'w:val': 'center'})
-                run = SE(para, 'w:r')
-                prop = SE(run, 'w:rPr')
-                SE(prop, 'w:b')
-                SE(prop, 'w:sz', {'w:val': '32'})
-                SE(run, 'w:t', text='目录')
-
+        if self.order.is_first:
             para = SE(base, 'w:p')
-            prop = SE(para, 'w:pPr')
-            SE(prop, 'w:pStyle', {'w:val': f'{self.level*10}'})
-            tabs = SE(prop, 'w:tabs')
-            SE(tabs, 'w:tab', {'w:val': 'left', 'w:pos': f'{420+630*(self.level-1)}'})
-            SE(tabs, 'w:tab', {'w:val': 'right', 'w:leader': 'dot', 'w:pos': '8296'})
-
-            if self.order.is_first:
-                SE(SE(para, 'w:r'), 'w:fldChar', {'w:fldCharType': 'begin'})
-                SE(SE(para, 'w:r'), 'w:instrText', {'xml:space': 'preserve'}, text=' ')
-                SE(SE(para, 'w:r'), 'w:instrText', text='TOC \\o "1-3" \\h \\z \\u')
-                SE(SE(para, 'w:r'), 'w:instrText', {'xml:space': 'preserve'}, text=' ')
-                SE(SE(para, 'w:r'), 'w:fldChar', {'w:fldCharType': 'separate'})
-
-            link = SE(para, 'w:hyperlink', {'w:anchor': self.mark.get_name(), 'w:history': '1'})
-            assert self.order is not None
-            SE(SE(link, 'w:r'), 'w:t', text=self.order.get_order())
-            SE(SE(link, 'w:r'), 'w:tab')
-            super().build(link)
-            SE(SE(link, 'w:r'), 'w:tab')
-            SE(SE(link, 'w:r'), 'w:fldChar', {'w:fldCharType': 'begin'})
-            SE(SE(link, 'w:r'), 'w:instrText', {'xml:space': 'preserve'}, text=f' PAGEREF {self.mark.get_name()} \\h ')
-            SE(SE(link, 'w:r'), 'w:fldChar', {'w:fldCharType': 'separate'})
-            SE(SE(link, 'w:r'), 'w:t', text='0')
-            SE(SE(link, 'w:r'), 'w:fldChar', {'w:fldCharType': 'end'})
+            SE(SE(para, 'w:pPr'), 'w:jc', {'w:val': 'center'})
+            run = SE(para, 'w:r')
+            prop = SE(run, 'w:rPr')
+            SE(prop, 'w:b')
+            SE(prop, 'w:sz', {'w:val': '32'})
+            SE(run, 'w:t', text='目录')
+
+        para = SE(base, 'w:p')
+        prop = SE(para, 'w:pPr')
+        SE(prop, 'w:pStyle', {'w:val': f'{self.level*10}'})
+        tabs = SE(prop, 'w:tabs')
+        SE(tabs, 'w:tab', {'w:val': 'left', 'w:pos': f'{420+630*(self.level-1)}'})
+        SE(tabs, 'w:tab', {'w:val': 'right', 'w:leader': 'dot', 'w:pos': '8296'})
+        run_prop = SE(prop, 'w:rPr')
+        SE(run_prop, 'w:noProof')
+        SE(run_prop, 'w:rStyle', {'w:val': 'a3'})
+
+        if self.order.is_first:
+            SE(SE(para, 'w:r'), 'w:fldChar', {'w:fldCharType': 'begin'})
+            SE(SE(para, 'w:r'), 'w:instrText', {'xml:space': 'preserve'}, text=' ')
+            SE(SE(para, 'w:r'), 'w:instrText', text='TOC \\o "1-3" \\h \\z \\u')
+            SE(SE(para, 'w:r'), 'w:instrText', {'xml:space': 'preserve'}, text=' ')
+            SE(SE(para, 'w:r'), 'w:fldChar', {'w:fldCharType': 'separate'})
+
+        link = SE(para, 'w:hyperlink', {'w:anchor': self.mark.get_name(), 'w:history': '1'})
+        SE(SE(link, 'w:r'), 'w:t', text=self.order.get_order())
+        SE(SE(link, 'w:r'), 'w:tab')
+        super().build(link)
+        SE(SE(link, 'w:r'), 'w:tab')
+        SE(SE(link, 'w:r'), 'w:fldChar', {'w:fldCharType': 'begin'})
+        SE(SE(link, 'w:r'), 'w:instrText', {'xml:space': 'preserve'}, text=f' PAGEREF {self.mark.get_name()} \\h ')
+        SE(SE(link, 'w:r'), 'w:fldChar', {'w:fldCharType': 'separate'})
+        SE(SE(link, 'w:r'), 'w:t', text='0')
+        SE(SE(link, 'w:r'), 'w:fldChar', {'w:fldCharType': 'end'})
 
 
 class CatalogEnd(Component):
@@ -392,6 +555,11 @@ class CatalogEnd(Component):
         SE(SE(SE(base, 'w:p'), 'w:r'), 'w:fldChar', {'w:fldCharType': 'end'})
 
 
+class PageBreak(Component):
+    def build(self, base):
+        SE(SE(SE(base, 'w:p'), 'w:r'), 'w:br', {'w:type': 'page'})
+
+
 # body
 class Text(Component):
     def __init__(self, text, font=None, size=None, italic=None, bold=None, underline=None):
@@ -424,6 +592,7 @@ class Text(Component):
         SE(run, 'w:t', text=self.text)
 
 
+# headings deeper than 3 are not in the catalog and have no order.
 class HeadingInBody(Composite):
     def __init__(self, mark: Mark, order: CatalogOrder, level: int):
         super().__init__()
@@ -432,8 +601,8 @@ class HeadingInBody(Composite):
         self.level = level
 
     def build(self, base):
-        if not self.order.is_first and self.level == 1:
-            SE(SE(SE(base, 'w:p'), 'w:r'), 'w:br', {'w:type': 'page'})
+        if self.level == 1 and not self.order.is_first:
+            PageBreak().build(base)
         para = SE(base, 'w:p')
         SE(SE(para, 'w:pPr'), 'w:pStyle', {'w:val': f'{self.level}'})
         SE(para, 'w:bookmarkStart', {'w:id': self.mark.get_id(), 'w:name': self.mark.get_name()})
@@ -518,17 +687,20 @@ class Bookmark(Component):
 
 
 class Reference(Component):
-    def __init__(self, mark: Mark):
+    def __init__(self, mark: Mark, brackets=True):
         self.mark = mark
+        self.brackets = brackets
 
     def build(self, base):
-        SE(SE(base, 'w:r'), 'w:t', text='(')
+        if self.brackets:
+            SE(SE(base, 'w:r'), 'w:t', text='(')
         SE(SE(base, 'w:r'), 'w:fldChar', {'w:fldCharType': 'begin'})
         SE(SE(base, 'w:r'), 'w:instrText', text=f'REF {self.mark.get_name()} \\h')
         SE(SE(base, 'w:r'), 'w:fldChar', {'w:fldCharType': 'separate'})
         SE(SE(base, 'w:r'), 'w:t', text='0')
         SE(SE(base, 'w:r'), 'w:fldChar', {'w:fldCharType': 'end'})
-        SE(SE(base, 'w:r'), 'w:t', text=')')
+        if self.brackets:
+            SE(SE(base, 'w:r'), 'w:t', text=')')
 
 
 class FootnoteInDocument(Component):
@@ -541,9 +713,177 @@ class FootnoteInDocument(Component):
         SE(run, 'w:footnoteReference', {'w:id': self.footnote_rel.get_id()})
 
 
-class Table(Composite):
-    def __init__(self):
-        super().__init__()
+class InlineFigure(Component):
+    def __init__(self, rel_index: RelIndex, image_index: ImageIndex, cx: int, cy: int):
+        self.rel_index = rel_index
+        self.image_index = image_index
+        self.cx = cx
+        self.cy = cy
+
+    def build(self, base):
+        fig_id = f'{self.image_index.index}'
+        name = self.image_index.get_name()
+
+        inline = SE(SE(SE(base, 'w:r'), 'w:drawing'), 'wp:inline')
+        SE(inline, 'wp:extent', {'cx': f'{self.cx}', 'cy': f'{self.cy}'})
+        SE(inline, 'wp:effectExtent', {'l': '0', 't': '0', 'r': '0', 'b': '0'})
+        SE(inline, 'wp:docPr', {'id': fig_id, 'name': name})
+        SE(SE(inline, 'wp:cNvGraphicFramePr'), 'a:graphicFrameLocks',
+           {'xmlns:a': 'http://schemas.openxmlformats.org/drawingml/2006/main', 'noChangeAspect': '1'})
+
+        graphic = SE(inline, 'a:graphic', {'xmlns:a': 'http://schemas.openxmlformats.org/drawingml/2006/main'})
+        data = SE(graphic, 'a:graphicData', {'uri': 'http://schemas.openxmlformats.org/drawingml/2006/picture'})
+        pic = SE(data, 'pic:pic', {'xmlns:pic': 'http://schemas.openxmlformats.org/drawingml/2006/picture'})
+        nv_pic_pr = SE(pic, 'pic:nvPicPr')
+        SE(nv_pic_pr, 'pic:cNvPr', {'id': fig_id, 'name': name})
+        SE(nv_pic_pr, 'pic:cNvPicPr')
+        fill = SE(pic, 'pic:blipFill')
+        SE(fill, 'a:blip', {'r:embed': self.rel_index.get_id()})
+        SE(SE(fill, 'a:stretch'), 'a:fillRect')
+        sp_pr = SE(pic, 'pic:spPr')
+        xfrm = SE(sp_pr, 'a:xfrm')
+        SE(xfrm, 'a:off', {'x': '0', 'y': '0'})
+        SE(xfrm, 'a:ext', {'cx': f'{self.cx}', 'cy': f'{self.cy}'})
+        SE(SE(sp_pr, 'a:prstGeom', {'prst': 'rect'}), 'a:avLst')
+
+
+class FigureParagraph(Component):
+    def __init__(self, figure: InlineFigure, title: Component = None):
+        self.figure = figure
+        self.title = title
+
+    def build(self, base):
+        para = SE(base, 'w:p')
+        prop = SE(para, 'w:pPr')
+        SE(prop, 'w:jc', {'w:val': 'center'})
+        if self.title is not None:
+            SE(prop, 'w:keepNext')
+        self.figure.build(para)
+
+        if self.title is not None:
+            para = SE(base, 'w:p')
+            SE(SE(para, 'w:pPr'), 'w:pStyle', {'w:val': 'a9'})
+            self.title.build(para)
+
+
+class Table(Component):
+    def __init__(self, column_count, title, rows, header_rows=0):
+        self.column_count = column_count
+        self.title = title
+        self.rows = rows
+        self.header_rows = header_rows
+
+    def build(self, base):
+        if self.title is not None:
+            para = SE(base, 'w:p')
+            prop = SE(para, 'w:pPr')
+            SE(prop, 'w:pStyle', {'w:val': 'a9'})
+            SE(prop, 'w:jc', {'w:val': 'center'})
+            SE(prop, 'w:keepNext')
+            self.title.build(para)
+
+        tb = SE(base, 'w:tbl')
+        prop = SE(tb, 'w:tblPr')
+        SE(prop, 'w:tblStyle', {'w:val': 'ab'})
+        SE(prop, 'w:jc', {'w:val': 'center'})
+        SE(prop, 'w:tblLayout', {'w:type': 'fixed'})
+
+        grid = SE(tb, 'w:tblGrid')
+        width = f'{min(PAGE_WIDTH // self.column_count, MIN_TABLE_CELL_WIDTH)}'
+        for i in range(self.column_count):
+            SE(grid, 'w:gridCol', {'w:w': width})
+
+        for i, row in enumerate(self.rows):
+            tr = SE(tb, 'w:tr')
+            if i < self.header_rows:
+                SE(SE(tr, 'w:trPr'), 'w:tblHeader')
+            for cell in row:
+                tc = SE(tr, 'w:tc')
+                SE(SE(tc, 'w:tcPr'), 'w:vAlign', {'w:val': 'center'})
+                para = SE(tc, 'w:p')
+                SE(SE(para, 'w:pPr'), 'w:jc', {'w:val': 'center'})
+                self.build_cell(para, cell)
+
+    def build_cell(self, base, cell):
+        cell.build(base)
+
+
+# cells of data table are strings.
+class DataTable(Table):
+    def build_cell(self, base, cell):
+        SE(SE(base, 'w:r'), 'w:t', text=cell)
+
+
+class MathParagraph(Component):
+    def __init__(self, math_list):
+        self.math_list = math_list
+
+    def build(self, base):
+        build_math_para(SE(base, 'w:p'), self.math_list)
+
+
+def build_math_para(base, math_list):
+    math_para = SE(base, 'm:oMathPara')
+    for i, m in enumerate(math_list):
+        _append(math_para, m)
+        if i != len(math_list) - 1:
+            SE(SE(math_para, 'w:r'), 'w:br')
+
+
+class MathDefinition(Component):
+    def __init__(self, math_list, bookmark: Bookmark):
+        self.math_list = math_list
+        self.bookmark = bookmark
+
+    def build(self, base):
+        tb = SE(base, 'w:tbl')
+        prop = SE(tb, 'w:tblPr')
+        SE(prop, 'w:jc', {'w:val': 'center'})
+        SE(prop, 'w:tblLayout', {'w:type': 'fixed'})
+        grid = SE(tb, 'w:tblGrid')
+        SE(grid, 'w:gridCol', {'w:w': '8000'})
+        SE(grid, 'w:gridCol', {'w:w': '1000'})
+
+        tr = SE(tb, 'w:tr')
+        prop = SE(tr, 'w:trPr')
+        SE(prop, 'w:cantSplit')
+        SE(prop, 'w:jc', {'w:val': 'center'})
+        cells = list()
+        for i in range(2):
+            tc = SE(tr, 'w:tc')
+            SE(SE(tc, 'w:tcPr'), 'w:vAlign', {'w:val': 'center'})
+            para = SE(tc, 'w:p')
+            SE(SE(para, 'w:pPr'), 'w:jc', {'w:val': 'center'})
+            cells.append(para)
+
+        build_math_para(cells[0], self.math_list)
+        self.bookmark.build(cells[1])
+
+
+class MathNote(Component):
+    # note_list holds (variable, inform, unit), the variable and unit are
+    # math elements.
+    def __init__(self, note_list):
+        self.note_list = note_list
+
+    def build(self, base):
+        if len(self.note_list) > 0:
+            SE(SE(SE(base, 'w:p'), 'w:r'), 'w:t', text='式中：')
+        for var, inform, unit in self.note_list:
+            para = SE(base, 'w:p')
+            tabs = SE(SE(para, 'w:pPr'), 'w:tabs')
+            SE(tabs, 'w:tab', {'w:val': 'right', 'w:pos': '500'})
+            SE(tabs, 'w:tab', {'w:val': 'center', 'w:pos': '600'})
+            SE(tabs, 'w:tab', {'w:val': 'left', 'w:pos': '700'})
+            SE(SE(para, 'w:r'), 'w:tab')
+            _append(SE(para, 'm:oMath'), var)
+            SE(SE(para, 'w:r'), 'w:tab')
+            SE(SE(para, 'w:r'), 'w:t', text='―')
+            SE(SE(para, 'w:r'), 'w:tab')
+            SE(SE(para, 'w:r'), 'w:t', text=inform)
+            if unit is not None:
+                SE(SE(para, 'w:r'), 'w:t', text='，')
+                _append(SE(para, 'm:oMath'), unit)
 
 
 # footnotes
@@ -609,7 +949,7 @@ class FilledXMLFile(FilledPlainFile):
 
 
 class EmptyXMLFile:
-    def __init__(self, path: str, root_element: E):
+    def __init__(self, path: str, root_element: Element):
         self.path = path
         self.root = root_element
 
@@ -619,61 +959,65 @@ class EmptyXMLFile:
     def build(self):
         pass
 
+    # fields of the serialized xml are resolved here, see FieldResolver.
+    def resolve(self, xml):
+        return xml
+
     def write(self, zipfile):
         self.build()
-        with zipfile.open(self.path, 'w') as file:
-            et = ET(self.root)
-            et.write(file, encoding='utf-8', xml_declaration=True)
+        xml = self.resolve(tostring(self.root, encoding='unicode'))
+        zipfile.writestr(self.path, '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n' + xml)
 
 
 class ContentTypeFile(FilledXMLFile):
     def __init__(self):
-        data = """<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types"><Override PartName="/word/footnotes.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.footnotes+xml"/><Override PartName="/customXml/itemProps1.xml" ContentType="application/vnd.openxmlformats-officedocument.customXmlProperties+xml"/><Default Extension="png" ContentType="image/png"/><Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/><Default Extension="xml" ContentType="application/xml"/><Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/><Override PartName="/word/numbering.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/><Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/><Override PartName="/word/endnotes.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.endnotes+xml"/><Override PartName="/docProps/app.xml" ContentType="application/vnd.openxmlformats-officedocument.extended-properties+xml"/><Override PartName="/word/settings.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/><Override PartName="/word/header1.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.header+xml"/><Override PartName="/word/footer1.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.footer+xml"/><Override PartName="/word/theme/theme1.xml" ContentType="application/vnd.openxmlformats-officedocument.theme+xml"/><Override PartName="/word/fontTable.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.fontTable+xml"/><Override PartName="/word/webSettings.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.webSettings+xml"/><Override PartName="/docProps/core.xml" ContentType="application/vnd.openxmlformats-package.core-properties+xml"/></Types>"""
+        data = read_part('content_types.xml')
         super().__init__('[Content_Types].xml', data)
 
 
 class RelsFile(FilledXMLFile):
     def __init__(self):
-        data = """<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"><Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/extended-properties" Target="docProps/app.xml"/><Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" Target="docProps/core.xml"/><Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/></Relationships>"""
+        data = read_part('rels.xml')
         super().__init__('_rels/.rels', data)
 
 
 class Item1XMLRelsFile(FilledXMLFile):
     def __init__(self):
-        data = """<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/customXmlProps" Target="itemProps1.xml"/></Relationships>"""
+        data = read_part('item1.xml.rels')
         super().__init__('customXml/_rels/item1.xml.rels', data)
 
 
 class Item1File(FilledPlainFile):
     def __init__(self):
-        data = """<b:Sources xmlns:b="http://schemas.openxmlformats.org/officeDocument/2006/bibliography" xmlns="http://schemas.openxmlformats.org/officeDocument/2006/bibliography" SelectedStyle="\APA.XSL" StyleName="APA"/>"""
+        data = read_part('item1.xml')
         super().__init__('customXml/item1.xml', data)
 
 
 class ItemProps1File(FilledXMLFile):
     def __init__(self):
-        data = """<ds:datastoreItem xmlns:ds="http://schemas.openxmlformats.org/officeDocument/2006/customXml" ds:itemID="{16CE1163-3A16-4C5A-834F-C1E16F9680D6}"><ds:schemaRefs><ds:schemaRef ds:uri="http://schemas.openxmlformats.org/officeDocument/2006/bibliography"/></ds:schemaRefs></ds:datastoreItem>"""
+        data = read_part('itemProps1.xml')
         super().__init__('customXml/itemProps1.xml', data)
 
 
 class AppFile(FilledXMLFile):
     def __init__(self):
-        data = """<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties" xmlns:vt="http://schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes"><Template>Normal.dotm</Template><TotalTime>0</TotalTime><Pages>1</Pages><Words>1</Words><Characters>12</Characters><Application>Microsoft Office Word</Application><DocSecurity>0</DocSecurity><Lines>1</Lines><Paragraphs>1</Paragraphs><ScaleCrop>false</ScaleCrop><Company></Company><LinksUpToDate>false</LinksUpToDate><CharactersWithSpaces>12</CharactersWithSpaces><SharedDoc>false</SharedDoc><HyperlinksChanged>false</HyperlinksChanged><AppVersion>12.0000</AppVersion></Properties>"""
+        data = read_part('app.xml')
         super().__init__('docProps/app.xml', data)
 
 
 class CoreFile(FilledXMLFile):
     def __init__(self):
-        data = """<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" xmlns:dcmitype="http://purl.org/dc/dcmitype/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"><dc:creator>Tao</dc:creator><cp:lastModifiedBy>HHPDI</cp:lastModifiedBy><cp:revision>1</cp:revision><dcterms:created xsi:type="dcterms:W3CDTF">2019-01-01T00:00:00Z</dcterms:created><dcterms:modified xsi:type="dcterms:W3CDTF">2019-01-01T00:00:00Z</dcterms:modified></cp:coreProperties>"""
+        data = read_part('core.xml')
         super().__init__('docProps/core.xml', data)
 
 
 class DocumentXMLRelsFile(EmptyXMLFile):
-    def __init__(self, relationship_list, footer_rel_id, header_rel_id, doc_rel_pool):
+    def __init__(self, relationship_list, header_rel_id, doc_rel_pool):
         ns = {'xmlns': 'http://schemas.openxmlformats.org/package/2006/relationships'}
         rels = E('Relationships', ns)
         super().__init__('word/_rels/document.xml.rels', rels)
-        self.relationship_list = list()
+        # the images are numbered when the report is visited, as the header.
+        self.relationship_list = list(relationship_list)
         self._rel(doc_rel_pool.relationship(),
                   "http://schemas.openxmlformats.org/officeDocument/2006/relationships/theme",
                   "theme/theme1.xml")
@@ -702,15 +1046,15 @@ class DocumentXMLRelsFile(EmptyXMLFile):
                   "http://schemas.openxmlformats.org/officeDocument/2006/relationships/numbering",
                   "numbering.xml")
 
-        self._rel(footer_rel_id,
+        self.footer_rel_id = doc_rel_pool.relationship()
+        self._rel(self.footer_rel_id,
                   "http://schemas.openxmlformats.org/officeDocument/2006/relationships/footer",
                   "footer1.xml")
 
-        self._rel(header_rel_id,
-                  "http://schemas.openxmlformats.org/officeDocument/2006/relationships/header",
-                  "header1.xml")
-
-        self.relationship_list.extend(relationship_list)
+        if header_rel_id is not None:
+            self._rel(header_rel_id,
+                      "http://schemas.openxmlformats.org/officeDocument/2006/relationships/header",
+                      "header1.xml")
 
     def _rel(self, rel_index, type_, target):
         relationship = Relationship(rel_index, type_, target)
@@ -723,12 +1067,12 @@ class DocumentXMLRelsFile(EmptyXMLFile):
 
 class Theme1File(FilledXMLFile):
     def __init__(self):
-        data = """<a:theme xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" name="Office 主题"><a:themeElements><a:clrScheme name="Office"><a:dk1><a:sysClr val="windowText" lastClr="000000"/></a:dk1><a:lt1><a:sysClr val="window" lastClr="FFFFFF"/></a:lt1><a:dk2><a:srgbClr val="1F497D"/></a:dk2><a:lt2><a:srgbClr val="EEECE1"/></a:lt2><a:accent1><a:srgbClr val="4F81BD"/></a:accent1><a:accent2><a:srgbClr val="C0504D"/></a:accent2><a:accent3><a:srgbClr val="9BBB59"/></a:accent3><a:accent4><a:srgbClr val="8064A2"/></a:accent4><a:accent5><a:srgbClr val="4BACC6"/></a:accent5><a:accent6><a:srgbClr val="F79646"/></a:accent6><a:hlink><a:srgbClr val="0000FF"/></a:hlink><a:folHlink><a:srgbClr val="800080"/></a:folHlink></a:clrScheme><a:fontScheme name="Office"><a:majorFont><a:latin typeface="Cambria"/><a:ea typeface=""/><a:cs typeface=""/><a:font script="Jpan" typeface="ＭＳ ゴシック"/><a:font script="Hang" typeface="맑은 고딕"/><a:font script="Hans" typeface="宋体"/><a:font script="Hant" typeface="新細明體"/><a:font script="Arab" typeface="Times New Roman"/><a:font script="Hebr" typeface="Times New Roman"/><a:font script="Thai" typeface="Angsana New"/><a:font script="Ethi" typeface="Nyala"/><a:font script="Beng" typeface="Vrinda"/><a:font script="Gujr" typeface="Shruti"/><a:font script="Khmr" typeface="MoolBoran"/><a:font script="Knda" typeface="Tunga"/><a:font script="Guru" typeface="Raavi"/><a:font script="Cans" typeface="Euphemia"/><a:font script="Cher" typeface="Plantagenet Cherokee"/><a:font script="Yiii" typeface="Microsoft Yi Baiti"/><a:font script="Tibt" typeface="Microsoft Himalaya"/><a:font script="Thaa" typeface="MV Boli"/><a:font script="Deva" typeface="Mangal"/><a:font script="Telu" typeface="Gautami"/><a:font script="Taml" typeface="Latha"/><a:font script="Syrc" typeface="Estrangelo Edessa"/><a:font script="Orya" typeface="Kalinga"/><a:font script="Mlym" typeface="Kartika"/><a:font script="Laoo" typeface="DokChampa"/><a:font script="Sinh" typeface="Iskoola Pota"/><a:font script="Mong" typeface="Mongolian Baiti"/><a:font script="Viet" typeface="Times New Roman"/><a:font script="Uigh" typeface="Microsoft Uighur"/></a:majorFont><a:minorFont><a:latin typeface="Calibri"/><a:ea typeface=""/><a:cs typeface=""/><a:font script="Jpan" typeface="ＭＳ 明朝"/><a:font script="Hang" typeface="맑은 고딕"/><a:font script="Hans" typeface="宋体"/><a:font script="Hant" typeface="新細明體"/><a:font script="Arab" typeface="Arial"/><a:font script="Hebr" typeface="Arial"/><a:font script="Thai" typeface="Cordia New"/><a:font script="Ethi" typeface="Nyala"/><a:font script="Beng" typeface="Vrinda"/><a:font script="Gujr" typeface="Shruti"/><a:font script="Khmr" typeface="DaunPenh"/><a:font script="Knda" typeface="Tunga"/><a:font script="Guru" typeface="Raavi"/><a:font script="Cans" typeface="Euphemia"/><a:font script="Cher" typeface="Plantagenet Cherokee"/><a:font script="Yiii" typeface="Microsoft Yi Baiti"/><a:font script="Tibt" typeface="Microsoft Himalaya"/><a:font script="Thaa" typeface="MV Boli"/><a:font script="Deva" typeface="Mangal"/><a:font script="Telu" typeface="Gautami"/><a:font script="Taml" typeface="Latha"/><a:font script="Syrc" typeface="Estrangelo Edessa"/><a:font script="Orya" typeface="Kalinga"/><a:font script="Mlym" typeface="Kartika"/><a:font script="Laoo" typeface="DokChampa"/><a:font script="Sinh" typeface="Iskoola Pota"/><a:font script="Mong" typeface="Mongolian Baiti"/><a:font script="Viet" typeface="Arial"/><a:font script="Uigh" typeface="Microsoft Uighur"/></a:minorFont></a:fontScheme><a:fmtScheme name="Office"><a:fillStyleLst><a:solidFill><a:schemeClr val="phClr"/></a:solidFill><a:gradFill rotWithShape="1"><a:gsLst><a:gs pos="0"><a:schemeClr val="phClr"><a:tint val="50000"/><a:satMod val="300000"/></a:schemeClr></a:gs><a:gs pos="35000"><a:schemeClr val="phClr"><a:tint val="37000"/><a:satMod val="300000"/></a:schemeClr></a:gs><a:gs pos="100000"><a:schemeClr val="phClr"><a:tint val="15000"/><a:satMod val="350000"/></a:schemeClr></a:gs></a:gsLst><a:lin ang="16200000" scaled="1"/></a:gradFill><a:gradFill rotWithShape="1"><a:gsLst><a:gs pos="0"><a:schemeClr val="phClr"><a:shade val="51000"/><a:satMod val="130000"/></a:schemeClr></a:gs><a:gs pos="80000"><a:schemeClr val="phClr"><a:shade val="93000"/><a:satMod val="130000"/></a:schemeClr></a:gs><a:gs pos="100000"><a:schemeClr val="phClr"><a:shade val="94000"/><a:satMod val="135000"/></a:schemeClr></a:gs></a:gsLst><a:lin ang="16200000" scaled="0"/></a:gradFill></a:fillStyleLst><a:lnStyleLst><a:ln w="9525" cap="flat" cmpd="sng" algn="ctr"><a:solidFill><a:schemeClr val="phClr"><a:shade val="95000"/><a:satMod val="105000"/></a:schemeClr></a:solidFill><a:prstDash val="solid"/></a:ln><a:ln w="25400" cap="flat" cmpd="sng" algn="ctr"><a:solidFill><a:schemeClr val="phClr"/></a:solidFill><a:prstDash val="solid"/></a:ln><a:ln w="38100" cap="flat" cmpd="sng" algn="ctr"><a:solidFill><a:schemeClr val="phClr"/></a:solidFill><a:prstDash val="solid"/></a:ln></a:lnStyleLst><a:effectStyleLst><a:effectStyle><a:effectLst><a:outerShdw blurRad="40000" dist="20000" dir="5400000" rotWithShape="0"><a:srgbClr val="000000"><a:alpha val="38000"/></a:srgbClr></a:outerShdw></a:effectLst></a:effectStyle><a:effectStyle><a:effectLst><a:outerShdw blurRad="40000" dist="23000" dir="5400000" rotWithShape="0"><a:srgbClr val="000000"><a:alpha val="35000"/></a:srgbClr></a:outerShdw></a:effectLst></a:effectStyle><a:effectStyle><a:effectLst><a:outerShdw blurRad="40000" dist="23000" dir="5400000" rotWithShape="0"><a:srgbClr val="000000"><a:alpha val="35000"/></a:srgbClr></a:outerShdw></a:effectLst><a:scene3d><a:camera prst="orthographicFront"><a:rot lat="0" lon="0" rev="0"/></a:camera><a:lightRig rig="threePt" dir="t"><a:rot lat="0" lon="0" rev="1200000"/></a:lightRig></a:scene3d><a:sp3d><a:bevelT w="63500" h="25400"/></a:sp3d></a:effectStyle></a:effectStyleLst><a:bgFillStyleLst><a:solidFill><a:schemeClr val="phClr"/></a:solidFill><a:gradFill rotWithShape="1"><a:gsLst><a:gs pos="0"><a:schemeClr val="phClr"><a:tint val="40000"/><a:satMod val="350000"/></a:schemeClr></a:gs><a:gs pos="40000"><a:schemeClr val="phClr"><a:tint val="45000"/><a:shade val="99000"/><a:satMod val="350000"/></a:schemeClr></a:gs><a:gs pos="100000"><a:schemeClr val="phClr"><a:shade val="20000"/><a:satMod val="255000"/></a:schemeClr></a:gs></a:gsLst><a:path path="circle"><a:fillToRect l="50000" t="-80000" r="50000" b="180000"/></a:path></a:gradFill><a:gradFill rotWithShape="1"><a:gsLst><a:gs pos="0"><a:schemeClr val="phClr"><a:tint val="80000"/><a:satMod val="300000"/></a:schemeClr></a:gs><a:gs pos="100000"><a:schemeClr val="phClr"><a:shade val="30000"/><a:satMod val="200000"/></a:schemeClr></a:gs></a:gsLst><a:path path="circle"><a:fillToRect l="50000" t="50000" r="50000" b="50000"/></a:path></a:gradFill></a:bgFillStyleLst></a:fmtScheme></a:themeElements><a:objectDefaults/><a:extraClrSchemeLst/></a:theme>"""
+        data = read_part('theme1.xml')
         super().__init__('word/theme/theme1.xml', data)
 
 
 class DocumentFile(EmptyXMLFile):
-    def __init__(self, cover_list, heading_list, content_list, footer_rel_id, header_rel_id):
+    def __init__(self, cover_list, heading_list, content_list, footer_rel_id, header_rel_id, resolver):
         ns = {'xmlns:ve': 'http://schemas.openxmlformats.org/markup_compatibility/2006',
               'xmlns:o': 'urn:schemas-microsoft-com:office:office',
               'xmlns:r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
@@ -742,7 +1086,10 @@ class DocumentFile(EmptyXMLFile):
         self.body = SE(doc, 'w:body')
         super().__init__('word/document.xml', doc)
 
-        self.cover_list = cover_list
+        self.resolver = resolver
+        self.cover_list = list(cover_list)
+        if len(cover_list) > 0:
+            self.cover_list.append(PageBreak())
         self.heading_list = heading_list
         if len(heading_list) > 0:
             self.heading_list.append(CatalogEnd())
@@ -760,27 +1107,30 @@ class DocumentFile(EmptyXMLFile):
         for content in self.content_list:
             content.build(self.body)
 
+    def resolve(self, xml):
+        return self.resolver.resolve_document(xml)
+
 
 class EndnotesFile(FilledXMLFile):
     def __init__(self):
-        data = """<w:endnotes xmlns:ve="http://schemas.openxmlformats.org/markup-compatibility/2006" xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:m="http://schemas.openxmlformats.org/officeDocument/2006/math" xmlns:v="urn:schemas-microsoft-com:vml" xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" xmlns:w10="urn:schemas-microsoft-com:office:word" xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" xmlns:wne="http://schemas.microsoft.com/office/word/2006/wordml"><w:endnote w:type="separator" w:id="0"><w:p w:rsidR="00E93427" w:rsidRDefault="00E93427" w:rsidP="00C825F3"><w:r><w:separator/></w:r></w:p></w:endnote><w:endnote w:type="continuationSeparator" w:id="1"><w:p w:rsidR="00E93427" w:rsidRDefault="00E93427" w:rsidP="00C825F3"><w:r><w:continuationSeparator/></w:r></w:p></w:endnote></w:endnotes>"""
+        data = read_part('endnotes.xml')
         super().__init__('word/endnotes.xml', data)
 
 
 class FontTableFile(FilledXMLFile):
     def __init__(self):
-        data = """<w:fonts xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:font w:name="Calibri"><w:panose1 w:val="020F0502020204030204"/><w:charset w:val="00"/><w:family w:val="swiss"/><w:pitch w:val="variable"/><w:sig w:usb0="E10002FF" w:usb1="4000ACFF" w:usb2="00000009" w:usb3="00000000" w:csb0="0000019F" w:csb1="00000000"/></w:font><w:font w:name="宋体"><w:altName w:val="SimSun"/><w:panose1 w:val="02010600030101010101"/><w:charset w:val="86"/><w:family w:val="auto"/><w:pitch w:val="variable"/><w:sig w:usb0="00000003" w:usb1="288F0000" w:usb2="00000016" w:usb3="00000000" w:csb0="00040001" w:csb1="00000000"/></w:font><w:font w:name="Times New Roman"><w:panose1 w:val="02020603050405020304"/><w:charset w:val="00"/><w:family w:val="roman"/><w:pitch w:val="variable"/><w:sig w:usb0="E0002AFF" w:usb1="C0007841" w:usb2="00000009" w:usb3="00000000" w:csb0="000001FF" w:csb1="00000000"/></w:font><w:font w:name="Cambria"><w:panose1 w:val="02040503050406030204"/><w:charset w:val="00"/><w:family w:val="roman"/><w:pitch w:val="variable"/><w:sig w:usb0="E00002FF" w:usb1="400004FF" w:usb2="00000000" w:usb3="00000000" w:csb0="0000019F" w:csb1="00000000"/></w:font><w:font w:name="楷体"><w:panose1 w:val="02010609060101010101"/><w:charset w:val="86"/><w:family w:val="modern"/><w:pitch w:val="fixed"/><w:sig w:usb0="800002BF" w:usb1="38CF7CFA" w:usb2="00000016" w:usb3="00000000" w:csb0="00040001" w:csb1="00000000"/></w:font><w:font w:name="Cambria Math"><w:panose1 w:val="02040503050406030204"/><w:charset w:val="00"/><w:family w:val="roman"/><w:pitch w:val="variable"/><w:sig w:usb0="E00002FF" w:usb1="420024FF" w:usb2="00000000" w:usb3="00000000" w:csb0="0000019F" w:csb1="00000000"/></w:font></w:fonts>"""
+        data = read_part('fontTable.xml')
         super().__init__('word/fontTable.xml', data)
 
 
 class FooterFile(FilledXMLFile):
     def __init__(self):
-        data = """<w:ftr xmlns:ve="http://schemas.openxmlformats.org/markup-compatibility/2006" xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:m="http://schemas.openxmlformats.org/officeDocument/2006/math" xmlns:v="urn:schemas-microsoft-com:vml" xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" xmlns:w10="urn:schemas-microsoft-com:office:word" xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" xmlns:wne="http://schemas.microsoft.com/office/word/2006/wordml"><w:sdt><w:sdtPr><w:id w:val="23625823"/><w:docPartObj><w:docPartGallery w:val="Page Numbers (Bottom of Page)"/><w:docPartUnique/></w:docPartObj></w:sdtPr><w:sdtContent><w:p w:rsidR="003221F4" w:rsidRDefault="00A805B6"><w:pPr><w:pStyle w:val="a5"/><w:jc w:val="center"/></w:pPr><w:fldSimple w:instr=" PAGE   \* MERGEFORMAT "><w:r w:rsidR="006E593F" w:rsidRPr="006E593F"><w:rPr><w:noProof/><w:lang w:val="zh-CN"/></w:rPr><w:t>2</w:t></w:r></w:fldSimple></w:p></w:sdtContent></w:sdt><w:p w:rsidR="003221F4" w:rsidRDefault="003221F4"><w:pPr><w:pStyle w:val="a5"/></w:pPr></w:p></w:ftr>"""
+        data = read_part('footer1.xml')
         super().__init__('word/footer1.xml', data)
 
 
 class FootnotesFile(EmptyXMLFile):
-    def __init__(self, footnote_list):
+    def __init__(self, footnote_list, resolver):
         ns = {'xmlns:ve': 'http://schemas.openxmlformats.org/markup_compatibility/2006',
               'xmlns:o': 'urn:schemas-microsoft-com:office:office',
               'xmlns:r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
@@ -799,12 +1149,17 @@ class FootnotesFile(EmptyXMLFile):
         SE(SE(SE(note, 'w:p'), 'w:r'), 'w:continuationSeparator')
 
         super().__init__('word/footnotes.xml', footnotes)
+        self.resolver = resolver
         self.footnote_list = footnote_list
 
     def build(self):
         for footnote in self.footnote_list:
             footnote.build(self.root)
 
+    # the marks are collected by the document, which is written before.
+    def resolve(self, xml):
+        return self.resolver.resolve_references(xml)
+
 
 class HeaderFile(EmptyXMLFile):
     def __init__(self, header):
@@ -830,23 +1185,23 @@ class HeaderFile(EmptyXMLFile):
 
 class NumberingFile(FilledXMLFile):
     def __init__(self):
-        data = """<w:numbering xmlns:ve="http://schemas.openxmlformats.org/markup-compatibility/2006" xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:m="http://schemas.openxmlformats.org/officeDocument/2006/math" xmlns:v="urn:schemas-microsoft-com:vml" xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" xmlns:w10="urn:schemas-microsoft-com:office:word" xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" xmlns:wne="http://schemas.microsoft.com/office/word/2006/wordml"><w:abstractNum w:abstractNumId="0"><w:nsid w:val="5D861EAE"/><w:multiLevelType w:val="multilevel"/><w:tmpl w:val="04090025"/><w:lvl w:ilvl="0"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="1"/><w:lvlText w:val="%1"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="432" w:hanging="432"/></w:pPr></w:lvl><w:lvl w:ilvl="1"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="2"/><w:lvlText w:val="%1.%2"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="576" w:hanging="576"/></w:pPr></w:lvl><w:lvl w:ilvl="2"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="3"/><w:lvlText w:val="%1.%2.%3"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="720" w:hanging="720"/></w:pPr></w:lvl><w:lvl w:ilvl="3"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="4"/><w:lvlText w:val="%1.%2.%3.%4"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="864" w:hanging="864"/></w:pPr></w:lvl><w:lvl w:ilvl="4"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="5"/><w:lvlText w:val="%1.%2.%3.%4.%5"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="1008" w:hanging="1008"/></w:pPr></w:lvl><w:lvl w:ilvl="5"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="6"/><w:lvlText w:val="%1.%2.%3.%4.%5.%6"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="1152" w:hanging="1152"/></w:pPr></w:lvl><w:lvl w:ilvl="6"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="7"/><w:lvlText w:val="%1.%2.%3.%4.%5.%6.%7"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="1296" w:hanging="1296"/></w:pPr></w:lvl><w:lvl w:ilvl="7"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="8"/><w:lvlText w:val="%1.%2.%3.%4.%5.%6.%7.%8"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="1440" w:hanging="1440"/></w:pPr></w:lvl><w:lvl w:ilvl="8"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="9"/><w:lvlText w:val="%1.%2.%3.%4.%5.%6.%7.%8.%9"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="1584" w:hanging="1584"/></w:pPr></w:lvl></w:abstractNum><w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num></w:numbering>"""
+        data = read_part('numbering.xml')
         super().__init__('word/numbering.xml', data)
 
 
 class SettingsFile(FilledXMLFile):
     def __init__(self):
-        data = """<w:settings xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:m="http://schemas.openxmlformats.org/officeDocument/2006/math" xmlns:v="urn:schemas-microsoft-com:vml" xmlns:w10="urn:schemas-microsoft-com:office:word" xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" xmlns:sl="http://schemas.openxmlformats.org/schemaLibrary/2006/main"><w:zoom w:percent="160"/><w:bordersDoNotSurroundHeader/><w:bordersDoNotSurroundFooter/><w:defaultTabStop w:val="420"/><w:drawingGridVerticalSpacing w:val="156"/><w:displayHorizontalDrawingGridEvery w:val="0"/><w:displayVerticalDrawingGridEvery w:val="2"/><w:characterSpacingControl w:val="compressPunctuation"/><w:hdrShapeDefaults><o:shapedefaults v:ext="edit" spidmax="10242"/></w:hdrShapeDefaults><w:footnotePr><w:footnote w:id="0"/><w:footnote w:id="1"/></w:footnotePr><w:endnotePr><w:endnote w:id="0"/><w:endnote w:id="1"/></w:endnotePr><w:compat><w:spaceForUL/><w:balanceSingleByteDoubleByteWidth/><w:doNotLeaveBackslashAlone/><w:ulTrailSpace/><w:doNotExpandShiftReturn/><w:adjustLineHeightInTable/><w:useFELayout/></w:compat><w:rsids><w:rsidRoot w:val="003221F4"/><w:rsid w:val="0023729F"/><w:rsid w:val="003221F4"/><w:rsid w:val="00581F8C"/><w:rsid w:val="005B06A3"/><w:rsid w:val="00626EC2"/><w:rsid w:val="006A65DB"/><w:rsid w:val="006E593F"/><w:rsid w:val="00926F4A"/><w:rsid w:val="00971FF4"/><w:rsid w:val="00A805B6"/><w:rsid w:val="00C501FC"/><w:rsid w:val="00D637A7"/></w:rsids><m:mathPr><m:mathFont m:val="Cambria Math"/><m:brkBin m:val="before"/><m:brkBinSub m:val="--"/><m:smallFrac m:val="off"/><m:dispDef/><m:lMargin m:val="0"/><m:rMargin m:val="0"/><m:defJc m:val="centerGroup"/><m:wrapIndent m:val="600"/><m:intLim m:val="subSup"/><m:naryLim m:val="undOvr"/></m:mathPr><w:themeFontLang w:val="en-US" w:eastAsia="zh-CN"/><w:clrSchemeMapping w:bg1="light1" w:t1="dark1" w:bg2="light2" w:t2="dark2" w:accent1="accent1" w:accent2="accent2" w:accent3="accent3" w:accent4="accent4" w:accent5="accent5" w:accent6="accent6" w:hyperlink="hyperlink" w:followedHyperlink="followedHyperlink"/><w:shapeDefaults><o:shapedefaults v:ext="edit" spidmax="10242"/><o:shapelayout v:ext="edit"><o:idmap v:ext="edit" data="1"/></o:shapelayout></w:shapeDefaults><w:decimalSymbol w:val="."/><w:listSeparator w:val=","/></w:settings>"""
+        data = read_part('settings.xml')
         super().__init__('word/settings.xml', data)
 
 
 class StylesFile(FilledXMLFile):
     def __init__(self):
-        data = """<w:styles xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:docDefaults><w:rPrDefault><w:rPr><w:rFonts w:asciiTheme="minorHAnsi" w:eastAsiaTheme="minorEastAsia" w:hAnsiTheme="minorHAnsi" w:cstheme="minorBidi"/><w:kern w:val="2"/><w:sz w:val="21"/><w:szCs w:val="22"/><w:lang w:val="en-US" w:eastAsia="zh-CN" w:bidi="ar-SA"/></w:rPr></w:rPrDefault><w:pPrDefault/></w:docDefaults><w:latentStyles w:defLockedState="0" w:defUIPriority="99" w:defSemiHidden="1" w:defUnhideWhenUsed="1" w:defQFormat="0" w:count="267"><w:lsdException w:name="Normal" w:semiHidden="0" w:uiPriority="0" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="heading 1" w:semiHidden="0" w:uiPriority="9" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="heading 2" w:uiPriority="9" w:qFormat="1"/><w:lsdException w:name="heading 3" w:uiPriority="9" w:qFormat="1"/><w:lsdException w:name="heading 4" w:uiPriority="9" w:qFormat="1"/><w:lsdException w:name="heading 5" w:uiPriority="9" w:qFormat="1"/><w:lsdException w:name="heading 6" w:uiPriority="9" w:qFormat="1"/><w:lsdException w:name="heading 7" w:uiPriority="9" w:qFormat="1"/><w:lsdException w:name="heading 8" w:uiPriority="9" w:qFormat="1"/><w:lsdException w:name="heading 9" w:uiPriority="9" w:qFormat="1"/><w:lsdException w:name="toc 1" w:uiPriority="39"/><w:lsdException w:name="toc 2" w:uiPriority="39"/><w:lsdException w:name="toc 3" w:uiPriority="39"/><w:lsdException w:name="toc 4" w:uiPriority="39"/><w:lsdException w:name="toc 5" w:uiPriority="39"/><w:lsdException w:name="toc 6" w:uiPriority="39"/><w:lsdException w:name="toc 7" w:uiPriority="39"/><w:lsdException w:name="toc 8" w:uiPriority="39"/><w:lsdException w:name="toc 9" w:uiPriority="39"/><w:lsdException w:name="caption" w:uiPriority="35" w:qFormat="1"/><w:lsdException w:name="Title" w:semiHidden="0" w:uiPriority="10" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Default Paragraph Font" w:uiPriority="1"/><w:lsdException w:name="Subtitle" w:semiHidden="0" w:uiPriority="11" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Strong" w:semiHidden="0" w:uiPriority="22" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Emphasis" w:semiHidden="0" w:uiPriority="20" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Table Grid" w:semiHidden="0" w:uiPriority="59" w:unhideWhenUsed="0"/><w:lsdException w:name="Placeholder Text" w:unhideWhenUsed="0"/><w:lsdException w:name="No Spacing" w:semiHidden="0" w:uiPriority="1" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Light Shading" w:semiHidden="0" w:uiPriority="60" w:unhideWhenUsed="0"/><w:lsdException w:name="Light List" w:semiHidden="0" w:uiPriority="61" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Grid" w:semiHidden="0" w:uiPriority="62" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 1" w:semiHidden="0" w:uiPriority="63" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 2" w:semiHidden="0" w:uiPriority="64" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 1" w:semiHidden="0" w:uiPriority="65" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 2" w:semiHidden="0" w:uiPriority="66" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 1" w:semiHidden="0" w:uiPriority="67" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 2" w:semiHidden="0" w:uiPriority="68" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 3" w:semiHidden="0" w:uiPriority="69" w:unhideWhenUsed="0"/><w:lsdException w:name="Dark List" w:semiHidden="0" w:uiPriority="70" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Shading" w:semiHidden="0" w:uiPriority="71" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful List" w:semiHidden="0" w:uiPriority="72" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Grid" w:semiHidden="0" w:uiPriority="73" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Shading Accent 1" w:semiHidden="0" w:uiPriority="60" w:unhideWhenUsed="0"/><w:lsdException w:name="Light List Accent 1" w:semiHidden="0" w:uiPriority="61" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Grid Accent 1" w:semiHidden="0" w:uiPriority="62" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 1 Accent 1" w:semiHidden="0" w:uiPriority="63" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 2 Accent 1" w:semiHidden="0" w:uiPriority="64" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 1 Accent 1" w:semiHidden="0" w:uiPriority="65" w:unhideWhenUsed="0"/><w:lsdException w:name="Revision" w:unhideWhenUsed="0"/><w:lsdException w:name="List Paragraph" w:semiHidden="0" w:uiPriority="34" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Quote" w:semiHidden="0" w:uiPriority="29" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Intense Quote" w:semiHidden="0" w:uiPriority="30" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Medium List 2 Accent 1" w:semiHidden="0" w:uiPriority="66" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 1 Accent 1" w:semiHidden="0" w:uiPriority="67" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 2 Accent 1" w:semiHidden="0" w:uiPriority="68" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 3 Accent 1" w:semiHidden="0" w:uiPriority="69" w:unhideWhenUsed="0"/><w:lsdException w:name="Dark List Accent 1" w:semiHidden="0" w:uiPriority="70" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Shading Accent 1" w:semiHidden="0" w:uiPriority="71" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful List Accent 1" w:semiHidden="0" w:uiPriority="72" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Grid Accent 1" w:semiHidden="0" w:uiPriority="73" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Shading Accent 2" w:semiHidden="0" w:uiPriority="60" w:unhideWhenUsed="0"/><w:lsdException w:name="Light List Accent 2" w:semiHidden="0" w:uiPriority="61" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Grid Accent 2" w:semiHidden="0" w:uiPriority="62" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 1 Accent 2" w:semiHidden="0" w:uiPriority="63" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 2 Accent 2" w:semiHidden="0" w:uiPriority="64" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 1 Accent 2" w:semiHidden="0" w:uiPriority="65" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 2 Accent 2" w:semiHidden="0" w:uiPriority="66" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 1 Accent 2" w:semiHidden="0" w:uiPriority="67" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 2 Accent 2" w:semiHidden="0" w:uiPriority="68" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 3 Accent 2" w:semiHidden="0" w:uiPriority="69" w:unhideWhenUsed="0"/><w:lsdException w:name="Dark List Accent 2" w:semiHidden="0" w:uiPriority="70" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Shading Accent 2" w:semiHidden="0" w:uiPriority="71" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful List Accent 2" w:semiHidden="0" w:uiPriority="72" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Grid Accent 2" w:semiHidden="0" w:uiPriority="73" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Shading Accent 3" w:semiHidden="0" w:uiPriority="60" w:unhideWhenUsed="0"/><w:lsdException w:name="Light List Accent 3" w:semiHidden="0" w:uiPriority="61" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Grid Accent 3" w:semiHidden="0" w:uiPriority="62" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 1 Accent 3" w:semiHidden="0" w:uiPriority="63" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 2 Accent 3" w:semiHidden="0" w:uiPriority="64" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 1 Accent 3" w:semiHidden="0" w:uiPriority="65" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 2 Accent 3" w:semiHidden="0" w:uiPriority="66" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 1 Accent 3" w:semiHidden="0" w:uiPriority="67" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 2 Accent 3" w:semiHidden="0" w:uiPriority="68" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 3 Accent 3" w:semiHidden="0" w:uiPriority="69" w:unhideWhenUsed="0"/><w:lsdException w:name="Dark List Accent 3" w:semiHidden="0" w:uiPriority="70" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Shading Accent 3" w:semiHidden="0" w:uiPriority="71" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful List Accent 3" w:semiHidden="0" w:uiPriority="72" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Grid Accent 3" w:semiHidden="0" w:uiPriority="73" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Shading Accent 4" w:semiHidden="0" w:uiPriority="60" w:unhideWhenUsed="0"/><w:lsdException w:name="Light List Accent 4" w:semiHidden="0" w:uiPriority="61" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Grid Accent 4" w:semiHidden="0" w:uiPriority="62" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 1 Accent 4" w:semiHidden="0" w:uiPriority="63" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 2 Accent 4" w:semiHidden="0" w:uiPriority="64" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 1 Accent 4" w:semiHidden="0" w:uiPriority="65" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 2 Accent 4" w:semiHidden="0" w:uiPriority="66" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 1 Accent 4" w:semiHidden="0" w:uiPriority="67" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 2 Accent 4" w:semiHidden="0" w:uiPriority="68" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 3 Accent 4" w:semiHidden="0" w:uiPriority="69" w:unhideWhenUsed="0"/><w:lsdException w:name="Dark List Accent 4" w:semiHidden="0" w:uiPriority="70" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Shading Accent 4" w:semiHidden="0" w:uiPriority="71" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful List Accent 4" w:semiHidden="0" w:uiPriority="72" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Grid Accent 4" w:semiHidden="0" w:uiPriority="73" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Shading Accent 5" w:semiHidden="0" w:uiPriority="60" w:unhideWhenUsed="0"/><w:lsdException w:name="Light List Accent 5" w:semiHidden="0" w:uiPriority="61" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Grid Accent 5" w:semiHidden="0" w:uiPriority="62" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 1 Accent 5" w:semiHidden="0" w:uiPriority="63" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 2 Accent 5" w:semiHidden="0" w:uiPriority="64" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 1 Accent 5" w:semiHidden="0" w:uiPriority="65" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 2 Accent 5" w:semiHidden="0" w:uiPriority="66" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 1 Accent 5" w:semiHidden="0" w:uiPriority="67" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 2 Accent 5" w:semiHidden="0" w:uiPriority="68" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 3 Accent 5" w:semiHidden="0" w:uiPriority="69" w:unhideWhenUsed="0"/><w:lsdException w:name="Dark List Accent 5" w:semiHidden="0" w:uiPriority="70" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Shading Accent 5" w:semiHidden="0" w:uiPriority="71" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful List Accent 5" w:semiHidden="0" w:uiPriority="72" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Grid Accent 5" w:semiHidden="0" w:uiPriority="73" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Shading Accent 6" w:semiHidden="0" w:uiPriority="60" w:unhideWhenUsed="0"/><w:lsdException w:name="Light List Accent 6" w:semiHidden="0" w:uiPriority="61" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Grid Accent 6" w:semiHidden="0" w:uiPriority="62" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 1 Accent 6" w:semiHidden="0" w:uiPriority="63" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 2 Accent 6" w:semiHidden="0" w:uiPriority="64" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 1 Accent 6" w:semiHidden="0" w:uiPriority="65" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 2 Accent 6" w:semiHidden="0" w:uiPriority="66" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 1 Accent 6" w:semiHidden="0" w:uiPriority="67" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 2 Accent 6" w:semiHidden="0" w:uiPriority="68" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 3 Accent 6" w:semiHidden="0" w:uiPriority="69" w:unhideWhenUsed="0"/><w:lsdException w:name="Dark List Accent 6" w:semiHidden="0" w:uiPriority="70" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Shading Accent 6" w:semiHidden="0" w:uiPriority="71" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful List Accent 6" w:semiHidden="0" w:uiPriority="72" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Grid Accent 6" w:semiHidden="0" w:uiPriority="73" w:unhideWhenUsed="0"/><w:lsdException w:name="Subtle Emphasis" w:semiHidden="0" w:uiPriority="19" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Intense Emphasis" w:semiHidden="0" w:uiPriority="21" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Subtle Reference" w:semiHidden="0" w:uiPriority="31" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Intense Reference" w:semiHidden="0" w:uiPriority="32" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Book Title" w:semiHidden="0" w:uiPriority="33" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Bibliography" w:uiPriority="37"/><w:lsdException w:name="TOC Heading" w:uiPriority="39" w:qFormat="1"/></w:latentStyles><w:style w:type="paragraph" w:default="1" w:styleId="a"><w:name w:val="Normal"/><w:qFormat/><w:rsid w:val="00971FF4"/><w:pPr><w:widowControl w:val="0"/><w:jc w:val="both"/></w:pPr></w:style><w:style w:type="paragraph" w:styleId="1"><w:name w:val="heading 1"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="1Char"/><w:uiPriority w:val="9"/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:numId w:val="1"/></w:numPr><w:spacing w:before="340" w:after="330" w:line="578" w:lineRule="auto"/><w:outlineLvl w:val="0"/></w:pPr><w:rPr><w:b/><w:bCs/><w:kern w:val="44"/><w:sz w:val="44"/><w:szCs w:val="44"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="2"><w:name w:val="heading 2"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="2Char"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:ilvl w:val="1"/><w:numId w:val="1"/></w:numPr><w:spacing w:before="260" w:after="260" w:line="416" w:lineRule="auto"/><w:outlineLvl w:val="1"/></w:pPr><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:b/><w:bCs/><w:sz w:val="32"/><w:szCs w:val="32"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="3"><w:name w:val="heading 3"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="3Char"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:ilvl w:val="2"/><w:numId w:val="1"/></w:numPr><w:spacing w:before="260" w:after="260" w:line="416" w:lineRule="auto"/><w:outlineLvl w:val="2"/></w:pPr><w:rPr><w:b/><w:bCs/><w:sz w:val="32"/><w:szCs w:val="32"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="4"><w:name w:val="heading 4"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="4Char"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:ilvl w:val="3"/><w:numId w:val="1"/></w:numPr><w:spacing w:before="280" w:after="290" w:line="376" w:lineRule="auto"/><w:outlineLvl w:val="3"/></w:pPr><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:b/><w:bCs/><w:sz w:val="28"/><w:szCs w:val="28"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="5"><w:name w:val="heading 5"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="5Char"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:ilvl w:val="4"/><w:numId w:val="1"/></w:numPr><w:spacing w:before="280" w:after="290" w:line="376" w:lineRule="auto"/><w:outlineLvl w:val="4"/></w:pPr><w:rPr><w:b/><w:bCs/><w:sz w:val="28"/><w:szCs w:val="28"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="6"><w:name w:val="heading 6"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="6Char"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:ilvl w:val="5"/><w:numId w:val="1"/></w:numPr><w:spacing w:before="240" w:after="64" w:line="320" w:lineRule="auto"/><w:outlineLvl w:val="5"/></w:pPr><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:b/><w:bCs/><w:sz w:val="24"/><w:szCs w:val="24"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="7"><w:name w:val="heading 7"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="7Char"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:ilvl w:val="6"/><w:numId w:val="1"/></w:numPr><w:spacing w:before="240" w:after="64" w:line="320" w:lineRule="auto"/><w:outlineLvl w:val="6"/></w:pPr><w:rPr><w:b/><w:bCs/><w:sz w:val="24"/><w:szCs w:val="24"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="8"><w:name w:val="heading 8"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="8Char"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:ilvl w:val="7"/><w:numId w:val="1"/></w:numPr><w:spacing w:before="240" w:after="64" w:line="320" w:lineRule="auto"/><w:outlineLvl w:val="7"/></w:pPr><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:sz w:val="24"/><w:szCs w:val="24"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="9"><w:name w:val="heading 9"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="9Char"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:ilvl w:val="8"/><w:numId w:val="1"/></w:numPr><w:spacing w:before="240" w:after="64" w:line="320" w:lineRule="auto"/><w:outlineLvl w:val="8"/></w:pPr><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:szCs w:val="21"/></w:rPr></w:style><w:style w:type="character" w:default="1" w:styleId="a0"><w:name w:val="Default Paragraph Font"/><w:uiPriority w:val="1"/><w:semiHidden/><w:unhideWhenUsed/></w:style><w:style w:type="table" w:default="1" w:styleId="a1"><w:name w:val="Normal Table"/><w:uiPriority w:val="99"/><w:semiHidden/><w:unhideWhenUsed/><w:qFormat/><w:tblPr><w:tblInd w:w="0" w:type="dxa"/><w:tblCellMar><w:top w:w="0" w:type="dxa"/><w:left w:w="108" w:type="dxa"/><w:bottom w:w="0" w:type="dxa"/><w:right w:w="108" w:type="dxa"/></w:tblCellMar></w:tblPr></w:style><w:style w:type="numbering" w:default="1" w:styleId="a2"><w:name w:val="No List"/><w:uiPriority w:val="99"/><w:semiHidden/><w:unhideWhenUsed/></w:style><w:style w:type="character" w:customStyle="1" w:styleId="1Char"><w:name w:val="标题 1 Char"/><w:basedOn w:val="a0"/><w:link w:val="1"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:b/><w:bCs/><w:kern w:val="44"/><w:sz w:val="44"/><w:szCs w:val="44"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="2Char"><w:name w:val="标题 2 Char"/><w:basedOn w:val="a0"/><w:link w:val="2"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:b/><w:bCs/><w:sz w:val="32"/><w:szCs w:val="32"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="3Char"><w:name w:val="标题 3 Char"/><w:basedOn w:val="a0"/><w:link w:val="3"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:b/><w:bCs/><w:sz w:val="32"/><w:szCs w:val="32"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="4Char"><w:name w:val="标题 4 Char"/><w:basedOn w:val="a0"/><w:link w:val="4"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:b/><w:bCs/><w:sz w:val="28"/><w:szCs w:val="28"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="5Char"><w:name w:val="标题 5 Char"/><w:basedOn w:val="a0"/><w:link w:val="5"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:b/><w:bCs/><w:sz w:val="28"/><w:szCs w:val="28"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="6Char"><w:name w:val="标题 6 Char"/><w:basedOn w:val="a0"/><w:link w:val="6"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:b/><w:bCs/><w:sz w:val="24"/><w:szCs w:val="24"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="7Char"><w:name w:val="标题 7 Char"/><w:basedOn w:val="a0"/><w:link w:val="7"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:b/><w:bCs/><w:sz w:val="24"/><w:szCs w:val="24"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="8Char"><w:name w:val="标题 8 Char"/><w:basedOn w:val="a0"/><w:link w:val="8"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:sz w:val="24"/><w:szCs w:val="24"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="9Char"><w:name w:val="标题 9 Char"/><w:basedOn w:val="a0"/><w:link w:val="9"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:szCs w:val="21"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="10"><w:name w:val="toc 1"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:autoRedefine/><w:uiPriority w:val="39"/><w:unhideWhenUsed/><w:rsid w:val="003221F4"/></w:style><w:style w:type="paragraph" w:styleId="20"><w:name w:val="toc 2"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:autoRedefine/><w:uiPriority w:val="39"/><w:unhideWhenUsed/><w:rsid w:val="003221F4"/><w:pPr><w:ind w:leftChars="200" w:left="420"/></w:pPr></w:style><w:style w:type="paragraph" w:styleId="30"><w:name w:val="toc 3"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:autoRedefine/><w:uiPriority w:val="39"/><w:unhideWhenUsed/><w:rsid w:val="003221F4"/><w:pPr><w:ind w:leftChars="400" w:left="840"/></w:pPr></w:style><w:style w:type="character" w:styleId="a3"><w:name w:val="Hyperlink"/><w:basedOn w:val="a0"/><w:uiPriority w:val="99"/><w:unhideWhenUsed/><w:rsid w:val="003221F4"/><w:rPr><w:color w:val="0000FF" w:themeColor="hyperlink"/><w:u w:val="single"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="a4"><w:name w:val="header"/><w:basedOn w:val="a"/><w:link w:val="Char"/><w:uiPriority w:val="99"/><w:semiHidden/><w:unhideWhenUsed/><w:rsid w:val="003221F4"/><w:pPr><w:pBdr><w:bottom w:val="single" w:sz="6" w:space="1" w:color="auto"/></w:pBdr><w:tabs><w:tab w:val="center" w:pos="4153"/><w:tab w:val="right" w:pos="8306"/></w:tabs><w:snapToGrid w:val="0"/><w:jc w:val="center"/></w:pPr><w:rPr><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="Char"><w:name w:val="页眉 Char"/><w:basedOn w:val="a0"/><w:link w:val="a4"/><w:uiPriority w:val="99"/><w:semiHidden/><w:rsid w:val="003221F4"/><w:rPr><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="a5"><w:name w:val="footer"/><w:basedOn w:val="a"/><w:link w:val="Char0"/><w:uiPriority w:val="99"/><w:unhideWhenUsed/><w:rsid w:val="003221F4"/><w:pPr><w:tabs><w:tab w:val="center" w:pos="4153"/><w:tab w:val="right" w:pos="8306"/></w:tabs><w:snapToGrid w:val="0"/><w:jc w:val="left"/></w:pPr><w:rPr><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="Char0"><w:name w:val="页脚 Char"/><w:basedOn w:val="a0"/><w:link w:val="a5"/><w:uiPriority w:val="99"/><w:rsid w:val="003221F4"/><w:rPr><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="a6"><w:name w:val="Title"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="Char1"/><w:uiPriority w:val="10"/><w:qFormat/><w:rsid w:val="00C501FC"/><w:pPr><w:spacing w:before="240" w:after="60"/><w:jc w:val="center"/><w:outlineLvl w:val="0"/></w:pPr><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsia="宋体" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:b/><w:bCs/><w:sz w:val="32"/><w:szCs w:val="32"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="Char1"><w:name w:val="标题 Char"/><w:basedOn w:val="a0"/><w:link w:val="a6"/><w:uiPriority w:val="10"/><w:rsid w:val="00C501FC"/><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsia="宋体" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:b/><w:bCs/><w:sz w:val="32"/><w:szCs w:val="32"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="a7"><w:name w:val="Document Map"/><w:basedOn w:val="a"/><w:link w:val="Char2"/><w:uiPriority w:val="99"/><w:semiHidden/><w:unhideWhenUsed/><w:rsid w:val="00581F8C"/><w:rPr><w:rFonts w:ascii="宋体" w:eastAsia="宋体"/><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="Char2"><w:name w:val="文档结构图 Char"/><w:basedOn w:val="a0"/><w:link w:val="a7"/><w:uiPriority w:val="99"/><w:semiHidden/><w:rsid w:val="00581F8C"/><w:rPr><w:rFonts w:ascii="宋体" w:eastAsia="宋体"/><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="a8"><w:name w:val="Balloon Text"/><w:basedOn w:val="a"/><w:link w:val="Char3"/><w:uiPriority w:val="99"/><w:semiHidden/><w:unhideWhenUsed/><w:rsid w:val="00581F8C"/><w:rPr><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="Char3"><w:name w:val="批注框文本 Char"/><w:basedOn w:val="a0"/><w:link w:val="a8"/><w:uiPriority w:val="99"/><w:semiHidden/><w:rsid w:val="00581F8C"/><w:rPr><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="a9"><w:name w:val="footnote text"/><w:basedOn w:val="a"/><w:link w:val="Char4"/><w:uiPriority w:val="99"/><w:semiHidden/><w:unhideWhenUsed/><w:rsid w:val="006E593F"/><w:pPr><w:snapToGrid w:val="0"/><w:jc w:val="left"/></w:pPr><w:rPr><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="Char4"><w:name w:val="脚注文本 Char"/><w:basedOn w:val="a0"/><w:link w:val="a9"/><w:uiPriority w:val="99"/><w:semiHidden/><w:rsid w:val="006E593F"/><w:rPr><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="character" w:styleId="aa"><w:name w:val="footnote reference"/><w:basedOn w:val="a0"/><w:uiPriority w:val="99"/><w:semiHidden/><w:unhideWhenUsed/><w:rsid w:val="006E593F"/><w:rPr><w:vertAlign w:val="superscript"/></w:rPr></w:style><w:style w:type="table" w:styleId="ab"><w:name w:val="Table Grid"/><w:basedOn w:val="a1"/><w:uiPriority w:val="59"/><w:rsid w:val="00D06FBB"/><w:tblPr><w:tblInd w:w="0" w:type="dxa"/><w:tblBorders><w:top w:val="single" w:sz="4" w:space="0" w:color="000000" w:themeColor="text1"/><w:left w:val="single" w:sz="4" w:space="0" w:color="000000" w:themeColor="text1"/><w:bottom w:val="single" w:sz="4" w:space="0" w:color="000000" w:themeColor="text1"/><w:right w:val="single" w:sz="4" w:space="0" w:color="000000" w:themeColor="text1"/><w:insideH w:val="single" w:sz="4" w:space="0" w:color="000000" w:themeColor="text1"/><w:insideV w:val="single" w:sz="4" w:space="0" w:color="000000" w:themeColor="text1"/></w:tblBorders><w:tblCellMar><w:top w:w="0" w:type="dxa"/><w:left w:w="108" w:type="dxa"/><w:bottom w:w="0" w:type="dxa"/><w:right w:w="108" w:type="dxa"/></w:tblCellMar></w:tblPr></w:style></w:styles>"""
+        data = read_part('styles.xml')
         super().__init__('word/styles.xml', data)
 
 
 class WebSettingsFile(FilledXMLFile):
     def __init__(self):
-        data = """<w:webSettings xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:optimizeForBrowser/></w:webSettings>"""
+        data = read_part('webSettings.xml')
         super().__init__('word/webSettings.xml', data)
@@ -1,8 +1,17 @@
-from xml.etree.ElementTree import tostring, SubElement
+from xml.etree.ElementTree import tostring, fromstring, SubElement
 from xml.etree.ElementTree import Element as BaseElement
-from zipfile import ZipFile, ZIP_DEFLATED
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
 from collections import namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
+from io import BytesIO
+import weakref
+import shutil
 import math
+import os
+from .fragment import Fragment, PAGE_BREAK_HOLDER
+from .fields import FieldResolver
+from .profiler import phase
 
 __all__ = ['DocX']
 
@@ -13,6 +22,32 @@ Id = namedtuple('Id', 'number text')
 TEXT_SIZE = {'normal': 12, 'large': 18, 'small': 8}
 PAGE_WIDTH = 8200
 MIN_TABLE_CELL_WIDTH = 1600
+COPY_CHUNK_SIZE = 1024 * 1024
+PART_DIRECTORY = os.path.join(os.path.dirname(__file__), 'parts')
+
+# styles added in compact mode, for the properties repeated on every
+# paragraph and table cell otherwise.
+COMPACT_STYLES = ('<w:style w:type="paragraph" w:customStyle="1" w:styleId="ac">'
+                  '<w:name w:val="report body"/><w:basedOn w:val="a"/><w:qFormat/>'
+                  '<w:pPr><w:spacing w:before="156" w:after="156"/><w:ind w:firstLine="420"/></w:pPr></w:style>'
+                  '<w:style w:type="paragraph" w:customStyle="1" w:styleId="ad">'
+                  '<w:name w:val="report math note"/><w:basedOn w:val="a"/>'
+                  '<w:pPr><w:tabs><w:tab w:val="right" w:pos="500"/><w:tab w:val="center" w:pos="600"/>'
+                  '<w:tab w:val="left" w:pos="700"/></w:tabs></w:pPr></w:style>'
+                  '<w:style w:type="paragraph" w:customStyle="1" w:styleId="ae">'
+                  '<w:name w:val="report table cell"/><w:basedOn w:val="a"/>'
+                  '<w:pPr><w:jc w:val="center"/></w:pPr></w:style>'
+                  '<w:style w:type="table" w:customStyle="1" w:styleId="af">'
+                  '<w:name w:val="report table"/><w:basedOn w:val="ab"/>'
+                  '<w:tcPr><w:vAlign w:val="center"/></w:tcPr></w:style>')
+
+NAMESPACE = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+             'm': 'http://schemas.openxmlformats.org/officeDocument/2006/math',
+             'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+             'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing',
+             'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+             'pic': 'http://schemas.openxmlformats.org/drawingml/2006/picture',
+             'xml': 'http://www.w3.org/XML/1998/namespace'}
 
 
 # visitor will return list of element.
@@ -28,6 +63,13 @@ class Element(BaseElement):
             raise RuntimeError()
 
 
+# xml already serialized, such as a rendered fragment.
+# it may only be added to the top level parts of a file.
+class Raw:
+    def __init__(self, xml: str):
+        self.xml = xml
+
+
 class Composite:
     def __init__(self, *items):
         self.elements = list()
@@ -35,7 +77,7 @@ class Composite:
             self.add(item)
 
     def add(self, item):
-        if isinstance(item, Element):
+        if isinstance(item, (Element, Raw)):
             self.elements.append(item)
         elif isinstance(item, Composite):
             self.elements.extend(item.elements)
@@ -73,8 +115,82 @@ def make_element(tag, *items) -> Element:
 E = make_element
 
 
+def serialize(items) -> str:
+    return ''.join(item.xml if isinstance(item, Raw) else tostring(item, encoding='unicode')
+                   for item in items)
+
+
+def serialize_root(tag, attrib, items) -> str:
+    attrib = ''.join(f' {key}="{value}"' for key, value in attrib.items())
+    return f'<{tag}{attrib}>{serialize(items)}</{tag}>'
+
+
+# parse serialized xml back to elements with the prefixed tags of make_element.
+def parse_xml(xml: str) -> Composite:
+    ns = ' '.join(f'xmlns:{prefix}="{uri}"' for prefix, uri in NAMESPACE.items() if prefix != 'xml')
+    prefix_dict = {f'{{{uri}}}': f'{prefix}:' for prefix, uri in NAMESPACE.items()}
+
+    def prefixed(name):
+        if name.startswith('{'):
+            uri, _, local = name.partition('}')
+            return prefix_dict[uri + '}'] + local
+        return name
+
+    def convert(base):
+        ele = Element(prefixed(base.tag), {prefixed(k): v for k, v in base.attrib.items()})
+        ele.text = base.text
+        ele.tail = base.tail
+        for child in base:
+            ele.append(convert(child))
+        return ele
+
+    root = fromstring(f'<root {ns}>{xml}</root>')
+    return Composite(*[convert(child) for child in root])
+
+
+# the static parts of the package, as styles.xml, are kept in the parts
+# directory and read on the first save, not when the module is imported.
+@lru_cache(maxsize=None)
+def read_part(name):
+    with open(os.path.join(PART_DIRECTORY, name), encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+# figure is the image data, a path of image file or a binary file object.
+# files are copied into the archive chunk by chunk, so the size of image
+# never matters to the memory.
+@contextmanager
+def open_figure(figure):
+    if isinstance(figure, bytes):
+        yield BytesIO(figure)
+    elif isinstance(figure, (str, os.PathLike)):
+        with open(figure, 'rb') as f:
+            yield f
+    else:
+        figure.seek(0)
+        yield figure
+
+
+# the entry of obj in a dict keyed by id goes when obj is freed, as the
+# elements of a stream after their visit, so a later object taking the id
+# never finds it and the objects are not kept alive for their ids.
+def forget_with(obj, dict_):
+    weakref.finalize(obj, dict_.pop, id(obj), None)
+
+
+def write_figure(zip_, fig: FigureFile):
+    info = ZipInfo(fig.path)
+    info.compress_type = ZIP_STORED
+    with open_figure(fig.figure) as src, zip_.open(info, 'w', force_zip64=True) as dst:
+        shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+
+
 class DocX:
-    def __init__(self):
+    # compact mode moves the repeated paragraph and cell properties into
+    # styles, and leaves the font of math runs to the math font of settings.
+    def __init__(self, compact=False):
+        self.compact = compact
+
         self.file_list = list()
         self.figure_list = list()
         self.catalog_list = list()
@@ -87,6 +203,9 @@ class DocX:
         self.header_rel_id = None
         self.footer_rel_id = None
 
+        # chapters of the later volumes of a report are numbered on
+        self.first_chapter = 1
+
         self.doc_rels_elements = Composite()
 
         self.cover_elements = Composite()
@@ -96,18 +215,35 @@ class DocX:
         self.footnotes_elements = Composite()
         self.header_elements = Composite()
 
+        self.field_resolver = FieldResolver()
+
+        # a fragment writer renders a slice of report with its own ids,
+        # see get_fragment and add_fragment.
+        self.fragment = False
+        self.fragment_catalog_list = list()
+
     def set_cover(self, cover):
         builder = Cover.get_cover_builder(cover.type_)
         cover.visit(builder)
         self.cover_elements = builder.elements
 
-    def save(self, path):
-        self._build_docx()
-        with ZipFile(path, 'w', ZIP_DEFLATED) as z:
-            for f in self.file_list:
-                z.writestr(f.path, data=f.xml)
-            for fig in self.figure_list:
-                z.writestr(fig.path, data=fig.figure)
+    # path could be a file name, or a writable file object which is not
+    # closed here. zipfile writes data descriptors instead of seeking back
+    # when the file object is not seekable, e.g. a pipe or a socket.
+    # the docx is returned as bytes when path is None.
+    def save(self, path=None):
+        with phase('serialize'):
+            self._build_docx()
+        file = BytesIO() if path is None else path
+        with ZipFile(file, 'w', ZIP_DEFLATED) as z:
+            with phase('write parts'):
+                for f in self.file_list:
+                    z.writestr(f.path, data=f.xml)
+            with phase('write figures'):
+                for fig in self.figure_list:
+                    write_figure(z, fig)
+        if path is None:
+            return file.getvalue()
 
     def _build_docx(self):
         # Dir: .
@@ -150,28 +286,28 @@ class DocX:
         self.file_list.append(DataFile(path=path, xml=xml))
 
     def _build_content_type(self):
-        xml = """<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types"><Override PartName="/word/footnotes.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.footnotes+xml"/><Override PartName="/customXml/itemProps1.xml" ContentType="application/vnd.openxmlformats-officedocument.customXmlProperties+xml"/><Default Extension="png" ContentType="image/png"/><Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/><Default Extension="xml" ContentType="application/xml"/><Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/><Override PartName="/word/numbering.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"/><Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/><Override PartName="/word/endnotes.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.endnotes+xml"/><Override PartName="/docProps/app.xml" ContentType="application/vnd.openxmlformats-officedocument.extended-properties+xml"/><Override PartName="/word/settings.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/><Override PartName="/word/header1.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.header+xml"/><Override PartName="/word/footer1.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.footer+xml"/><Override PartName="/word/theme/theme1.xml" ContentType="application/vnd.openxmlformats-officedocument.theme+xml"/><Override PartName="/word/fontTable.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.fontTable+xml"/><Override PartName="/word/webSettings.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.webSettings+xml"/><Override PartName="/docProps/core.xml" ContentType="application/vnd.openxmlformats-package.core-properties+xml"/></Types>"""
+        xml = read_part('content_types.xml')
         self._add_xml(path='[Content_Types].xml', xml=xml)
 
     def _build_rels(self):
-        xml = """<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"><Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/extended-properties" Target="docProps/app.xml"/><Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" Target="docProps/core.xml"/><Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/></Relationships>"""
+        xml = read_part('rels.xml')
         self._add_xml(path='_rels/.rels', xml=xml)
 
     def _build_custom_xml(self):
-        rels_xml = """<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships"><Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/customXmlProps" Target="itemProps1.xml"/></Relationships>"""
+        rels_xml = read_part('item1.xml.rels')
         self._add_xml(path='customXml/_rels/item1.xml.rels', xml=rels_xml)
 
-        item1_xml = """<b:Sources xmlns:b="http://schemas.openxmlformats.org/officeDocument/2006/bibliography" xmlns="http://schemas.openxmlformats.org/officeDocument/2006/bibliography" SelectedStyle="\APA.XSL" StyleName="APA"/>"""
+        item1_xml = read_part('item1.xml')
         self._add_xml(path='customXml/item1.xml', xml=item1_xml, with_head=False)
 
-        props1_xml = """<ds:datastoreItem xmlns:ds="http://schemas.openxmlformats.org/officeDocument/2006/customXml" ds:itemID="{16CE1163-3A16-4C5A-834F-C1E16F9680D6}"><ds:schemaRefs><ds:schemaRef ds:uri="http://schemas.openxmlformats.org/officeDocument/2006/bibliography"/></ds:schemaRefs></ds:datastoreItem>"""
+        props1_xml = read_part('itemProps1.xml')
         self._add_xml(path='customXml/itemProps1.xml', xml=props1_xml)
 
     def _build_docProps(self):
-        xml = """<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties" xmlns:vt="http://schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes"><Template>Normal.dotm</Template><TotalTime>0</TotalTime><Pages>1</Pages><Words>1</Words><Characters>12</Characters><Application>Microsoft Office Word</Application><DocSecurity>0</DocSecurity><Lines>1</Lines><Paragraphs>1</Paragraphs><ScaleCrop>false</ScaleCrop><Company></Company><LinksUpToDate>false</LinksUpToDate><CharactersWithSpaces>12</CharactersWithSpaces><SharedDoc>false</SharedDoc><HyperlinksChanged>false</HyperlinksChanged><AppVersion>12.0000</AppVersion></Properties>"""
+        xml = read_part('app.xml')
         self._add_xml(path='docProps/app.xml', xml=xml)
 
-        xml = """<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/" xmlns:dcmitype="http://purl.org/dc/dcmitype/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"><dc:creator>Tao</dc:creator><cp:lastModifiedBy>HHPDI</cp:lastModifiedBy><cp:revision>1</cp:revision><dcterms:created xsi:type="dcterms:W3CDTF">2019-01-01T00:00:00Z</dcterms:created><dcterms:modified xsi:type="dcterms:W3CDTF">2019-01-01T00:00:00Z</dcterms:modified></cp:coreProperties>"""
+        xml = read_part('core.xml')
         self._add_xml(path='docProps/core.xml', xml=xml)
 
     def _build_document_xml_rels(self):
@@ -220,7 +356,7 @@ class DocX:
         self._add_xml(path='word/_rels/document.xml.rels', xml=xml)
 
     def _build_theme1(self):
-        xml = """<a:theme xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" name="Office 主题"><a:themeElements><a:clrScheme name="Office"><a:dk1><a:sysClr val="windowText" lastClr="000000"/></a:dk1><a:lt1><a:sysClr val="window" lastClr="FFFFFF"/></a:lt1><a:dk2><a:srgbClr val="1F497D"/></a:dk2><a:lt2><a:srgbClr val="EEECE1"/></a:lt2><a:accent1><a:srgbClr val="4F81BD"/></a:accent1><a:accent2><a:srgbClr val="C0504D"/></a:accent2><a:accent3><a:srgbClr val="9BBB59"/></a:accent3><a:accent4><a:srgbClr val="8064A2"/></a:accent4><a:accent5><a:srgbClr val="4BACC6"/></a:accent5><a:accent6><a:srgbClr val="F79646"/></a:accent6><a:hlink><a:srgbClr val="0000FF"/></a:hlink><a:folHlink><a:srgbClr val="800080"/></a:folHlink></a:clrScheme><a:fontScheme name="Office"><a:majorFont><a:latin typeface="Cambria"/><a:ea typeface=""/><a:cs typeface=""/><a:font script="Jpan" typeface="ＭＳ ゴシック"/><a:font script="Hang" typeface="맑은 고딕"/><a:font script="Hans" typeface="宋体"/><a:font script="Hant" typeface="新細明體"/><a:font script="Arab" typeface="Times New Roman"/><a:font script="Hebr" typeface="Times New Roman"/><a:font script="Thai" typeface="Angsana New"/><a:font script="Ethi" typeface="Nyala"/><a:font script="Beng" typeface="Vrinda"/><a:font script="Gujr" typeface="Shruti"/><a:font script="Khmr" typeface="MoolBoran"/><a:font script="Knda" typeface="Tunga"/><a:font script="Guru" typeface="Raavi"/><a:font script="Cans" typeface="Euphemia"/><a:font script="Cher" typeface="Plantagenet Cherokee"/><a:font script="Yiii" typeface="Microsoft Yi Baiti"/><a:font script="Tibt" typeface="Microsoft Himalaya"/><a:font script="Thaa" typeface="MV Boli"/><a:font script="Deva" typeface="Mangal"/><a:font script="Telu" typeface="Gautami"/><a:font script="Taml" typeface="Latha"/><a:font script="Syrc" typeface="Estrangelo Edessa"/><a:font script="Orya" typeface="Kalinga"/><a:font script="Mlym" typeface="Kartika"/><a:font script="Laoo" typeface="DokChampa"/><a:font script="Sinh" typeface="Iskoola Pota"/><a:font script="Mong" typeface="Mongolian Baiti"/><a:font script="Viet" typeface="Times New Roman"/><a:font script="Uigh" typeface="Microsoft Uighur"/></a:majorFont><a:minorFont><a:latin typeface="Calibri"/><a:ea typeface=""/><a:cs typeface=""/><a:font script="Jpan" typeface="ＭＳ 明朝"/><a:font script="Hang" typeface="맑은 고딕"/><a:font script="Hans" typeface="宋体"/><a:font script="Hant" typeface="新細明體"/><a:font script="Arab" typeface="Arial"/><a:font script="Hebr" typeface="Arial"/><a:font script="Thai" typeface="Cordia New"/><a:font script="Ethi" typeface="Nyala"/><a:font script="Beng" typeface="Vrinda"/><a:font script="Gujr" typeface="Shruti"/><a:font script="Khmr" typeface="DaunPenh"/><a:font script="Knda" typeface="Tunga"/><a:font script="Guru" typeface="Raavi"/><a:font script="Cans" typeface="Euphemia"/><a:font script="Cher" typeface="Plantagenet Cherokee"/><a:font script="Yiii" typeface="Microsoft Yi Baiti"/><a:font script="Tibt" typeface="Microsoft Himalaya"/><a:font script="Thaa" typeface="MV Boli"/><a:font script="Deva" typeface="Mangal"/><a:font script="Telu" typeface="Gautami"/><a:font script="Taml" typeface="Latha"/><a:font script="Syrc" typeface="Estrangelo Edessa"/><a:font script="Orya" typeface="Kalinga"/><a:font script="Mlym" typeface="Kartika"/><a:font script="Laoo" typeface="DokChampa"/><a:font script="Sinh" typeface="Iskoola Pota"/><a:font script="Mong" typeface="Mongolian Baiti"/><a:font script="Viet" typeface="Arial"/><a:font script="Uigh" typeface="Microsoft Uighur"/></a:minorFont></a:fontScheme><a:fmtScheme name="Office"><a:fillStyleLst><a:solidFill><a:schemeClr val="phClr"/></a:solidFill><a:gradFill rotWithShape="1"><a:gsLst><a:gs pos="0"><a:schemeClr val="phClr"><a:tint val="50000"/><a:satMod val="300000"/></a:schemeClr></a:gs><a:gs pos="35000"><a:schemeClr val="phClr"><a:tint val="37000"/><a:satMod val="300000"/></a:schemeClr></a:gs><a:gs pos="100000"><a:schemeClr val="phClr"><a:tint val="15000"/><a:satMod val="350000"/></a:schemeClr></a:gs></a:gsLst><a:lin ang="16200000" scaled="1"/></a:gradFill><a:gradFill rotWithShape="1"><a:gsLst><a:gs pos="0"><a:schemeClr val="phClr"><a:shade val="51000"/><a:satMod val="130000"/></a:schemeClr></a:gs><a:gs pos="80000"><a:schemeClr val="phClr"><a:shade val="93000"/><a:satMod val="130000"/></a:schemeClr></a:gs><a:gs pos="100000"><a:schemeClr val="phClr"><a:shade val="94000"/><a:satMod val="135000"/></a:schemeClr></a:gs></a:gsLst><a:lin ang="16200000" scaled="0"/></a:gradFill></a:fillStyleLst><a:lnStyleLst><a:ln w="9525" cap="flat" cmpd="sng" algn="ctr"><a:solidFill><a:schemeClr val="phClr"><a:shade val="95000"/><a:satMod val="105000"/></a:schemeClr></a:solidFill><a:prstDash val="solid"/></a:ln><a:ln w="25400" cap="flat" cmpd="sng" algn="ctr"><a:solidFill><a:schemeClr val="phClr"/></a:solidFill><a:prstDash val="solid"/></a:ln><a:ln w="38100" cap="flat" cmpd="sng" algn="ctr"><a:solidFill><a:schemeClr val="phClr"/></a:solidFill><a:prstDash val="solid"/></a:ln></a:lnStyleLst><a:effectStyleLst><a:effectStyle><a:effectLst><a:outerShdw blurRad="40000" dist="20000" dir="5400000" rotWithShape="0"><a:srgbClr val="000000"><a:alpha val="38000"/></a:srgbClr></a:outerShdw></a:effectLst></a:effectStyle><a:effectStyle><a:effectLst><a:outerShdw blurRad="40000" dist="23000" dir="5400000" rotWithShape="0"><a:srgbClr val="000000"><a:alpha val="35000"/></a:srgbClr></a:outerShdw></a:effectLst></a:effectStyle><a:effectStyle><a:effectLst><a:outerShdw blurRad="40000" dist="23000" dir="5400000" rotWithShape="0"><a:srgbClr val="000000"><a:alpha val="35000"/></a:srgbClr></a:outerShdw></a:effectLst><a:scene3d><a:camera prst="orthographicFront"><a:rot lat="0" lon="0" rev="0"/></a:camera><a:lightRig rig="threePt" dir="t"><a:rot lat="0" lon="0" rev="1200000"/></a:lightRig></a:scene3d><a:sp3d><a:bevelT w="63500" h="25400"/></a:sp3d></a:effectStyle></a:effectStyleLst><a:bgFillStyleLst><a:solidFill><a:schemeClr val="phClr"/></a:solidFill><a:gradFill rotWithShape="1"><a:gsLst><a:gs pos="0"><a:schemeClr val="phClr"><a:tint val="40000"/><a:satMod val="350000"/></a:schemeClr></a:gs><a:gs pos="40000"><a:schemeClr val="phClr"><a:tint val="45000"/><a:shade val="99000"/><a:satMod val="350000"/></a:schemeClr></a:gs><a:gs pos="100000"><a:schemeClr val="phClr"><a:shade val="20000"/><a:satMod val="255000"/></a:schemeClr></a:gs></a:gsLst><a:path path="circle"><a:fillToRect l="50000" t="-80000" r="50000" b="180000"/></a:path></a:gradFill><a:gradFill rotWithShape="1"><a:gsLst><a:gs pos="0"><a:schemeClr val="phClr"><a:tint val="80000"/><a:satMod val="300000"/></a:schemeClr></a:gs><a:gs pos="100000"><a:schemeClr val="phClr"><a:shade val="30000"/><a:satMod val="200000"/></a:schemeClr></a:gs></a:gsLst><a:path path="circle"><a:fillToRect l="50000" t="50000" r="50000" b="50000"/></a:path></a:gradFill></a:bgFillStyleLst></a:fmtScheme></a:themeElements><a:objectDefaults/><a:extraClrSchemeLst/></a:theme>"""
+        xml = read_part('theme1.xml')
         self._add_xml(path='word/theme/theme1.xml', xml=xml)
 
     def _build_document(self):
@@ -234,9 +370,7 @@ class DocX:
               'xmlns:w10': 'urn:schemas-microsoft-com:office:word',
               'xmlns:w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
               'xmlns:wne': 'http://schemas.microsoft.com/office/word/2006/wordml'}
-        doc = E('w:document', ns)
-
-        body = E('w:body')
+        body = Composite()
 
         if len(self.cover_elements) > 0:
             body.add(self.cover_elements)
@@ -251,21 +385,20 @@ class DocX:
                                      self.footer_rel_id,
                                      page_start=1))
 
-        doc.add(body)
-
-        xml = tostring(doc, encoding='unicode')
+        body = self.field_resolver.resolve_document(serialize_root('w:body', {}, body))
+        xml = serialize_root('w:document', ns, [Raw(body)])
         self._add_xml(path='word/document.xml', xml=xml)
 
     def _build_endnotes(self):
-        xml = """<w:endnotes xmlns:ve="http://schemas.openxmlformats.org/markup-compatibility/2006" xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:m="http://schemas.openxmlformats.org/officeDocument/2006/math" xmlns:v="urn:schemas-microsoft-com:vml" xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" xmlns:w10="urn:schemas-microsoft-com:office:word" xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" xmlns:wne="http://schemas.microsoft.com/office/word/2006/wordml"><w:endnote w:type="separator" w:id="0"><w:p w:rsidR="00E93427" w:rsidRDefault="00E93427" w:rsidP="00C825F3"><w:r><w:separator/></w:r></w:p></w:endnote><w:endnote w:type="continuationSeparator" w:id="1"><w:p w:rsidR="00E93427" w:rsidRDefault="00E93427" w:rsidP="00C825F3"><w:r><w:continuationSeparator/></w:r></w:p></w:endnote></w:endnotes>"""
+        xml = read_part('endnotes.xml')
         self._add_xml(path='word/endnotes.xml', xml=xml)
 
     def _build_fontTable(self):
-        xml = """<w:fonts xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:font w:name="Calibri"><w:panose1 w:val="020F0502020204030204"/><w:charset w:val="00"/><w:family w:val="swiss"/><w:pitch w:val="variable"/><w:sig w:usb0="E10002FF" w:usb1="4000ACFF" w:usb2="00000009" w:usb3="00000000" w:csb0="0000019F" w:csb1="00000000"/></w:font><w:font w:name="宋体"><w:altName w:val="SimSun"/><w:panose1 w:val="02010600030101010101"/><w:charset w:val="86"/><w:family w:val="auto"/><w:pitch w:val="variable"/><w:sig w:usb0="00000003" w:usb1="288F0000" w:usb2="00000016" w:usb3="00000000" w:csb0="00040001" w:csb1="00000000"/></w:font><w:font w:name="Times New Roman"><w:panose1 w:val="02020603050405020304"/><w:charset w:val="00"/><w:family w:val="roman"/><w:pitch w:val="variable"/><w:sig w:usb0="E0002AFF" w:usb1="C0007841" w:usb2="00000009" w:usb3="00000000" w:csb0="000001FF" w:csb1="00000000"/></w:font><w:font w:name="Cambria"><w:panose1 w:val="02040503050406030204"/><w:charset w:val="00"/><w:family w:val="roman"/><w:pitch w:val="variable"/><w:sig w:usb0="E00002FF" w:usb1="400004FF" w:usb2="00000000" w:usb3="00000000" w:csb0="0000019F" w:csb1="00000000"/></w:font><w:font w:name="楷体"><w:panose1 w:val="02010609060101010101"/><w:charset w:val="86"/><w:family w:val="modern"/><w:pitch w:val="fixed"/><w:sig w:usb0="800002BF" w:usb1="38CF7CFA" w:usb2="00000016" w:usb3="00000000" w:csb0="00040001" w:csb1="00000000"/></w:font><w:font w:name="Cambria Math"><w:panose1 w:val="02040503050406030204"/><w:charset w:val="00"/><w:family w:val="roman"/><w:pitch w:val="variable"/><w:sig w:usb0="E00002FF" w:usb1="420024FF" w:usb2="00000000" w:usb3="00000000" w:csb0="0000019F" w:csb1="00000000"/></w:font></w:fonts>"""
+        xml = read_part('fontTable.xml')
         self._add_xml(path='word/fontTable.xml', xml=xml)
 
     def _build_footer(self):
-        xml = """<w:ftr xmlns:ve="http://schemas.openxmlformats.org/markup-compatibility/2006" xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:m="http://schemas.openxmlformats.org/officeDocument/2006/math" xmlns:v="urn:schemas-microsoft-com:vml" xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" xmlns:w10="urn:schemas-microsoft-com:office:word" xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" xmlns:wne="http://schemas.microsoft.com/office/word/2006/wordml"><w:sdt><w:sdtPr><w:id w:val="23625823"/><w:docPartObj><w:docPartGallery w:val="Page Numbers (Bottom of Page)"/><w:docPartUnique/></w:docPartObj></w:sdtPr><w:sdtContent><w:p w:rsidR="003221F4" w:rsidRDefault="00A805B6"><w:pPr><w:pStyle w:val="a5"/><w:jc w:val="center"/></w:pPr><w:fldSimple w:instr=" PAGE   \* MERGEFORMAT "><w:r w:rsidR="006E593F" w:rsidRPr="006E593F"><w:rPr><w:noProof/><w:lang w:val="zh-CN"/></w:rPr><w:t>2</w:t></w:r></w:fldSimple></w:p></w:sdtContent></w:sdt><w:p w:rsidR="003221F4" w:rsidRDefault="003221F4"><w:pPr><w:pStyle w:val="a5"/></w:pPr></w:p></w:ftr>"""
+        xml = read_part('footer1.xml')
         self._add_xml(path='word/footer1.xml', xml=xml)
 
     def _build_footnotes(self):
@@ -278,7 +411,7 @@ class DocX:
               'xmlns:w10': 'urn:schemas-microsoft-com:office:word',
               'xmlns:w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
               'xmlns:wne': 'http://schemas.microsoft.com/office/word/2006/wordml'}
-        footnotes = E('w:footnotes', ns)
+        footnotes = Composite()
 
         footnotes.add(E('w:footnote', {'w:type': 'separator', 'w:id': '0'},
                         E('w:p', E('w:r', E('w:separator')))))
@@ -287,7 +420,7 @@ class DocX:
 
         footnotes.add(self.footnotes_elements)
 
-        xml = tostring(footnotes, encoding='unicode')
+        xml = self.field_resolver.resolve_references(serialize_root('w:footnotes', ns, footnotes))
         self._add_xml(path='word/footnotes.xml', xml=xml)
 
     def _build_header(self):
@@ -307,19 +440,25 @@ class DocX:
             self._add_xml(path='word/header1.xml', xml=xml)
 
     def _build_numbering(self):
-        xml = """<w:numbering xmlns:ve="http://schemas.openxmlformats.org/markup-compatibility/2006" xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:m="http://schemas.openxmlformats.org/officeDocument/2006/math" xmlns:v="urn:schemas-microsoft-com:vml" xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" xmlns:w10="urn:schemas-microsoft-com:office:word" xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" xmlns:wne="http://schemas.microsoft.com/office/word/2006/wordml"><w:abstractNum w:abstractNumId="0"><w:nsid w:val="5D861EAE"/><w:multiLevelType w:val="multilevel"/><w:tmpl w:val="04090025"/><w:lvl w:ilvl="0"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="1"/><w:lvlText w:val="%1"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="432" w:hanging="432"/></w:pPr></w:lvl><w:lvl w:ilvl="1"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="2"/><w:lvlText w:val="%1.%2"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="576" w:hanging="576"/></w:pPr></w:lvl><w:lvl w:ilvl="2"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="3"/><w:lvlText w:val="%1.%2.%3"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="720" w:hanging="720"/></w:pPr></w:lvl><w:lvl w:ilvl="3"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="4"/><w:lvlText w:val="%1.%2.%3.%4"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="864" w:hanging="864"/></w:pPr></w:lvl><w:lvl w:ilvl="4"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="5"/><w:lvlText w:val="%1.%2.%3.%4.%5"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="1008" w:hanging="1008"/></w:pPr></w:lvl><w:lvl w:ilvl="5"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="6"/><w:lvlText w:val="%1.%2.%3.%4.%5.%6"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="1152" w:hanging="1152"/></w:pPr></w:lvl><w:lvl w:ilvl="6"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="7"/><w:lvlText w:val="%1.%2.%3.%4.%5.%6.%7"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="1296" w:hanging="1296"/></w:pPr></w:lvl><w:lvl w:ilvl="7"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="8"/><w:lvlText w:val="%1.%2.%3.%4.%5.%6.%7.%8"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="1440" w:hanging="1440"/></w:pPr></w:lvl><w:lvl w:ilvl="8"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:pStyle w:val="9"/><w:lvlText w:val="%1.%2.%3.%4.%5.%6.%7.%8.%9"/><w:lvlJc w:val="left"/><w:pPr><w:ind w:left="1584" w:hanging="1584"/></w:pPr></w:lvl></w:abstractNum><w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num></w:numbering>"""
+        xml = read_part('numbering.xml')
+        if self.first_chapter != 1:
+            xml = xml.replace('<w:abstractNumId w:val="0"/></w:num>',
+                              '<w:abstractNumId w:val="0"/><w:lvlOverride w:ilvl="0">'
+                              f'<w:startOverride w:val="{self.first_chapter}"/></w:lvlOverride></w:num>')
         self._add_xml(path='word/numbering.xml', xml=xml)
 
     def _build_settings(self):
-        xml = """<w:settings xmlns:o="urn:schemas-microsoft-com:office:office" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:m="http://schemas.openxmlformats.org/officeDocument/2006/math" xmlns:v="urn:schemas-microsoft-com:vml" xmlns:w10="urn:schemas-microsoft-com:office:word" xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" xmlns:sl="http://schemas.openxmlformats.org/schemaLibrary/2006/main"><w:zoom w:percent="160"/><w:bordersDoNotSurroundHeader/><w:bordersDoNotSurroundFooter/><w:defaultTabStop w:val="420"/><w:drawingGridVerticalSpacing w:val="156"/><w:displayHorizontalDrawingGridEvery w:val="0"/><w:displayVerticalDrawingGridEvery w:val="2"/><w:characterSpacingControl w:val="compressPunctuation"/><w:hdrShapeDefaults><o:shapedefaults v:ext="edit" spidmax="10242"/></w:hdrShapeDefaults><w:footnotePr><w:footnote w:id="0"/><w:footnote w:id="1"/></w:footnotePr><w:endnotePr><w:endnote w:id="0"/><w:endnote w:id="1"/></w:endnotePr><w:compat><w:spaceForUL/><w:balanceSingleByteDoubleByteWidth/><w:doNotLeaveBackslashAlone/><w:ulTrailSpace/><w:doNotExpandShiftReturn/><w:adjustLineHeightInTable/><w:useFELayout/></w:compat><w:rsids><w:rsidRoot w:val="003221F4"/><w:rsid w:val="0023729F"/><w:rsid w:val="003221F4"/><w:rsid w:val="00581F8C"/><w:rsid w:val="005B06A3"/><w:rsid w:val="00626EC2"/><w:rsid w:val="006A65DB"/><w:rsid w:val="006E593F"/><w:rsid w:val="00926F4A"/><w:rsid w:val="00971FF4"/><w:rsid w:val="00A805B6"/><w:rsid w:val="00C501FC"/><w:rsid w:val="00D637A7"/></w:rsids><m:mathPr><m:mathFont m:val="Cambria Math"/><m:brkBin m:val="before"/><m:brkBinSub m:val="--"/><m:smallFrac m:val="off"/><m:dispDef/><m:lMargin m:val="0"/><m:rMargin m:val="0"/><m:defJc m:val="centerGroup"/><m:wrapIndent m:val="600"/><m:intLim m:val="subSup"/><m:naryLim m:val="undOvr"/></m:mathPr><w:themeFontLang w:val="en-US" w:eastAsia="zh-CN"/><w:clrSchemeMapping w:bg1="light1" w:t1="dark1" w:bg2="light2" w:t2="dark2" w:accent1="accent1" w:accent2="accent2" w:accent3="accent3" w:accent4="accent4" w:accent5="accent5" w:accent6="accent6" w:hyperlink="hyperlink" w:followedHyperlink="followedHyperlink"/><w:shapeDefaults><o:shapedefaults v:ext="edit" spidmax="10242"/><o:shapelayout v:ext="edit"><o:idmap v:ext="edit" data="1"/></o:shapelayout></w:shapeDefaults><w:decimalSymbol w:val="."/><w:listSeparator w:val=","/></w:settings>"""
+        xml = read_part('settings.xml')
         self._add_xml(path='word/settings.xml', xml=xml)
 
     def _build_styles(self):
-        xml = """<w:styles xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:docDefaults><w:rPrDefault><w:rPr><w:rFonts w:asciiTheme="minorHAnsi" w:eastAsiaTheme="minorEastAsia" w:hAnsiTheme="minorHAnsi" w:cstheme="minorBidi"/><w:kern w:val="2"/><w:sz w:val="21"/><w:szCs w:val="22"/><w:lang w:val="en-US" w:eastAsia="zh-CN" w:bidi="ar-SA"/></w:rPr></w:rPrDefault><w:pPrDefault/></w:docDefaults><w:latentStyles w:defLockedState="0" w:defUIPriority="99" w:defSemiHidden="1" w:defUnhideWhenUsed="1" w:defQFormat="0" w:count="267"><w:lsdException w:name="Normal" w:semiHidden="0" w:uiPriority="0" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="heading 1" w:semiHidden="0" w:uiPriority="9" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="heading 2" w:uiPriority="9" w:qFormat="1"/><w:lsdException w:name="heading 3" w:uiPriority="9" w:qFormat="1"/><w:lsdException w:name="heading 4" w:uiPriority="9" w:qFormat="1"/><w:lsdException w:name="heading 5" w:uiPriority="9" w:qFormat="1"/><w:lsdException w:name="heading 6" w:uiPriority="9" w:qFormat="1"/><w:lsdException w:name="heading 7" w:uiPriority="9" w:qFormat="1"/><w:lsdException w:name="heading 8" w:uiPriority="9" w:qFormat="1"/><w:lsdException w:name="heading 9" w:uiPriority="9" w:qFormat="1"/><w:lsdException w:name="toc 1" w:uiPriority="39"/><w:lsdException w:name="toc 2" w:uiPriority="39"/><w:lsdException w:name="toc 3" w:uiPriority="39"/><w:lsdException w:name="toc 4" w:uiPriority="39"/><w:lsdException w:name="toc 5" w:uiPriority="39"/><w:lsdException w:name="toc 6" w:uiPriority="39"/><w:lsdException w:name="toc 7" w:uiPriority="39"/><w:lsdException w:name="toc 8" w:uiPriority="39"/><w:lsdException w:name="toc 9" w:uiPriority="39"/><w:lsdException w:name="caption" w:uiPriority="35" w:qFormat="1"/><w:lsdException w:name="Title" w:semiHidden="0" w:uiPriority="10" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Default Paragraph Font" w:uiPriority="1"/><w:lsdException w:name="Subtitle" w:semiHidden="0" w:uiPriority="11" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Strong" w:semiHidden="0" w:uiPriority="22" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Emphasis" w:semiHidden="0" w:uiPriority="20" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Table Grid" w:semiHidden="0" w:uiPriority="59" w:unhideWhenUsed="0"/><w:lsdException w:name="Placeholder Text" w:unhideWhenUsed="0"/><w:lsdException w:name="No Spacing" w:semiHidden="0" w:uiPriority="1" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Light Shading" w:semiHidden="0" w:uiPriority="60" w:unhideWhenUsed="0"/><w:lsdException w:name="Light List" w:semiHidden="0" w:uiPriority="61" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Grid" w:semiHidden="0" w:uiPriority="62" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 1" w:semiHidden="0" w:uiPriority="63" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 2" w:semiHidden="0" w:uiPriority="64" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 1" w:semiHidden="0" w:uiPriority="65" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 2" w:semiHidden="0" w:uiPriority="66" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 1" w:semiHidden="0" w:uiPriority="67" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 2" w:semiHidden="0" w:uiPriority="68" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 3" w:semiHidden="0" w:uiPriority="69" w:unhideWhenUsed="0"/><w:lsdException w:name="Dark List" w:semiHidden="0" w:uiPriority="70" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Shading" w:semiHidden="0" w:uiPriority="71" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful List" w:semiHidden="0" w:uiPriority="72" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Grid" w:semiHidden="0" w:uiPriority="73" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Shading Accent 1" w:semiHidden="0" w:uiPriority="60" w:unhideWhenUsed="0"/><w:lsdException w:name="Light List Accent 1" w:semiHidden="0" w:uiPriority="61" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Grid Accent 1" w:semiHidden="0" w:uiPriority="62" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 1 Accent 1" w:semiHidden="0" w:uiPriority="63" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 2 Accent 1" w:semiHidden="0" w:uiPriority="64" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 1 Accent 1" w:semiHidden="0" w:uiPriority="65" w:unhideWhenUsed="0"/><w:lsdException w:name="Revision" w:unhideWhenUsed="0"/><w:lsdException w:name="List Paragraph" w:semiHidden="0" w:uiPriority="34" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Quote" w:semiHidden="0" w:uiPriority="29" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Intense Quote" w:semiHidden="0" w:uiPriority="30" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Medium List 2 Accent 1" w:semiHidden="0" w:uiPriority="66" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 1 Accent 1" w:semiHidden="0" w:uiPriority="67" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 2 Accent 1" w:semiHidden="0" w:uiPriority="68" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 3 Accent 1" w:semiHidden="0" w:uiPriority="69" w:unhideWhenUsed="0"/><w:lsdException w:name="Dark List Accent 1" w:semiHidden="0" w:uiPriority="70" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Shading Accent 1" w:semiHidden="0" w:uiPriority="71" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful List Accent 1" w:semiHidden="0" w:uiPriority="72" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Grid Accent 1" w:semiHidden="0" w:uiPriority="73" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Shading Accent 2" w:semiHidden="0" w:uiPriority="60" w:unhideWhenUsed="0"/><w:lsdException w:name="Light List Accent 2" w:semiHidden="0" w:uiPriority="61" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Grid Accent 2" w:semiHidden="0" w:uiPriority="62" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 1 Accent 2" w:semiHidden="0" w:uiPriority="63" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 2 Accent 2" w:semiHidden="0" w:uiPriority="64" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 1 Accent 2" w:semiHidden="0" w:uiPriority="65" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 2 Accent 2" w:semiHidden="0" w:uiPriority="66" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 1 Accent 2" w:semiHidden="0" w:uiPriority="67" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 2 Accent 2" w:semiHidden="0" w:uiPriority="68" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 3 Accent 2" w:semiHidden="0" w:uiPriority="69" w:unhideWhenUsed="0"/><w:lsdException w:name="Dark List Accent 2" w:semiHidden="0" w:uiPriority="70" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Shading Accent 2" w:semiHidden="0" w:uiPriority="71" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful List Accent 2" w:semiHidden="0" w:uiPriority="72" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Grid Accent 2" w:semiHidden="0" w:uiPriority="73" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Shading Accent 3" w:semiHidden="0" w:uiPriority="60" w:unhideWhenUsed="0"/><w:lsdException w:name="Light List Accent 3" w:semiHidden="0" w:uiPriority="61" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Grid Accent 3" w:semiHidden="0" w:uiPriority="62" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 1 Accent 3" w:semiHidden="0" w:uiPriority="63" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 2 Accent 3" w:semiHidden="0" w:uiPriority="64" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 1 Accent 3" w:semiHidden="0" w:uiPriority="65" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 2 Accent 3" w:semiHidden="0" w:uiPriority="66" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 1 Accent 3" w:semiHidden="0" w:uiPriority="67" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 2 Accent 3" w:semiHidden="0" w:uiPriority="68" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 3 Accent 3" w:semiHidden="0" w:uiPriority="69" w:unhideWhenUsed="0"/><w:lsdException w:name="Dark List Accent 3" w:semiHidden="0" w:uiPriority="70" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Shading Accent 3" w:semiHidden="0" w:uiPriority="71" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful List Accent 3" w:semiHidden="0" w:uiPriority="72" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Grid Accent 3" w:semiHidden="0" w:uiPriority="73" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Shading Accent 4" w:semiHidden="0" w:uiPriority="60" w:unhideWhenUsed="0"/><w:lsdException w:name="Light List Accent 4" w:semiHidden="0" w:uiPriority="61" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Grid Accent 4" w:semiHidden="0" w:uiPriority="62" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 1 Accent 4" w:semiHidden="0" w:uiPriority="63" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 2 Accent 4" w:semiHidden="0" w:uiPriority="64" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 1 Accent 4" w:semiHidden="0" w:uiPriority="65" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 2 Accent 4" w:semiHidden="0" w:uiPriority="66" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 1 Accent 4" w:semiHidden="0" w:uiPriority="67" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 2 Accent 4" w:semiHidden="0" w:uiPriority="68" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 3 Accent 4" w:semiHidden="0" w:uiPriority="69" w:unhideWhenUsed="0"/><w:lsdException w:name="Dark List Accent 4" w:semiHidden="0" w:uiPriority="70" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Shading Accent 4" w:semiHidden="0" w:uiPriority="71" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful List Accent 4" w:semiHidden="0" w:uiPriority="72" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Grid Accent 4" w:semiHidden="0" w:uiPriority="73" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Shading Accent 5" w:semiHidden="0" w:uiPriority="60" w:unhideWhenUsed="0"/><w:lsdException w:name="Light List Accent 5" w:semiHidden="0" w:uiPriority="61" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Grid Accent 5" w:semiHidden="0" w:uiPriority="62" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 1 Accent 5" w:semiHidden="0" w:uiPriority="63" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 2 Accent 5" w:semiHidden="0" w:uiPriority="64" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 1 Accent 5" w:semiHidden="0" w:uiPriority="65" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 2 Accent 5" w:semiHidden="0" w:uiPriority="66" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 1 Accent 5" w:semiHidden="0" w:uiPriority="67" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 2 Accent 5" w:semiHidden="0" w:uiPriority="68" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 3 Accent 5" w:semiHidden="0" w:uiPriority="69" w:unhideWhenUsed="0"/><w:lsdException w:name="Dark List Accent 5" w:semiHidden="0" w:uiPriority="70" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Shading Accent 5" w:semiHidden="0" w:uiPriority="71" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful List Accent 5" w:semiHidden="0" w:uiPriority="72" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Grid Accent 5" w:semiHidden="0" w:uiPriority="73" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Shading Accent 6" w:semiHidden="0" w:uiPriority="60" w:unhideWhenUsed="0"/><w:lsdException w:name="Light List Accent 6" w:semiHidden="0" w:uiPriority="61" w:unhideWhenUsed="0"/><w:lsdException w:name="Light Grid Accent 6" w:semiHidden="0" w:uiPriority="62" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 1 Accent 6" w:semiHidden="0" w:uiPriority="63" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Shading 2 Accent 6" w:semiHidden="0" w:uiPriority="64" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 1 Accent 6" w:semiHidden="0" w:uiPriority="65" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium List 2 Accent 6" w:semiHidden="0" w:uiPriority="66" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 1 Accent 6" w:semiHidden="0" w:uiPriority="67" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 2 Accent 6" w:semiHidden="0" w:uiPriority="68" w:unhideWhenUsed="0"/><w:lsdException w:name="Medium Grid 3 Accent 6" w:semiHidden="0" w:uiPriority="69" w:unhideWhenUsed="0"/><w:lsdException w:name="Dark List Accent 6" w:semiHidden="0" w:uiPriority="70" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Shading Accent 6" w:semiHidden="0" w:uiPriority="71" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful List Accent 6" w:semiHidden="0" w:uiPriority="72" w:unhideWhenUsed="0"/><w:lsdException w:name="Colorful Grid Accent 6" w:semiHidden="0" w:uiPriority="73" w:unhideWhenUsed="0"/><w:lsdException w:name="Subtle Emphasis" w:semiHidden="0" w:uiPriority="19" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Intense Emphasis" w:semiHidden="0" w:uiPriority="21" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Subtle Reference" w:semiHidden="0" w:uiPriority="31" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Intense Reference" w:semiHidden="0" w:uiPriority="32" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Book Title" w:semiHidden="0" w:uiPriority="33" w:unhideWhenUsed="0" w:qFormat="1"/><w:lsdException w:name="Bibliography" w:uiPriority="37"/><w:lsdException w:name="TOC Heading" w:uiPriority="39" w:qFormat="1"/></w:latentStyles><w:style w:type="paragraph" w:default="1" w:styleId="a"><w:name w:val="Normal"/><w:qFormat/><w:rsid w:val="00971FF4"/><w:pPr><w:widowControl w:val="0"/><w:jc w:val="both"/></w:pPr></w:style><w:style w:type="paragraph" w:styleId="1"><w:name w:val="heading 1"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="1Char"/><w:uiPriority w:val="9"/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:numId w:val="1"/></w:numPr><w:spacing w:before="340" w:after="330" w:line="578" w:lineRule="auto"/><w:outlineLvl w:val="0"/></w:pPr><w:rPr><w:b/><w:bCs/><w:kern w:val="44"/><w:sz w:val="44"/><w:szCs w:val="44"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="2"><w:name w:val="heading 2"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="2Char"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:ilvl w:val="1"/><w:numId w:val="1"/></w:numPr><w:spacing w:before="260" w:after="260" w:line="416" w:lineRule="auto"/><w:outlineLvl w:val="1"/></w:pPr><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:b/><w:bCs/><w:sz w:val="32"/><w:szCs w:val="32"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="3"><w:name w:val="heading 3"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="3Char"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:ilvl w:val="2"/><w:numId w:val="1"/></w:numPr><w:spacing w:before="260" w:after="260" w:line="416" w:lineRule="auto"/><w:outlineLvl w:val="2"/></w:pPr><w:rPr><w:b/><w:bCs/><w:sz w:val="32"/><w:szCs w:val="32"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="4"><w:name w:val="heading 4"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="4Char"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:ilvl w:val="3"/><w:numId w:val="1"/></w:numPr><w:spacing w:before="280" w:after="290" w:line="376" w:lineRule="auto"/><w:outlineLvl w:val="3"/></w:pPr><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:b/><w:bCs/><w:sz w:val="28"/><w:szCs w:val="28"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="5"><w:name w:val="heading 5"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="5Char"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:ilvl w:val="4"/><w:numId w:val="1"/></w:numPr><w:spacing w:before="280" w:after="290" w:line="376" w:lineRule="auto"/><w:outlineLvl w:val="4"/></w:pPr><w:rPr><w:b/><w:bCs/><w:sz w:val="28"/><w:szCs w:val="28"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="6"><w:name w:val="heading 6"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="6Char"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:ilvl w:val="5"/><w:numId w:val="1"/></w:numPr><w:spacing w:before="240" w:after="64" w:line="320" w:lineRule="auto"/><w:outlineLvl w:val="5"/></w:pPr><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:b/><w:bCs/><w:sz w:val="24"/><w:szCs w:val="24"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="7"><w:name w:val="heading 7"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="7Char"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:ilvl w:val="6"/><w:numId w:val="1"/></w:numPr><w:spacing w:before="240" w:after="64" w:line="320" w:lineRule="auto"/><w:outlineLvl w:val="6"/></w:pPr><w:rPr><w:b/><w:bCs/><w:sz w:val="24"/><w:szCs w:val="24"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="8"><w:name w:val="heading 8"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="8Char"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:ilvl w:val="7"/><w:numId w:val="1"/></w:numPr><w:spacing w:before="240" w:after="64" w:line="320" w:lineRule="auto"/><w:outlineLvl w:val="7"/></w:pPr><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:sz w:val="24"/><w:szCs w:val="24"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="9"><w:name w:val="heading 9"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="9Char"/><w:uiPriority w:val="9"/><w:unhideWhenUsed/><w:qFormat/><w:rsid w:val="003221F4"/><w:pPr><w:keepNext/><w:keepLines/><w:numPr><w:ilvl w:val="8"/><w:numId w:val="1"/></w:numPr><w:spacing w:before="240" w:after="64" w:line="320" w:lineRule="auto"/><w:outlineLvl w:val="8"/></w:pPr><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:szCs w:val="21"/></w:rPr></w:style><w:style w:type="character" w:default="1" w:styleId="a0"><w:name w:val="Default Paragraph Font"/><w:uiPriority w:val="1"/><w:semiHidden/><w:unhideWhenUsed/></w:style><w:style w:type="table" w:default="1" w:styleId="a1"><w:name w:val="Normal Table"/><w:uiPriority w:val="99"/><w:semiHidden/><w:unhideWhenUsed/><w:qFormat/><w:tblPr><w:tblInd w:w="0" w:type="dxa"/><w:tblCellMar><w:top w:w="0" w:type="dxa"/><w:left w:w="108" w:type="dxa"/><w:bottom w:w="0" w:type="dxa"/><w:right w:w="108" w:type="dxa"/></w:tblCellMar></w:tblPr></w:style><w:style w:type="numbering" w:default="1" w:styleId="a2"><w:name w:val="No List"/><w:uiPriority w:val="99"/><w:semiHidden/><w:unhideWhenUsed/></w:style><w:style w:type="character" w:customStyle="1" w:styleId="1Char"><w:name w:val="标题 1 Char"/><w:basedOn w:val="a0"/><w:link w:val="1"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:b/><w:bCs/><w:kern w:val="44"/><w:sz w:val="44"/><w:szCs w:val="44"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="2Char"><w:name w:val="标题 2 Char"/><w:basedOn w:val="a0"/><w:link w:val="2"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:b/><w:bCs/><w:sz w:val="32"/><w:szCs w:val="32"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="3Char"><w:name w:val="标题 3 Char"/><w:basedOn w:val="a0"/><w:link w:val="3"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:b/><w:bCs/><w:sz w:val="32"/><w:szCs w:val="32"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="4Char"><w:name w:val="标题 4 Char"/><w:basedOn w:val="a0"/><w:link w:val="4"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:b/><w:bCs/><w:sz w:val="28"/><w:szCs w:val="28"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="5Char"><w:name w:val="标题 5 Char"/><w:basedOn w:val="a0"/><w:link w:val="5"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:b/><w:bCs/><w:sz w:val="28"/><w:szCs w:val="28"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="6Char"><w:name w:val="标题 6 Char"/><w:basedOn w:val="a0"/><w:link w:val="6"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:b/><w:bCs/><w:sz w:val="24"/><w:szCs w:val="24"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="7Char"><w:name w:val="标题 7 Char"/><w:basedOn w:val="a0"/><w:link w:val="7"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:b/><w:bCs/><w:sz w:val="24"/><w:szCs w:val="24"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="8Char"><w:name w:val="标题 8 Char"/><w:basedOn w:val="a0"/><w:link w:val="8"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:sz w:val="24"/><w:szCs w:val="24"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="9Char"><w:name w:val="标题 9 Char"/><w:basedOn w:val="a0"/><w:link w:val="9"/><w:uiPriority w:val="9"/><w:rsid w:val="003221F4"/><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsiaTheme="majorEastAsia" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:szCs w:val="21"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="10"><w:name w:val="toc 1"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:autoRedefine/><w:uiPriority w:val="39"/><w:unhideWhenUsed/><w:rsid w:val="003221F4"/></w:style><w:style w:type="paragraph" w:styleId="20"><w:name w:val="toc 2"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:autoRedefine/><w:uiPriority w:val="39"/><w:unhideWhenUsed/><w:rsid w:val="003221F4"/><w:pPr><w:ind w:leftChars="200" w:left="420"/></w:pPr></w:style><w:style w:type="paragraph" w:styleId="30"><w:name w:val="toc 3"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:autoRedefine/><w:uiPriority w:val="39"/><w:unhideWhenUsed/><w:rsid w:val="003221F4"/><w:pPr><w:ind w:leftChars="400" w:left="840"/></w:pPr></w:style><w:style w:type="character" w:styleId="a3"><w:name w:val="Hyperlink"/><w:basedOn w:val="a0"/><w:uiPriority w:val="99"/><w:unhideWhenUsed/><w:rsid w:val="003221F4"/><w:rPr><w:color w:val="0000FF" w:themeColor="hyperlink"/><w:u w:val="single"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="a4"><w:name w:val="header"/><w:basedOn w:val="a"/><w:link w:val="Char"/><w:uiPriority w:val="99"/><w:semiHidden/><w:unhideWhenUsed/><w:rsid w:val="003221F4"/><w:pPr><w:pBdr><w:bottom w:val="single" w:sz="6" w:space="1" w:color="auto"/></w:pBdr><w:tabs><w:tab w:val="center" w:pos="4153"/><w:tab w:val="right" w:pos="8306"/></w:tabs><w:snapToGrid w:val="0"/><w:jc w:val="center"/></w:pPr><w:rPr><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="Char"><w:name w:val="页眉 Char"/><w:basedOn w:val="a0"/><w:link w:val="a4"/><w:uiPriority w:val="99"/><w:semiHidden/><w:rsid w:val="003221F4"/><w:rPr><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="a5"><w:name w:val="footer"/><w:basedOn w:val="a"/><w:link w:val="Char0"/><w:uiPriority w:val="99"/><w:unhideWhenUsed/><w:rsid w:val="003221F4"/><w:pPr><w:tabs><w:tab w:val="center" w:pos="4153"/><w:tab w:val="right" w:pos="8306"/></w:tabs><w:snapToGrid w:val="0"/><w:jc w:val="left"/></w:pPr><w:rPr><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="Char0"><w:name w:val="页脚 Char"/><w:basedOn w:val="a0"/><w:link w:val="a5"/><w:uiPriority w:val="99"/><w:rsid w:val="003221F4"/><w:rPr><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="a6"><w:name w:val="Title"/><w:basedOn w:val="a"/><w:next w:val="a"/><w:link w:val="Char1"/><w:uiPriority w:val="10"/><w:qFormat/><w:rsid w:val="00C501FC"/><w:pPr><w:spacing w:before="240" w:after="60"/><w:jc w:val="center"/><w:outlineLvl w:val="0"/></w:pPr><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsia="宋体" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:b/><w:bCs/><w:sz w:val="32"/><w:szCs w:val="32"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="Char1"><w:name w:val="标题 Char"/><w:basedOn w:val="a0"/><w:link w:val="a6"/><w:uiPriority w:val="10"/><w:rsid w:val="00C501FC"/><w:rPr><w:rFonts w:asciiTheme="majorHAnsi" w:eastAsia="宋体" w:hAnsiTheme="majorHAnsi" w:cstheme="majorBidi"/><w:b/><w:bCs/><w:sz w:val="32"/><w:szCs w:val="32"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="a7"><w:name w:val="Document Map"/><w:basedOn w:val="a"/><w:link w:val="Char2"/><w:uiPriority w:val="99"/><w:semiHidden/><w:unhideWhenUsed/><w:rsid w:val="00581F8C"/><w:rPr><w:rFonts w:ascii="宋体" w:eastAsia="宋体"/><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="Char2"><w:name w:val="文档结构图 Char"/><w:basedOn w:val="a0"/><w:link w:val="a7"/><w:uiPriority w:val="99"/><w:semiHidden/><w:rsid w:val="00581F8C"/><w:rPr><w:rFonts w:ascii="宋体" w:eastAsia="宋体"/><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="a8"><w:name w:val="Balloon Text"/><w:basedOn w:val="a"/><w:link w:val="Char3"/><w:uiPriority w:val="99"/><w:semiHidden/><w:unhideWhenUsed/><w:rsid w:val="00581F8C"/><w:rPr><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="Char3"><w:name w:val="批注框文本 Char"/><w:basedOn w:val="a0"/><w:link w:val="a8"/><w:uiPriority w:val="99"/><w:semiHidden/><w:rsid w:val="00581F8C"/><w:rPr><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="paragraph" w:styleId="a9"><w:name w:val="footnote text"/><w:basedOn w:val="a"/><w:link w:val="Char4"/><w:uiPriority w:val="99"/><w:semiHidden/><w:unhideWhenUsed/><w:rsid w:val="006E593F"/><w:pPr><w:snapToGrid w:val="0"/><w:jc w:val="left"/></w:pPr><w:rPr><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="character" w:customStyle="1" w:styleId="Char4"><w:name w:val="脚注文本 Char"/><w:basedOn w:val="a0"/><w:link w:val="a9"/><w:uiPriority w:val="99"/><w:semiHidden/><w:rsid w:val="006E593F"/><w:rPr><w:sz w:val="18"/><w:szCs w:val="18"/></w:rPr></w:style><w:style w:type="character" w:styleId="aa"><w:name w:val="footnote reference"/><w:basedOn w:val="a0"/><w:uiPriority w:val="99"/><w:semiHidden/><w:unhideWhenUsed/><w:rsid w:val="006E593F"/><w:rPr><w:vertAlign w:val="superscript"/></w:rPr></w:style><w:style w:type="table" w:styleId="ab"><w:name w:val="Table Grid"/><w:basedOn w:val="a1"/><w:uiPriority w:val="59"/><w:rsid w:val="00D06FBB"/><w:tblPr><w:tblInd w:w="0" w:type="dxa"/><w:tblBorders><w:top w:val="single" w:sz="4" w:space="0" w:color="000000" w:themeColor="text1"/><w:left w:val="single" w:sz="4" w:space="0" w:color="000000" w:themeColor="text1"/><w:bottom w:val="single" w:sz="4" w:space="0" w:color="000000" w:themeColor="text1"/><w:right w:val="single" w:sz="4" w:space="0" w:color="000000" w:themeColor="text1"/><w:insideH w:val="single" w:sz="4" w:space="0" w:color="000000" w:themeColor="text1"/><w:insideV w:val="single" w:sz="4" w:space="0" w:color="000000" w:themeColor="text1"/></w:tblBorders><w:tblCellMar><w:top w:w="0" w:type="dxa"/><w:left w:w="108" w:type="dxa"/><w:bottom w:w="0" w:type="dxa"/><w:right w:w="108" w:type="dxa"/></w:tblCellMar></w:tblPr></w:style></w:styles>"""
+        xml = read_part('styles.xml')
+        if self.compact:
+            xml = xml.replace('</w:styles>', COMPACT_STYLES + '</w:styles>')
         self._add_xml(path='word/styles.xml', xml=xml)
 
     def _build_webSettings(self):
-        xml = """<w:webSettings xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:optimizeForBrowser/></w:webSettings>"""
+        xml = read_part('webSettings.xml')
         self._add_xml(path='word/webSettings.xml', xml=xml)
 
     # ===============================================================
@@ -449,17 +588,19 @@ class DocX:
 
         return ret
 
-    def visit_reference(self, bookmark):
+    def visit_reference(self, bookmark, brackets=True):
         mark_id = self._retrieve_mark_id(bookmark)
 
         ret = Composite()
-        ret.add(E('w:r', E('w:t', '(')))
+        if brackets:
+            ret.add(E('w:r', E('w:t', '(')))
         ret.add(E('w:r', E('w:fldChar', {'w:fldCharType': 'begin'})))
         ret.add(E('w:r', E('w:instrText', f'REF {mark_id.text} \\h')))
         ret.add(E('w:r', E('w:fldChar', {'w:fldCharType': 'separate'})))
         ret.add(E('w:r', E('w:t', '0')))
         ret.add(E('w:r', E('w:fldChar', {'w:fldCharType': 'end'})))
-        ret.add(E('w:r', E('w:t', ')')))
+        if brackets:
+            ret.add(E('w:r', E('w:t', ')')))
 
         return ret
 
@@ -490,8 +631,11 @@ class DocX:
         number, text = self._retrieve_mark_id(heading)
 
         body = self.body_elements
-        if len(self.catalog_elements) > 0 and level == 1:
-            body.add(self._make_page_break())
+        if level == 1:
+            if len(self.catalog_elements) > 0:
+                body.add(self._make_page_break())
+            elif self.fragment:
+                body.add(Raw(PAGE_BREAK_HOLDER))
 
         para = E('w:p')
         body.add(para)
@@ -501,57 +645,22 @@ class DocX:
         para.add(content.visit(self))
         para.add(E('w:bookmarkEnd', {'w:id': number}))
 
-        log = self.catalog_elements
-
         if level <= 3:
-
-            para = E('w:p')
-
-            prop = E('w:pPr',
-                     E('w:pStyle', {'w:val': f'{level*10}'}),
-                     E('w:tabs',
-                       E('w:tab', {'w:val': 'left', 'w:pos': f'{420+630*(level-1)}'}),
-                       E('w:tab', {'w:val': 'right', 'w:leader': 'dot', 'w:pos': '8296'})),
-                     E('w:rPr', E('w:noProof'), E('w:rStyle', {'w:val': 'a3'})))
-            para.add(prop)
-
-            if len(log) == 0:
-                log.add(E('w:p',
-                          E('w:pPr', E('w:jc', {'w:val': 'center'})),
-                          E('w:r',
-                            E('w:rPr', E('w:b'), E('w:sz', {'w:val': '32'})),
-                            E('w:t', '目录'))))
-                log.add(para)
-
-                para.add(E('w:r', E('w:fldChar', {'w:fldCharType': 'begin'})))
-                para.add(E('w:r', E('w:instrText', {'xml:space': 'preserve'}, ' ')))
-                para.add(E('w:r', E('w:instrText', 'TOC \\o "1-3" \\h \\z \\u')))
-                para.add(E('w:r', E('w:instrText', ' ', {'xml:space': 'preserve'})))
-                para.add(E('w:r', E('w:fldChar', {'w:fldCharType': 'separate'})))
-
-            else:
-                log.add(para)
-
-            link = E('w:hyperlink', {'w:anchor': text, 'w:history': '1'},
-                     E('w:r', E('w:t', self._get_catalog_number(level))),
-                     E('w:r', E('w:tab')),
-                     content.visit(self),
-                     E('w:r', E('w:tab')),
-                     E('w:r', E('w:fldChar', {'w:fldCharType': 'begin'})),
-                     E('w:r', E('w:instrText', {'xml:space': 'preserve'},
-                                f' PAGEREF {text} \\h ')),
-                     E('w:r', E('w:fldChar', {'w:fldCharType': 'separate'})),
-                     E('w:r', E('w:t', '0')),
-                     E('w:r', E('w:fldChar', {'w:fldCharType': 'end'})))
-            para.add(link)
+            catalog_content = content.visit(self)
+            if self.fragment:
+                self.fragment_catalog_list.append((level, int(number), catalog_content))
+            self._write_catalog_entry(level, text, catalog_content)
 
     def visit_paragraph(self, content):
         para = E('w:p')
         self.body_elements.add(para)
 
-        para.add(E('w:pPr',
-                   E('w:spacing', {'w:before': '156', 'w:after': '156'}),
-                   E('w:ind', {'w:firstLine': '420'})))
+        if self.compact:
+            para.add(E('w:pPr', E('w:pStyle', {'w:val': 'ac'})))
+        else:
+            para.add(E('w:pPr',
+                       E('w:spacing', {'w:before': '156', 'w:after': '156'}),
+                       E('w:ind', {'w:firstLine': '420'})))
 
         para.add(content.visit(self))
 
@@ -615,11 +724,14 @@ class DocX:
             p = E('w:p')
             self.body_elements.add(p)
 
-            p.add(E('w:pPr',
-                    E('w:tabs',
-                      E('w:tab', {'w:val': 'right', 'w:pos': '500'}),
-                      E('w:tab', {'w:val': 'center', 'w:pos': '600'}),
-                      E('w:tab', {'w:val': 'left', 'w:pos': '700'}))))
+            if self.compact:
+                p.add(E('w:pPr', E('w:pStyle', {'w:val': 'ad'})))
+            else:
+                p.add(E('w:pPr',
+                        E('w:tabs',
+                          E('w:tab', {'w:val': 'right', 'w:pos': '500'}),
+                          E('w:tab', {'w:val': 'center', 'w:pos': '600'}),
+                          E('w:tab', {'w:val': 'left', 'w:pos': '700'}))))
             p.add(E('w:r', E('w:tab')))
             p.add(E('m:oMath',
                     var.visit(self)))
@@ -651,8 +763,33 @@ class DocX:
             p.add(E('w:pPr', E('w:pStyle', {'w:val': 'a9'})))
             p.add(title.visit(self))
 
-    def visit_table(self, content_by_rows, title):
-        width = min(PAGE_WIDTH // len(content_by_rows[0]),
+    def visit_table(self, content_by_rows, title, header_rows=0):
+        tb = self._make_table(len(content_by_rows[0]), title)
+        for i, row in enumerate(content_by_rows):
+            tr = E('w:tr')
+            tb.add(tr)
+            if i < header_rows:
+                tr.add(E('w:trPr', E('w:tblHeader')))
+            for cell in row:
+                tr.add(self._make_table_cell(cell.visit(self)))
+
+    # rows of the data table are strings formatted already, written as
+    # plain text runs. the header is a repeated header row.
+    def visit_data_table(self, header, rows, column_count, title):
+        tb = self._make_table(column_count, title)
+        if header is not None:
+            tr = E('w:tr', E('w:trPr', E('w:tblHeader')))
+            tb.add(tr)
+            for text in header:
+                tr.add(self._make_table_cell(E('w:r', E('w:t', text))))
+        for row in rows:
+            tr = E('w:tr')
+            tb.add(tr)
+            for text in row:
+                tr.add(self._make_table_cell(E('w:r', E('w:t', text))))
+
+    def _make_table(self, column_count, title):
+        width = min(PAGE_WIDTH // column_count,
                     MIN_TABLE_CELL_WIDTH)
 
         if title is not None:
@@ -669,31 +806,31 @@ class DocX:
 
         tb_pr = E('w:tblPr')
         tb.add(tb_pr)
-        tb_pr.add(E('w:tblStyle', {'w:val': 'ab'}))
+        tb_pr.add(E('w:tblStyle', {'w:val': 'af' if self.compact else 'ab'}))
         tb_pr.add(E('w:jc', {'w:val': 'center'}))
         tb_pr.add(E('w:tblLayout', {'w:type': 'fixed'}))
 
         grid = E('w:tblGrid')
         tb.add(grid)
-        for i in range(len(content_by_rows[0])):
+        for i in range(column_count):
             grid.add(E('w:gridCol', {'w:w': f'{width}'}))
+        return tb
 
-        for row in content_by_rows:
-            tr = E('w:tr')
-            tb.add(tr)
-
-            for cell in row:
-                tc = E('w:tc')
-                tr.add(tc)
-                tc.add(E('w:tcPr',
-                         E('w:vAlign', {'w:val': 'center'})))
-
-                p = E('w:p')
-                tc.add(p)
-                p.add(E('w:pPr',
-                        E('w:jc', {'w:val': 'center'})))
+    def _make_table_cell(self, content):
+        tc = E('w:tc')
+        p = E('w:p')
+        if self.compact:
+            tc.add(p)
+            p.add(E('w:pPr', E('w:pStyle', {'w:val': 'ae'})))
+        else:
+            tc.add(E('w:tcPr',
+                     E('w:vAlign', {'w:val': 'center'})))
+            tc.add(p)
+            p.add(E('w:pPr',
+                    E('w:jc', {'w:val': 'center'})))
 
-                p.add(cell.visit(self))
+        p.add(content)
+        return tc
 
     def _retrieve_mark_id(self, obj):
         if id(obj) in self.mark_id_dict.keys():
@@ -701,8 +838,52 @@ class DocX:
         else:
             mark_id = self._get_mark_id()
             self.mark_id_dict[id(obj)] = mark_id
+            forget_with(obj, self.mark_id_dict)
             return mark_id
 
+    def _write_catalog_entry(self, level, text, content):
+        log = self.catalog_elements
+
+        para = E('w:p')
+
+        prop = E('w:pPr',
+                 E('w:pStyle', {'w:val': f'{level*10}'}),
+                 E('w:tabs',
+                   E('w:tab', {'w:val': 'left', 'w:pos': f'{420+630*(level-1)}'}),
+                   E('w:tab', {'w:val': 'right', 'w:leader': 'dot', 'w:pos': '8296'})),
+                 E('w:rPr', E('w:noProof'), E('w:rStyle', {'w:val': 'a3'})))
+        para.add(prop)
+
+        if len(log) == 0:
+            log.add(E('w:p',
+                      E('w:pPr', E('w:jc', {'w:val': 'center'})),
+                      E('w:r',
+                        E('w:rPr', E('w:b'), E('w:sz', {'w:val': '32'})),
+                        E('w:t', '目录'))))
+            log.add(para)
+
+            para.add(E('w:r', E('w:fldChar', {'w:fldCharType': 'begin'})))
+            para.add(E('w:r', E('w:instrText', {'xml:space': 'preserve'}, ' ')))
+            para.add(E('w:r', E('w:instrText', 'TOC \\o "1-3" \\h \\z \\u')))
+            para.add(E('w:r', E('w:instrText', ' ', {'xml:space': 'preserve'})))
+            para.add(E('w:r', E('w:fldChar', {'w:fldCharType': 'separate'})))
+
+        else:
+            log.add(para)
+
+        link = E('w:hyperlink', {'w:anchor': text, 'w:history': '1'},
+                 E('w:r', E('w:t', self._get_catalog_number(level))),
+                 E('w:r', E('w:tab')),
+                 content,
+                 E('w:r', E('w:tab')),
+                 E('w:r', E('w:fldChar', {'w:fldCharType': 'begin'})),
+                 E('w:r', E('w:instrText', {'xml:space': 'preserve'},
+                            f' PAGEREF {text} \\h ')),
+                 E('w:r', E('w:fldChar', {'w:fldCharType': 'separate'})),
+                 E('w:r', E('w:t', '0')),
+                 E('w:r', E('w:fldChar', {'w:fldCharType': 'end'})))
+        para.add(link)
+
     def _write_catalog_end(self):
         log = self.catalog_elements
         log.add(E('w:p', E('w:r', E('w:fldChar', {'w:fldCharType': 'end'}))))
@@ -710,7 +891,7 @@ class DocX:
 
     def _get_catalog_number(self, level):
         if level > len(self.catalog_list):
-            self.catalog_list.append(1)
+            self.catalog_list.append(1 if self.catalog_list else self.first_chapter)
         else:
             self.catalog_list = self.catalog_list[:level]
             self.catalog_list[-1] += 1
@@ -760,6 +941,102 @@ class DocX:
     # document.xml END
     # ===============================================================
 
+    # ===============================================================
+    # fragment START
+    # ---------------------------------------------------------------
+
+    # everything but the report which the rendered xml depends on.
+    def cache_seed(self):
+        return f'{type(self).__module__}.{type(self).__qualname__}:compact={self.compact}'
+
+    def new_fragment_writer(self):
+        writer = type(self)(compact=self.compact)
+        writer.fragment = True
+        return writer
+
+    # a writer for the next volume of a report split at level 1 headings,
+    # made when this volume has all its fragments. the volumes share the
+    # ids of marks and the results of fields, and number the chapters on.
+    def new_volume_writer(self):
+        writer = type(self)(compact=self.compact)
+        writer.mark_id_dict = self.mark_id_dict
+        writer.mark_id = self.mark_id
+        if len(self.catalog_list) > 0:
+            writer.first_chapter = self.catalog_list[0] + 1
+        else:
+            writer.first_chapter = self.first_chapter
+        writer.field_resolver = FieldResolver(self.field_resolver.mark_dict, writer.first_chapter)
+        return writer
+
+    # give the marks of fragment the local ids in the order of MarkCollector.
+    def set_marks(self, defined, external):
+        for obj in defined:
+            self._retrieve_mark_id(obj)
+        for i, obj in enumerate(external, start=1):
+            self.mark_id_dict[id(obj)] = Id(f'{i}', f'_Ext{i}')
+
+    def get_fragment(self) -> Fragment:
+        rel_dict = {f'word/{rel.get("Target")}': rel.get('Id') for rel in self.doc_rels_elements}
+        figures = [(int(rel_dict[fig.path][3:]), i, fig)
+                   for i, fig in enumerate(self.figure_list, start=1)]
+        catalog = [(level, number, serialize(Composite(content)))
+                   for level, number, content in self.fragment_catalog_list]
+        return Fragment(body=serialize(self.body_elements),
+                        footnotes=serialize(self.footnotes_elements),
+                        catalog=catalog,
+                        figures=figures)
+
+    # splice a fragment rendered by a fragment writer, the objects of marks
+    # are the same with those given to set_marks of the fragment writer.
+    def add_fragment(self, fragment: Fragment, defined=(), external=()):
+        mark_dict = dict()
+        footnote_dict = dict()
+        rel_dict = dict()
+        image_dict = dict()
+
+        def mark(kind, number):
+            if (kind, number) not in mark_dict:
+                if kind == 'Ext':
+                    mark_id = self._retrieve_mark_id(external[number - 1])
+                elif number <= len(defined):
+                    mark_id = self._retrieve_mark_id(defined[number - 1])
+                else:
+                    mark_id = self._get_mark_id()
+                mark_dict[(kind, number)] = mark_id.number
+            return mark_dict[(kind, number)]
+
+        def footnote(number):
+            if number not in footnote_dict:
+                footnote_dict[number] = self._get_footnote_id().number
+            return footnote_dict[number]
+
+        for rel_id, image_id, fig in fragment.figures:
+            fig_id = len(self.figure_list) + 1
+            format_ = fig.path.rsplit('.', 1)[-1]
+            rel_number, rel_text = self._get_rel_id()
+            rel_dict[rel_id] = rel_number
+            image_dict[image_id] = fig_id
+            self.figure_list.append(FigureFile(path=f'word/media/image{fig_id}.{format_}', figure=fig.figure))
+            self._write_relationship(id_=rel_text,
+                                     type_='http://schemas.openxmlformats.org/officeDocument/2006/relationships/image',
+                                     target=f'media/image{fig_id}.{format_}')
+
+        body, footnotes, catalog = fragment.renumber(mark, footnote, rel_dict.__getitem__, image_dict.__getitem__)
+
+        page_break = serialize([self._make_page_break()]) if len(self.catalog_elements) > 0 else ''
+        self.body_elements.add(Raw(body.replace(PAGE_BREAK_HOLDER, page_break, 1)))
+        if footnotes:
+            self.footnotes_elements.add(Raw(footnotes))
+        for level, number, content in catalog:
+            self._write_catalog_entry(level, f'_Mark{number}', self._parse_fragment_xml(content))
+
+    def _parse_fragment_xml(self, xml):
+        return parse_xml(xml)
+
+    # ---------------------------------------------------------------
+    # fragment END
+    # ===============================================================
+
     # ===============================================================
     # math START
     # ---------------------------------------------------------------
@@ -943,13 +1220,15 @@ class DocX:
                 pr.add(E('m:sty', {'m:val': sty}))
             if align:
                 pr.add(E('m:aln'))
-        wpr = E('w:rPr')
-        run.add(wpr)
-
-        wpr.add(E('w:rFonts', {'w:ascii': 'Cambria Math',
-                               'w:hAnsi': 'Cambria Math'}))
-        if color is not None:
-            wpr.add(E('w:color', {'w:val': color}))
+        if not self.compact or color is not None:
+            wpr = E('w:rPr')
+            run.add(wpr)
+
+            if not self.compact:
+                wpr.add(E('w:rFonts', {'w:ascii': 'Cambria Math',
+                                       'w:hAnsi': 'Cambria Math'}))
+            if color is not None:
+                wpr.add(E('w:color', {'w:val': color}))
 
         run.add(E('m:t', text))
         return run
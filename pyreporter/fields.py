@@ -0,0 +1,113 @@
+import re
+
+__all__ = ['FieldResolver', 'reset_references']
+
+# the xml below is written by visit_heading, visit_bookmark and
+# visit_reference of the writers, which is the same for DocX and TextDocX.
+_HEADING_1 = '<w:pPr><w:pStyle w:val="1" /></w:pPr>'
+
+_BOOKMARK = (re.escape('<w:bookmarkStart w:id="') + r'\d+' + re.escape('" w:name="')
+             + r'(?P<name>[^"]+)' + re.escape('" /><w:r><w:t>') + r'(?P<type>[^<]+)'
+             + re.escape('</w:t></w:r><w:r><w:t xml:space="preserve" /></w:r>'
+                         '<w:fldSimple w:instr=" STYLEREF 1 \\s"><w:r><w:t>')
+             + r'(?P<chapter>\d+)'
+             + re.escape('</w:t></w:r></w:fldSimple><w:r><w:noBreakHyphen /></w:r>'
+                         '<w:r><w:fldChar w:fldCharType="begin" /></w:r>'
+                         '<w:r><w:instrText xml:space="preserve"> </w:instrText></w:r>'
+                         '<w:r><w:instrText xml:space="preserve">SEQ </w:instrText></w:r>'
+                         '<w:r><w:instrText>') + r'(?P=type)'
+             + re.escape('</w:instrText></w:r>'
+                         '<w:r><w:instrText xml:space="preserve"> \\* ARABIC \\s 1</w:instrText></w:r>'
+                         '<w:r><w:instrText xml:space="preserve" /></w:r>'
+                         '<w:r><w:fldChar w:fldCharType="separate" /></w:r><w:r><w:t>')
+             + r'(?P<seq>\d+)')
+
+# both start with <w:p or <w:b, checked first by the lookahead
+_DOCUMENT_PATTERN = re.compile(f'(?=<w:[pb])(?:(?P<heading>{re.escape(_HEADING_1)})|(?P<bookmark>{_BOOKMARK}))')
+
+_FIELD_END = '<w:r><w:fldChar w:fldCharType="end" /></w:r>'
+
+_REFERENCE_PATTERN = re.compile(
+    r'(?P<field>' + re.escape('<w:r><w:fldChar w:fldCharType="begin" /></w:r><w:r><w:instrText>REF ')
+    + r'(?P<name>[^ <]+)'
+    + re.escape(' \\h</w:instrText></w:r><w:r><w:fldChar w:fldCharType="separate" /></w:r>') + r')'
+    + re.escape('<w:r><w:t>0</w:t></w:r>' + _FIELD_END))
+
+_RESOLVED_REFERENCE_PATTERN = re.compile(
+    re.escape('<w:r><w:instrText>REF ') + r'[^ <]+'
+    + re.escape(' \\h</w:instrText></w:r><w:r><w:fldChar w:fldCharType="separate" /></w:r>')
+    + r'(?P<result>' + re.escape('<w:r><w:t>') + r'[^<]*'
+    + re.escape('</w:t></w:r><w:r><w:noBreakHyphen /></w:r><w:r><w:t>') + r'\d+'
+    + re.escape('</w:t></w:r>') + r')')
+
+
+# word shows the placeholders written at visit time, 0 for STYLEREF and
+# REF and 1 for SEQ, until all the fields are updated. the resolver writes
+# the real results when the document is saved:
+# STYLEREF 1 is the number of the chapter, SEQ counts the bookmarks of
+# its type from the last chapter, and REF repeats the text of the bookmark.
+# PAGEREF of the catalog needs the layout of pages, which is left to word.
+# a report split into volumes gives every volume a resolver sharing one
+# mark_dict, which the volumes fill as they are saved. references to the
+# volumes saved later are left unresolved and resolved again once all are
+# saved, see resolve_volume. REF only finds bookmarks of the same document,
+# such references are written as plain text.
+class FieldResolver:
+    def __init__(self, mark_dict=None, first_chapter=1):
+        self.mark_dict = dict() if mark_dict is None else mark_dict  # bookmark name: (type, chapter, seq)
+        self.first_chapter = first_chapter
+        self.local_set = None  # bookmark names of the document, None before numbered
+        self.unresolved = False  # references to bookmarks not numbered yet were met
+
+    def resolve_document(self, xml):
+        return self.resolve_references(self.number_bookmarks(xml))
+
+    def number_bookmarks(self, xml):
+        chapter = self.first_chapter - 1
+        seq_dict = dict()
+        self.local_set = set()
+
+        def replace(match):
+            nonlocal chapter
+            if match.lastgroup == 'heading':
+                chapter += 1
+                seq_dict.clear()
+                return match.group()
+
+            type_ = match['type']
+            seq_dict[type_] = seq_dict.get(type_, 0) + 1
+            self.mark_dict[match['name']] = (type_, chapter, seq_dict[type_])
+            self.local_set.add(match['name'])
+
+            start, end = match.start(), match.end()
+            chapter_start, chapter_end = match.span('chapter')
+            seq_start = match.start('seq')
+            string = match.string
+            return (string[start:chapter_start] + str(chapter)
+                    + string[chapter_end:seq_start] + str(seq_dict[type_]))
+
+        return _DOCUMENT_PATTERN.sub(replace, xml)
+
+    def resolve_references(self, xml):
+        def replace(match):
+            if match['name'] not in self.mark_dict:
+                self.unresolved = True
+                return match.group()
+            type_, chapter, seq = self.mark_dict[match['name']]
+            result = (f'<w:r><w:t>{type_}{chapter}</w:t></w:r>'
+                      f'<w:r><w:noBreakHyphen /></w:r>'
+                      f'<w:r><w:t>{seq}</w:t></w:r>')
+            if self.local_set is not None and match['name'] not in self.local_set:
+                return result
+            return match['field'] + result + _FIELD_END
+
+        return _REFERENCE_PATTERN.sub(replace, xml)
+
+
+# put the placeholder back into the REF fields resolved at save, so that
+# the xml of a saved document can be resolved again, e.g. when merged.
+def reset_references(xml):
+    def replace(match):
+        return match.group()[:match.start('result') - match.start()] + '<w:r><w:t>0</w:t></w:r>'
+
+    return _RESOLVED_REFERENCE_PATTERN.sub(replace, xml)
@@ -0,0 +1,155 @@
+import os
+import re
+import pickle
+from collections import deque
+from .walker import Walker
+
+__all__ = ['Fragment', 'MarkCollector', 'render_fragment', 'iter_fragments_parallel']
+
+# a level 1 heading leads with a page break unless it is the first heading
+# of the document, which a fragment can not know when it is rendered alone.
+PAGE_BREAK_HOLDER = '<!--pyreporter:page-break-->'
+
+# the ids are only taken at the tags which hold them, and the marks of
+# fields at the start of instrText, whose text the writers make alone. the
+# text of the report never has a '<', so it is never taken for a tag.
+_ID_PATTERN = re.compile(
+    r'(?P<bookmark><w:bookmark(?:Start|End) w:id=")(?P<bookmark_id>\d+)'
+    r'(?:" w:name="_(?P<name_kind>Mark|Ext)(?P<name_id>\d+))?'
+    r'|(?P<mark><w:hyperlink w:anchor="_|<w:instrText[^>]*>\s*(?:PAGE)?REF _)'
+    r'(?P<mark_kind>Mark|Ext)(?P<mark_id>\d+)'
+    r'|(?P<footnote><w:footnote(?:Reference)? w:id=")(?P<footnote_id>\d+)'
+    r'|(?P<rel><a:blip r:embed="rId)(?P<rel_id>\d+)'
+    r'|(?P<image><(?:wp:docPr|pic:cNvPr) id=")(?P<image_id>\d+)" name="image\d+')
+
+
+# fragment is the rendered xml of a slice of report body, which numbers its
+# bookmarks, footnotes, relationships and images from 1 by itself.
+# marks defined in the slice are named _MarkN, marks referenced but defined
+# elsewhere are named _ExtN, both in the order of MarkCollector.
+class Fragment:
+    def __init__(self, body, footnotes, catalog, figures):
+        self.body = body  # type: str
+        self.footnotes = footnotes  # type: str
+        self.catalog = catalog  # type: list  # (level, mark id, content xml)
+        self.figures = figures  # type: list  # (rel id, image id, FigureFile)
+
+    # rewrite the local ids by the given functions, mark is called with
+    # ('Mark' or 'Ext', local number), the others with the local number.
+    def renumber(self, mark, footnote, rel, image):
+        def replace(match):
+            if match['bookmark'] is not None:
+                ret = f'{match["bookmark"]}{mark("Mark", int(match["bookmark_id"]))}'
+                if match['name_id'] is not None:
+                    ret += f'" w:name="_Mark{mark(match["name_kind"], int(match["name_id"]))}'
+                return ret
+            elif match['mark'] is not None:
+                new = mark(match['mark_kind'], int(match['mark_id']))
+                return f'{match["mark"]}Mark{new}'
+            elif match['footnote'] is not None:
+                return f'{match["footnote"]}{footnote(int(match["footnote_id"]))}'
+            elif match['rel'] is not None:
+                return f'{match["rel"]}{rel(int(match["rel_id"]))}'
+            else:
+                new = image(int(match['image_id']))
+                return f'{match["image"]}{new}" name="image{new}'
+
+        body = _ID_PATTERN.sub(replace, self.body)
+        footnotes = _ID_PATTERN.sub(replace, self.footnotes)
+        catalog = [(level, mark('Mark', number), _ID_PATTERN.sub(replace, content))
+                   for level, number, content in self.catalog]
+        return body, footnotes, catalog
+
+
+# collect the marks (headings and bookmarks) a slice of report defines,
+# and the marks it refers to but defined in other slices.
+class MarkCollector(Walker):
+    def __init__(self):
+        self.defined = list()
+        self.referred = list()
+        self._ordinal = dict()
+        self._defined_id = set()
+
+    def _mark(self, obj):
+        if id(obj) not in self._ordinal:
+            self._ordinal[id(obj)] = len(self._ordinal) + 1
+        return self._ordinal[id(obj)]
+
+    def _define(self, obj):
+        if id(obj) not in self._defined_id:
+            self._defined_id.add(id(obj))
+            self.defined.append(obj)
+        self.node('mark', self._mark(obj))
+
+    @property
+    def external(self):
+        found = set(self._defined_id)
+        ret = list()
+        for obj in self.referred:
+            if id(obj) not in found:
+                found.add(id(obj))
+                ret.append(obj)
+        return ret
+
+    def visit_heading(self, *, content, level, heading):
+        self._define(heading)
+        super().visit_heading(content=content, level=level, heading=heading)
+
+    def visit_bookmark(self, *, type_, bookmark, left, right):
+        self._define(bookmark)
+        super().visit_bookmark(type_=type_, bookmark=bookmark, left=left, right=right)
+
+    def visit_reference(self, bookmark, brackets=True):
+        self.referred.append(bookmark)
+        self.node('mark', self._mark(bookmark))
+        super().visit_reference(bookmark, brackets)
+
+
+def render_fragment(writer, element_list, marks: MarkCollector) -> Fragment:
+    return _render(writer.new_fragment_writer(), element_list, marks.defined, marks.external)
+
+
+def _render(fragment_writer, element_list, defined, external):
+    fragment_writer.set_marks(defined, external)
+    for element in element_list:
+        element.visit(fragment_writer)
+    return fragment_writer.get_fragment()
+
+
+# the arguments are pickled in one go, so the marks in defined and external
+# stay the same objects as the ones in the element list.
+def _render_pickled(payload):
+    return _render(*pickle.loads(payload))
+
+
+# render the slices in a process pool, a few of them ahead of the one
+# taken, so only those are held. slices are (element list, marks,
+# fragment) and come back in their order with the fragments rendered, a
+# fragment given, e.g. from the cache, is passed on as it is. slices which
+# can not be pickled, e.g. holding an open file, are rendered in this
+# process.
+def iter_fragments_parallel(writer, slices, processes=None):
+    from concurrent.futures import ProcessPoolExecutor
+
+    ahead = 2 * (processes or os.cpu_count() or 1)
+    pending = deque()
+    with ProcessPoolExecutor(processes) as pool:
+        for element_list, marks, fragment in slices:
+            if fragment is None:
+                try:
+                    payload = pickle.dumps((writer.new_fragment_writer(), element_list,
+                                            marks.defined, marks.external),
+                                           pickle.HIGHEST_PROTOCOL)
+                except (pickle.PicklingError, TypeError, AttributeError):
+                    fragment = render_fragment(writer, element_list, marks)
+                else:
+                    fragment = pool.submit(_render_pickled, payload)
+            pending.append((element_list, marks, fragment))
+            if len(pending) > ahead:
+                yield _rendered(*pending.popleft())
+        while pending:
+            yield _rendered(*pending.popleft())
+
+
+def _rendered(element_list, marks, fragment):
+    return element_list, marks, fragment if isinstance(fragment, Fragment) else fragment.result()
@@ -0,0 +1,183 @@
+import csv
+import json
+import os
+import zipfile
+from collections import OrderedDict
+from itertools import islice
+import numpy
+from .calculator import SerialVariable, VariableInSerial
+
+__all__ = ['load_inputs', 'iter_inputs', 'column_names', 'variable_names', 'match_columns']
+
+
+# the names a column of a file may have for the variable: 'Q-uk' as the
+# variable prints, 'Q_uk', and its inform. the variables of a serial are
+# 'l[1]', 'l[2]' and so on after the names of the serial.
+def variable_names(variable):
+    if isinstance(variable, VariableInSerial):
+        names = [f'{name}[{variable.index}]' for name in variable_names(variable.root)]
+    else:
+        names = [f'{variable}']
+        if variable.subscript is not None:
+            names.append(f'{variable.symbol}_{variable.subscript}')
+    if variable.inform is not None:
+        names.append(variable.inform)
+    return names
+
+
+# map the variables to the columns of the file, by the names of the
+# variables or columns given as {variable: name or position}. a serial
+# variable takes the columns of its variables, which are made by new()
+# when the serial has fewer.
+def match_columns(name_list, variable_list, columns=None):
+    columns = dict() if columns is None else columns
+    position_dict = {name: i for i, name in enumerate(name_list)}
+    ret = OrderedDict()
+    for variable in variable_list:
+        if isinstance(variable, SerialVariable):
+            index = 0
+            while True:
+                if index == len(variable):
+                    if not any(f'{name}[{index + 1}]' in position_dict for name in variable_names(variable)):
+                        break
+                    variable.new()
+                position = _find(variable[index], position_dict, columns)
+                if position is None:
+                    break
+                ret[variable[index]] = position
+                index += 1
+            assert index > 0, f'no column for the serial variable {variable}'
+        else:
+            position = _find(variable, position_dict, columns)
+            assert position is not None, f'no column for the variable {variable}'
+            ret[variable] = position
+    return ret
+
+
+def _find(variable, position_dict, columns):
+    if variable in columns:
+        column = columns[variable]
+        return column if isinstance(column, int) else position_dict[column]
+    for name in variable_names(variable):
+        if name in position_dict:
+            return position_dict[name]
+    return None
+
+
+def _extension(path):
+    return os.path.splitext(os.fspath(path))[1].lower()
+
+
+# names of the columns of a file: the header of csv, the keys of the first
+# line of json lines, the fields of a structured npy or the arrays of npz.
+# a plain 2-d npy has positions only.
+def column_names(path):
+    ext = _extension(path)
+    if ext == '.csv':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            return next(csv.reader(f))
+    elif ext == '.jsonl':
+        with open(path, encoding='utf-8') as f:
+            return list(json.loads(f.readline()).keys())
+    elif ext == '.npy':
+        array = numpy.load(path, mmap_mode='r')
+        return list(array.dtype.names or [])
+    elif ext == '.npz':
+        with zipfile.ZipFile(path) as z:
+            return [name[:-4] for name in z.namelist() if name.endswith('.npy')]
+    raise ValueError(f'unknown file of inputs: {path}')
+
+
+# read the values of the variables by case from a file of columns, as the
+# inputs of Calculator.run. npy and the arrays stored without compression
+# in npz are memory maps, the values are read from disk as they are used.
+# csv is parsed by numpy for the columns taken only, json lines take a
+# list per column.
+def load_inputs(path, variable_list, columns=None):
+    position_dict = match_columns(column_names(path), variable_list, columns)
+    ext = _extension(path)
+    if ext == '.csv':
+        position_list = sorted(set(position_dict.values()))
+        data = numpy.loadtxt(path, delimiter=',', skiprows=1, usecols=position_list, ndmin=2,
+                             encoding='utf-8-sig')
+        column_dict = {p: data[:, i] for i, p in enumerate(position_list)}
+    elif ext == '.jsonl':
+        name_list = column_names(path)
+        column_dict = {p: list() for p in position_dict.values()}
+        key_list = [(p, name_list[p]) for p in column_dict]
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    for p, key in key_list:
+                        column_dict[p].append(row[key])
+        column_dict = {p: numpy.array(values, dtype=float) for p, values in column_dict.items()}
+    elif ext == '.npy':
+        array = numpy.load(path, mmap_mode='r')
+        if array.dtype.names is None:
+            column_dict = {p: array[:, p] for p in set(position_dict.values())}
+        else:
+            column_dict = {p: array[array.dtype.names[p]] for p in set(position_dict.values())}
+    else:
+        name_list = column_names(path)
+        column_dict = {p: _load_npz_array(path, name_list[p]) for p in set(position_dict.values())}
+    return OrderedDict((v, column_dict[p]) for v, p in position_dict.items())
+
+
+# an array stored without compression in npz is a npy file at an offset of
+# the zip, which is mapped as it is.
+def _load_npz_array(path, name):
+    with zipfile.ZipFile(path) as z:
+        info = z.getinfo(f'{name}.npy')
+        if info.compress_type != zipfile.ZIP_STORED:
+            return numpy.load(path)[name]
+    with open(path, 'rb') as f:
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        f.seek(info.header_offset + 30
+               + int.from_bytes(local_header[26:28], 'little')
+               + int.from_bytes(local_header[28:30], 'little'))
+        if numpy.lib.format.read_magic(f) == (1, 0):
+            shape, fortran_order, dtype = numpy.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = numpy.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    return numpy.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape,
+                        order='F' if fortran_order else 'C')
+
+
+# the inputs of the file in chunks of chunk_size cases, after the first
+# start cases, for files larger than the memory. csv and json lines are
+# parsed a chunk of lines at a time, the memory maps are copied a chunk at
+# a time, so the chunk is read from disk here.
+def iter_inputs(path, variable_list, chunk_size, columns=None, start=0):
+    ext = _extension(path)
+    if ext not in ('.csv', '.jsonl'):
+        inputs = load_inputs(path, variable_list, columns)
+        size = len(next(iter(inputs.values())))
+        for begin in range(start, size, chunk_size):
+            yield OrderedDict((v, numpy.array(values[begin:begin + chunk_size], dtype=float))
+                              for v, values in inputs.items())
+        return
+
+    name_list = column_names(path)
+    position_dict = match_columns(name_list, variable_list, columns)
+    position_list = sorted(set(position_dict.values()))
+    with open(path, newline='' if ext == '.csv' else None, encoding='utf-8-sig') as f:
+        if ext == '.csv':
+            next(f)
+        lines = (line for line in f if line.strip())
+        for line in islice(lines, start):
+            pass
+        while True:
+            chunk = list(islice(lines, chunk_size))
+            if len(chunk) == 0:
+                break
+            if ext == '.csv':
+                data = numpy.loadtxt(chunk, delimiter=',', usecols=position_list, ndmin=2)
+                column_dict = {p: data[:, i] for i, p in enumerate(position_list)}
+            else:
+                row_list = [json.loads(line) for line in chunk]
+                column_dict = {p: numpy.array([row[name_list[p]] for row in row_list], dtype=float)
+                               for p in position_list}
+            yield OrderedDict((v, column_dict[p]) for v, p in position_dict.items())
@@ -0,0 +1,254 @@
+import os
+import pickle
+import hashlib
+from tempfile import NamedTemporaryFile
+from zipfile import BadZipFile
+from .calculator import (Variable, Number, SerialVariable, VariableInSerial, Sum,
+                         Formula, PiecewiseFormula, ConditionFormula, TrailSolver)
+
+__all__ = ['CalcCache', 'calculator_key']
+
+# bump it when the evaluation of expressions or the stored state changes.
+MEMO_VERSION = 2
+
+# an eviction removes entries down to this share of max_size, so the
+# directory is scanned once in a while, not at every put.
+EVICT_RATIO = 0.8
+
+
+# hash the structure of the calculator and the values of its inputs. the
+# formulas are taken in the order calc evaluates them and the variables are
+# numbered by their first appearance. the value of a variable is left out
+# once a formula has assigned it, an output read before that, as with
+# sequence=False, is an input. so are left out the variables in skip, which
+# come as arrays of a run.
+class _KeyHasher:
+    def __init__(self, calculator, skip=()):
+        self._hash = hashlib.sha256(f'{MEMO_VERSION}:{type(calculator).__name__}'.encode('utf-8'))
+        self.number_dict = dict()
+        self.assigned_set = set()
+        self.skip_set = {id(variable) for variable in skip}
+        self.update('sequence', calculator.sequence)
+        for formula in (calculator.formula_list[::-1] if calculator.sequence else calculator.formula_list):
+            self.formula(formula)
+        if isinstance(calculator, TrailSolver):
+            self.expression(calculator.unknown_variable)
+
+    def update(self, *values):
+        self._hash.update(repr(values).encode('utf-8'))
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+    def formula(self, formula):
+        self.update(type(formula).__name__, formula.long if isinstance(formula, Formula) else None)
+        self.variable(formula.variable, read=False)
+        if isinstance(formula, PiecewiseFormula):
+            for expression, condition, long in zip(formula.expression_list, formula.condition_list,
+                                                   formula.long_list):
+                self.update('branch', long)
+                self.expression(expression)
+                self.expression(condition)
+        else:
+            self.expression(formula.expression)
+        if isinstance(formula, ConditionFormula):
+            self.expression(formula.condition)
+        self.assigned_set.add(id(formula.variable))
+
+    def expression(self, expression):
+        if expression is None:
+            self.update(None)
+        elif isinstance(expression, Number):
+            self.update('number', expression.value, expression.precision)
+        elif isinstance(expression, SerialVariable):
+            self.variable(expression)
+            self.update('serial', len(expression))
+            for item in expression:
+                self.expression(item)
+        elif isinstance(expression, Variable):
+            self.variable(expression)
+        else:
+            self.update(type(expression).__name__)
+            self.expression(expression.left)
+            self.expression(expression.right)
+            if isinstance(expression, Sum):
+                for serial in expression.serial_variable_list:
+                    self.expression(serial)
+
+    def variable(self, variable, read=True):
+        number = self.number_dict.setdefault(id(variable), len(self.number_dict))
+        self.update('variable', type(variable).__name__, variable.symbol, variable.subscript,
+                    variable.index if isinstance(variable, VariableInSerial) else None,
+                    number)
+        if read and id(variable) not in self.assigned_set and id(variable) not in self.skip_set:
+            self.value(variable.value)
+
+    def value(self, value):
+        if hasattr(value, 'tobytes'):
+            self.update('array', value.dtype.str, value.shape)
+            self._hash.update(memoryview(value).cast('B') if value.flags.c_contiguous
+                              else value.tobytes())
+        else:
+            self.update(value)
+
+
+# skip holds the variables whose values are not inputs, as the unknown of
+# a solver.
+def calculator_key(calculator, *extra, inputs=None, skip=()):
+    hasher = _KeyHasher(calculator, list(skip) + ([] if inputs is None else list(inputs.keys())))
+    hasher.update('extra', *extra)
+    if inputs is not None:
+        for variable, values in inputs.items():
+            hasher.update('input', hasher.number_dict.get(id(variable)), f'{variable}')
+            hasher.value(values)
+    return hasher.hexdigest()
+
+
+def _file_size(path):
+    try:
+        return os.stat(path).st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _branch(formula):
+    for i, expression in enumerate(formula.expression_list):
+        if expression is formula.expression:
+            return i
+    return -1
+
+
+# persistent memo of calculator results in a directory, keyed by the hash
+# of the calculator and its inputs. a hit puts the values of every formula
+# variable, and the branches of piecewise formulas, back as they were
+# computed, so Procedure renders them alike. the least recently used
+# entries are evicted when the directory is over max_size bytes, by the
+# size of the directory kept as the entries are put. the directory may be
+# shared by processes, whose entries come and go meanwhile.
+class CalcCache:
+    def __init__(self, directory, max_size=None):
+        self.directory = directory
+        self.max_size = max_size
+        self.size = None
+        self.hits = self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key, ext):
+        return os.path.join(self.directory, key + ext)
+
+    def _state(self, calculator):
+        return ([formula.variable.value for formula in calculator.formula_list],
+                [_branch(f) if isinstance(f, PiecewiseFormula) else None for f in calculator.formula_list])
+
+    def _set_state(self, calculator, state):
+        value_list, branch_list = state
+        for formula, value, branch in zip(calculator.formula_list, value_list, branch_list):
+            formula.variable.value = value
+            if branch is not None:
+                formula.set_branch(branch)
+
+    def _get(self, key, ext, load):
+        path = self._path(key, ext)
+        try:
+            with open(path, 'rb') as f:
+                ret = load(f)
+        # an entry which can not be read, broken or of another format, is
+        # a miss
+        except (OSError, pickle.UnpicklingError, AttributeError, EOFError, ValueError,
+                KeyError, BadZipFile):
+            self.misses += 1
+            return None
+        # the time of use for eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return ret
+
+    def _put(self, key, ext, dump):
+        # write to a temporary file first, a broken run never leaves
+        # a half written entry behind.
+        with NamedTemporaryFile('wb', dir=self.directory, suffix='.tmp', delete=False) as f:
+            dump(f)
+        path = self._path(key, ext)
+        if self.max_size is not None and self.size is not None:
+            self.size += os.stat(f.name).st_size - _file_size(path)
+        os.replace(f.name, path)
+        if self.max_size is not None and (self.size is None or self.size > self.max_size):
+            self.evict()
+
+    # remove the least recently used entries down to EVICT_RATIO of
+    # max_size, if the directory is over it. entries removed by other
+    # processes meanwhile are passed over.
+    def evict(self):
+        if self.max_size is None:
+            return
+        entry_list = list()
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                try:
+                    entry_list.append((entry.stat(), entry.path))
+                except FileNotFoundError:
+                    pass
+        self.size = sum(stat.st_size for stat, _ in entry_list)
+        if self.size <= self.max_size:
+            return
+        entry_list.sort(key=lambda e: e[0].st_mtime)
+        for stat, path in entry_list:
+            if self.size <= self.max_size * EVICT_RATIO:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.size -= stat.st_size
+
+    # calculator.calc() through the cache
+    def calc(self, calculator):
+        key = calculator_key(calculator, 'calc')
+        state = self._get(key, '.pickle', pickle.load)
+        if state is None:
+            calculator.calc()
+            state = self._state(calculator)
+            self._put(key, '.pickle', lambda f: pickle.dump(state, f, pickle.HIGHEST_PROTOCOL))
+        else:
+            self._set_state(calculator, state)
+        return calculator.formula_list[0].variable.value
+
+    # solver.solve() through the cache, the unknown gets its value as well
+    def solve(self, solver, target_value, **kwargs):
+        key = calculator_key(solver, 'solve', target_value, sorted(kwargs.items()),
+                             skip=[solver.unknown_variable])
+        stored = self._get(key, '.pickle', pickle.load)
+        if stored is None:
+            ret = solver.solve(target_value, **kwargs)
+            stored = (ret, solver.unknown_variable.value, self._state(solver))
+            self._put(key, '.pickle', lambda f: pickle.dump(stored, f, pickle.HIGHEST_PROTOCOL))
+            return ret
+        ret, solver.unknown_variable.value, state = stored
+        self._set_state(solver, state)
+        return ret
+
+    # calculator.run(inputs) through the cache, stored as a npz shard
+    def run(self, calculator, inputs):
+        import numpy
+        from .cases import result_from_state
+
+        key = calculator_key(calculator, 'run', inputs=inputs)
+
+        def load(f):
+            with numpy.load(f) as data:
+                column_list = [data[f'column{i}'] for i in range(int(data['column_count']))]
+                branch_list = [data[f'branch{i}'] for i in range(int(data['branch_count']))]
+                return result_from_state(calculator, inputs, (column_list, branch_list, data['index']))
+
+        result = self._get(key, '.npz', load)
+        if result is None:
+            result = calculator.run(inputs)
+            column_list, branch_list, index = result.get_state()
+            arrays = {f'column{i}': column for i, column in enumerate(column_list)}
+            arrays.update({f'branch{i}': branch for i, branch in enumerate(branch_list)})
+            self._put(key, '.npz', lambda f: numpy.savez(f, index=index, column_count=len(column_list),
+                                                         branch_count=len(branch_list), **arrays))
+        return result
@@ -0,0 +1,197 @@
+import re
+from contextlib import ExitStack
+from xml.etree.ElementTree import fromstring
+from xml.parsers.expat import ParserCreate
+from zipfile import ZipFile
+from .docx import DocX, FigureFile
+from .fields import reset_references
+from .fragment import Fragment, PAGE_BREAK_HOLDER
+
+__all__ = ['read_fragment', 'merge_docx', 'add_merge_command']
+
+_PAGE_BREAK = '<w:p><w:r><w:br w:type="page" /></w:r></w:p>'
+
+_CATALOG_HEAD = ('<w:p><w:pPr><w:jc w:val="center" /></w:pPr>'
+                 '<w:r><w:rPr><w:b /><w:sz w:val="32" /></w:rPr><w:t>目录</w:t></w:r></w:p>')
+
+_IMAGE_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/image'
+
+_RELATIONSHIP = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+
+_IMAGE_TARGET = re.compile(r'media/image(?P<image_id>\d+)\.\w+')
+
+
+class _Child:
+    def __init__(self, start, tag, attrs):
+        self.start = start
+        self.end = None
+        self.tag = tag
+        self.attrs = attrs
+        # a table of the cover floats on the page
+        self.floating = False
+        # the catalog ends with a paragraph holding its section
+        self.section = False
+        # a heading is a paragraph of style 1 to 3 led by its bookmark,
+        # the content is the byte range between the bookmark and its end
+        self.level = None
+        self.mark = None
+        self.content = None
+        self.count = 0
+
+
+# the children of an element at depth of the xml, with their ranges of
+# bytes. the xml is parsed by expat as it is read, the offsets are taken
+# from the parser, so the text of the report is never searched and the
+# children are copied byte by byte.
+class _ChildScanner:
+    def __init__(self, depth):
+        self.depth = depth
+        self.level = 0
+        self.child_list = list()
+        self.parser = ParserCreate()
+        self.parser.StartElementHandler = self.start
+        self.parser.EndElementHandler = self.end
+
+    def scan(self, file):
+        self.parser.ParseFile(file)
+        return self.child_list
+
+    def start(self, tag, attrs):
+        self.level += 1
+        index = self.parser.CurrentByteIndex
+        if self.level == self.depth:
+            if self.child_list:
+                self.child_list[-1].end = index
+            self.child_list.append(_Child(index, tag, attrs))
+        elif self.level > self.depth and self.child_list:
+            self.inner(self.child_list[-1], self.level - self.depth, tag, attrs, index)
+
+    def end(self, tag):
+        if self.level == self.depth - 1 and self.child_list and self.child_list[-1].end is None:
+            self.child_list[-1].end = self.parser.CurrentByteIndex
+        elif self.level == self.depth + 1 and self.child_list:
+            child = self.child_list[-1]
+            if tag == 'w:bookmarkStart' and child.mark is not None and child.content is None:
+                child.content = [self.parser.CurrentByteIndex, None]
+        self.level -= 1
+
+    def inner(self, child, level, tag, attrs, index):
+        if level == 1:
+            child.count += 1
+            if tag == 'w:bookmarkStart' and child.count == 2 and child.level is not None:
+                child.mark = int(attrs['w:id'])
+            elif (tag == 'w:bookmarkEnd' and child.content is not None and child.content[1] is None
+                  and int(attrs['w:id']) == child.mark):
+                child.content[1] = index
+        elif level == 2:
+            if tag == 'w:tblpPr' and child.tag == 'w:tbl':
+                child.floating = True
+            elif tag == 'w:sectPr' and child.tag == 'w:p':
+                child.section = True
+            elif tag == 'w:pStyle' and child.tag == 'w:p' and child.count == 1 \
+                    and attrs.get('w:val') in ('1', '2', '3'):
+                child.level = int(attrs['w:val'])
+
+
+# the bytes of the children read one after another from the file
+def _read_children(file, child_list):
+    position = 0
+    for child in child_list:
+        file.read(child.start - position)
+        yield child, file.read(child.end - child.start)
+        position = child.end
+
+
+# read a docx saved by pyreporter back as a fragment, as the body of the
+# report without cover, catalog and section, which add_fragment of DocX
+# numbers again. the images stay in the zip file, which has to be open
+# until the merged document is saved.
+def read_fragment(zip_: ZipFile) -> Fragment:
+    with zip_.open('word/document.xml') as f:
+        # document, body and its children
+        child_list = _ChildScanner(3).scan(f)
+    if child_list and child_list[-1].tag == 'w:sectPr':
+        child_list.pop()
+
+    piece_list = list()
+    catalog = list()
+    heading_1 = False
+    with zip_.open('word/document.xml') as f:
+        children = _read_children(f, child_list)
+        child, data = next(children, (None, None))
+        # the cover is made of floating tables, followed by a page break
+        if child is not None and child.floating:
+            while child is not None and child.floating:
+                child, data = next(children, (None, None))
+            if data is not None and data.decode('utf-8') == _PAGE_BREAK:
+                child, data = next(children, (None, None))
+        # the catalog ends with the section of its own
+        if data is not None and data.decode('utf-8') == _CATALOG_HEAD:
+            while child is not None and not child.section:
+                child, data = next(children, (None, None))
+            child, data = next(children, (None, None))
+
+        while child is not None:
+            # the first level 1 heading of a report has no page break before
+            # it, which the merged document needs unless it comes first.
+            if child.level == 1 and not heading_1:
+                heading_1 = True
+                if not piece_list or piece_list[-1] != _PAGE_BREAK:
+                    piece_list.append(PAGE_BREAK_HOLDER)
+            piece_list.append(reset_references(data.decode('utf-8')))
+            if child.content is not None and child.content[1] is not None:
+                begin, end = (i - child.start for i in child.content)
+                catalog.append((child.level, child.mark, reset_references(data[begin:end].decode('utf-8'))))
+            child, data = next(children, (None, None))
+
+    with zip_.open('word/footnotes.xml') as f:
+        # footnotes and the footnote, separators have a type
+        footnote_list = [c for c in _ChildScanner(2).scan(f) if c.tag == 'w:footnote' and 'w:type' not in c.attrs]
+    with zip_.open('word/footnotes.xml') as f:
+        footnotes = ''.join(reset_references(data.decode('utf-8'))
+                            for _, data in _read_children(f, footnote_list))
+
+    figures = list()
+    for rel in fromstring(zip_.read('word/_rels/document.xml.rels')).iter(_RELATIONSHIP):
+        match = _IMAGE_TARGET.fullmatch(rel.get('Target'))
+        if rel.get('Type') == _IMAGE_TYPE and match:
+            path = f'word/{rel.get("Target")}'
+            figures.append((int(rel.get('Id')[3:]), int(match['image_id']), FigureFile(path, zip_.open(path))))
+
+    return Fragment(''.join(piece_list), footnotes, catalog, figures)
+
+
+# merge the docx files saved by pyreporter into one document, with a new
+# catalog, and the cover and header given. the documents are read one by
+# one, the bodies are parsed for their structure and copied as they are,
+# never rendered again. documents saved in compact mode are merged with
+# DocX(compact=True) as the writer.
+# output is a path or a file object, the docx is returned as bytes when
+# it is None.
+def merge_docx(path_list, output=None, cover=None, header=None, writer=None):
+    writer = DocX() if writer is None else writer
+    if cover is not None:
+        writer.set_cover(cover)
+    if header is not None:
+        writer.visit_header(header)
+
+    with ExitStack() as stack:
+        for path in path_list:
+            zip_ = stack.enter_context(ZipFile(path))
+            writer.add_fragment(read_fragment(zip_))
+        return writer.save(output)
+
+
+# the merge command of python -m pyreporter, added to its sub parsers
+def add_merge_command(sub):
+    merge = sub.add_parser('merge', help='merge generated reports into one document')
+    merge.add_argument('output', help='the merged docx')
+    merge.add_argument('inputs', nargs='+', help='docx files saved by pyreporter, in order')
+    merge.add_argument('--header', default=None, help='text of the page header')
+    merge.set_defaults(run=_run_merge)
+
+
+def _run_merge(args):
+    merge_docx(args.inputs, args.output, header=args.header)
+    print(f'{len(args.inputs)} documents merged into {args.output}')
+    return 0
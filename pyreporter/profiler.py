@@ -0,0 +1,139 @@
+import os
+import sys
+import time
+import atexit
+from collections import namedtuple
+from contextlib import nullcontext
+
+__all__ = ['Phase', 'Profiler', 'phase', 'active_profiler']
+
+# seconds are the wall time spent in the phase, inclusive of the phases
+# nested in it, count is how many times it was entered.
+Phase = namedtuple('Phase', ['name', 'seconds', 'count'])
+
+_NULL_CONTEXT = nullcontext()
+_active = None
+
+
+# the profiler recording the phases now, None when profiling is off
+def active_profiler():
+    return _active
+
+
+# the hot paths are wrapped in phase(name), which costs a call and a check
+# when profiling is off.
+def phase(name):
+    if _active is None:
+        return _NULL_CONTEXT
+    return _active.phase(name)
+
+
+class _PhaseContext:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        # a phase entered again inside itself, as calc in a solver, is
+        # counted once
+        self.outer = self.name not in self.profiler.open_set
+        if self.outer:
+            self.profiler.open_set.add(self.name)
+            self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        if self.outer:
+            profiler = self.profiler
+            profiler.seconds_dict[self.name] = (profiler.seconds_dict.get(self.name, 0)
+                                                + time.perf_counter() - self.start)
+            profiler.count_dict[self.name] = profiler.count_dict.get(self.name, 0) + 1
+            profiler.open_set.discard(self.name)
+
+
+# wall time by phase: calc, the construction of Procedure, Note and
+# Definition, the render of the elements by type, and of the writers:
+# serialize, write parts (compressed and written to the zip) and write
+# figures. with cprofile, the functions are profiled as well, for dump as
+# pstats.
+# used as a context manager around the code of a report, or given to
+# Report.save for the save alone. started again while it runs, as given to
+# save inside its own with, it goes on and stops with the outer stop.
+class Profiler:
+    def __init__(self, cprofile=False):
+        self.seconds_dict = dict()
+        self.count_dict = dict()
+        self.open_set = set()
+        self.outer = None
+        self.depth = 0
+        if cprofile:
+            import cProfile
+            self.cprofile = cProfile.Profile()
+        else:
+            self.cprofile = None
+
+    def phase(self, name):
+        return _PhaseContext(self, name)
+
+    def start(self):
+        global _active
+        self.depth += 1
+        if self.depth > 1:
+            return
+        self.outer, _active = _active, self
+        self.start_time = time.perf_counter()
+        if self.cprofile is not None:
+            self.cprofile.enable()
+
+    def stop(self):
+        global _active
+        self.depth -= 1
+        if self.depth > 0:
+            return
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        self.seconds_dict['total'] = (self.seconds_dict.get('total', 0)
+                                      + time.perf_counter() - self.start_time)
+        self.count_dict['total'] = self.count_dict.get('total', 0) + 1
+        _active, self.outer = self.outer, None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # the phases from the longest
+    def summary(self):
+        return sorted((Phase(name, seconds, self.count_dict[name])
+                       for name, seconds in self.seconds_dict.items()),
+                      key=lambda p: p.seconds, reverse=True)
+
+    def format_summary(self):
+        line_list = [f'{"phase":<32} {"seconds":>10} {"count":>8}']
+        for p in self.summary():
+            line_list.append(f'{p.name:<32} {p.seconds:>10.4f} {p.count:>8}')
+        return '\n'.join(line_list)
+
+    # write the pstats of cprofile to path
+    def dump(self, path):
+        assert self.cprofile is not None, 'the profiler has no cprofile'
+        self.cprofile.dump_stats(path)
+
+
+# PYREPORTER_PROFILE=1 profiles the whole run and prints the summary at
+# exit, a path as PYREPORTER_PROFILE=run.prof dumps the pstats there too.
+def _profile_from_environment(value):
+    profiler = Profiler(cprofile=value != '1')
+    profiler.start()
+
+    def report():
+        profiler.stop()
+        print(profiler.format_summary(), file=sys.stderr)
+        if value != '1':
+            profiler.dump(value)
+    atexit.register(report)
+
+
+if os.environ.get('PYREPORTER_PROFILE'):
+    _profile_from_environment(os.environ['PYREPORTER_PROFILE'])
@@ -1,13 +1,17 @@
-from .docx import DocX
-from PIL import Image
-from io import BytesIO
+from .docx import DocX, COPY_CHUNK_SIZE
+from .profiler import Profiler, phase, active_profiler
+from tempfile import TemporaryFile
+from shutil import copyfileobj
 from typing import Union, List
 from collections import OrderedDict
+from itertools import islice, chain
+import os
+import sys
 from .calculator import Variable
 
 
 __all__ = ['Report', 'DefaultCover',
-           'Block', 'StandaloneFigure', 'StandaloneMath', 'Paragraph',
+           'Block', 'Stream', 'StandaloneFigure', 'StandaloneMath', 'Paragraph',
            'Definition', 'Procedure', 'Note', 'VariableValue',
            'Figure', 'Math', 'Content']
 
@@ -18,6 +22,10 @@ class Report:
         self.header = None
         self.block = Block()
         self.writer = DocX()
+        self.cache = None
+        self.processes = 1
+        self.volume_limit = None
+        self.sheet_list = list()
 
         self.symbol_set = set()
 
@@ -28,22 +36,175 @@ class Report:
         elif isinstance(item, Block):
             item.remove_duplicate_note(self.symbol_set)
 
+    # the elements of the iterable, as a generator making a case at a time,
+    # are taken only while the writer visits the body on save, so with a
+    # streaming writer every case is made, rendered and dropped in turn.
+    # notes of the stream drop the variables noted by the report at save.
+    def add_stream(self, iterable):
+        self.block.add(Stream(iterable, self.symbol_set))
+
     def set_writer(self, writer):
         self.writer = writer
 
     def set_cover(self, cover):
         self.cover = cover
 
+    # chapters whose content is unchanged since the last save are spliced
+    # from the rendered xml kept in the directory instead of rendered again.
+    def set_cache(self, directory):
+        from .cache import RenderCache
+        self.cache = None if directory is None else RenderCache(directory)
+
+    # render the chapters in a pool of processes, None for all the cores,
+    # 1 for rendering in this process.
+    def set_processes(self, processes=None):
+        self.processes = processes
+
     def set_header(self, header: str):
         self.header = _Header(header)
 
-    def save(self, path):
-        if self.cover is not None:
-            self.writer.set_cover(self.cover)
+    # split the document into volumes at the level 1 headings when it is
+    # over the pages, estimated from the elements, or the bytes of
+    # document.xml. every volume has the cover, a catalog of its own, and
+    # the chapters numbered on from the last volume.
+    def set_volume_limit(self, pages=None, size=None):
+        self.volume_limit = None if pages is None and size is None else (pages, size)
+
+    # with a volume limit, the list of the volumes saved is returned: the
+    # paths, path itself for a report within the limit or path-1.docx,
+    # path-2.docx and so on, or the documents as bytes when path is None.
+    # without it, the document is returned as bytes when path is None.
+    # profile is a Profiler, which records the phases of the save, True to
+    # print the summary of them to stderr, or a path to dump the pstats of
+    # the save to as well, see profiler.py.
+    def save(self, path=None, profile=None):
+        if not profile:
+            return self._save(path)
+        profiler = profile if isinstance(profile, Profiler) else Profiler(cprofile=profile is not True)
+        with profiler:
+            ret = self._save(path)
+        if not isinstance(profile, Profiler):
+            print(profiler.format_summary(), file=sys.stderr)
+            if profile is not True:
+                profiler.dump(profile)
+        return ret
+
+    def _save(self, path):
+        if self.volume_limit is not None:
+            ret = self._save_volumes(path)
+        else:
+            self._set_cover_and_header(self.writer, self.cover)
+            # writers without fragments, as ReportBuilder, render in one pass
+            if self.cache is None and self.processes == 1 or not hasattr(self.writer, 'new_fragment_writer'):
+                self._visit_block()
+            else:
+                self._visit_chapters()
+            ret = self.writer.save(path)
+        # the companion workbook is written next to the document
+        if len(self.sheet_list) > 0 and isinstance(path, (str, os.PathLike)):
+            self.save_sheets(os.path.splitext(path)[0] + '.xlsx')
+        return ret
+
+    def _set_cover_and_header(self, writer, cover):
+        if cover is not None:
+            writer.set_cover(cover)
         if self.header is not None:
-            self.header.visit(self.writer)
-        self.block.visit(self.writer)
-        self.writer.save(path)
+            self.header.visit(writer)
+
+    # the render is timed by element type when profiling
+    def _visit_block(self):
+        if active_profiler() is None:
+            self.block.visit(self.writer)
+            return
+        for element in iter_elements(self.block._element_list):
+            with phase(f'render {type(element).__name__}'):
+                element.visit(self.writer)
+
+    def _visit_chapters(self):
+        for chapter, marks, fragment in self._iter_chapters():
+            self.writer.add_fragment(fragment, marks.defined, marks.external)
+
+    # the chapters are rendered as fragments one after another, in the pool
+    # of processes a few ahead, or taken from the cache if set, so only the
+    # chapters on their way are held.
+    def _iter_chapters(self):
+        from .cache import ContentHasher
+        from .fragment import MarkCollector, render_fragment, iter_fragments_parallel
+
+        seed = self.writer.cache_seed()
+        hit_set = set()
+
+        def marked():
+            for chapter in split_chapters(self.block._element_list):
+                # content hash is only needed by the cache
+                marks = MarkCollector() if self.cache is None else ContentHasher(seed)
+                for element in chapter:
+                    element.visit(marks)
+                fragment = None if self.cache is None else self.cache.get(marks.hexdigest())
+                if fragment is not None:
+                    hit_set.add(id(marks))
+                yield chapter, marks, fragment
+
+        if self.processes == 1:
+            rendered = ((chapter, marks, render_fragment(self.writer, chapter, marks) if fragment is None
+                         else fragment) for chapter, marks, fragment in marked())
+        else:
+            rendered = iter_fragments_parallel(self.writer, marked(), self.processes)
+        while True:
+            with phase('render chapters'):
+                item = next(rendered, None)
+            if item is None:
+                return
+            chapter, marks, fragment = item
+            if self.cache is not None and id(marks) not in hit_set:
+                self.cache.put(marks.hexdigest(), fragment)
+            hit_set.discard(id(marks))
+            yield item
+
+    # the chapters are rendered one by one, and a volume is saved as soon as
+    # the next chapter would take it over the limit, so only the volume being
+    # written is held. the references to the volumes saved after them are
+    # resolved at last, writing the volumes holding them again.
+    def _save_volumes(self, path):
+        from .volume import PageCounter, VolumeSplitter, resolve_volume
+
+        assert hasattr(self.writer, 'new_volume_writer'), 'the writer can not split volumes'
+        assert path is None or isinstance(path, (str, os.PathLike)), 'volumes are saved to paths or as bytes'
+        pages, size = self.volume_limit
+        splitter = VolumeSplitter(pages, size)
+        saved_list = list()  # (path or bytes, field resolver)
+        writer = self.writer
+        if self.header is not None:
+            self.header.visit(writer)
+        for chapter, marks, fragment in self._iter_chapters():
+            counter = PageCounter()
+            if pages is not None:
+                for element in chapter:
+                    element.visit(counter)
+            if splitter.add(counter.pages, len(fragment.body.encode('utf-8'))):
+                next_writer = writer.new_volume_writer()
+                saved_list.append(self._save_volume(writer, path, len(saved_list) + 1, False))
+                writer = next_writer
+                if self.header is not None:
+                    self.header.visit(writer)
+            writer.add_fragment(fragment, marks.defined, marks.external)
+        saved_list.append(self._save_volume(writer, path, len(saved_list) + 1, len(saved_list) == 0))
+
+        with phase('resolve volumes'):
+            return [resolve_volume(target, resolver) if resolver.unresolved else target
+                    for target, resolver in saved_list]
+
+    def _save_volume(self, writer, path, number, alone):
+        cover = self.cover
+        if not alone and hasattr(cover, 'for_volume'):
+            cover = cover.for_volume(number)
+        if cover is not None:
+            writer.set_cover(cover)
+        if path is not None and not alone:
+            root, ext = os.path.splitext(path)
+            path = f'{root}-{number}{ext}'
+        data = writer.save(path)
+        return (data if path is None else path), writer.field_resolver
 
     def add_heading(self, heading, level: int):
         self.add(Heading(heading, level))
@@ -59,11 +220,110 @@ class Report:
         self.add(fig)
         return fig.reference
 
-    def add_table(self, content_by_rows, title=None):
-        tab = Table(content_by_rows, title)
+    def add_table(self, content_by_rows, title=None, header_rows=0, split_rows=None):
+        tab = Table(content_by_rows, title, header_rows=header_rows, split_rows=split_rows)
         self.add(tab)
         return tab.reference
 
+    def add_data_table(self, data, header=None, formats=None, title=None, split_rows=None, sheet=None):
+        tab = DataTable(data, header=header, formats=formats, title=title, split_rows=split_rows)
+        self.add(tab)
+        if sheet is not None:
+            # the rows are read by both of them
+            tab.keep_rows()
+            self.add_sheet(sheet, tab.data, header)
+        return tab.reference
+
+    # all the cases of the calculator evaluated in one vectorized pass, see
+    # Calculator.run. cases maps input variables to their values by case,
+    # or is the result of a run. a summary table of the columns, the inputs
+    # and the result by default, is followed by the procedures of the cases
+    # in detail: 'all', 'governing' for the case of the largest key, the
+    # result by default, an int for as many cases in descending order of
+    # the key, or None. the procedures are made while the report is saved.
+    def add_cases(self, calculator, cases, summary_columns=None, detail='all', key=None,
+                  names=None, title=None, formats=None, heading_level=None):
+        import numpy
+        from .cases import CaseResult, variable_label
+
+        result = cases if isinstance(cases, CaseResult) else calculator.run(cases)
+        size = len(result)
+        if summary_columns is None:
+            summary_columns = result.input_list + [calculator.formula_list[0].variable]
+        if formats is None:
+            formats = [f'.{v.precision}f' if isinstance(v.precision, int) else '.4g' for v in summary_columns]
+        elif isinstance(formats, str) or callable(formats):
+            formats = [formats] * len(summary_columns)
+        header = ['工况'] + [variable_label(v) for v in summary_columns]
+        if names is None:
+            data = numpy.column_stack([numpy.arange(1, size + 1)] + [result[v] for v in summary_columns])
+            formats = ['.0f'] + list(formats)
+        else:
+            assert len(names) == size
+            data = list(zip(names, *[result[v].tolist() for v in summary_columns]))
+            formats = [None] + list(formats)
+        self.add_data_table(data, header=header, formats=formats, title=title)
+
+        key = calculator.formula_list[0].variable if key is None else key
+        if detail == 'all':
+            index_list = range(size)
+        elif detail == 'governing':
+            index_list = result.order(key, 1).tolist()
+        elif detail:
+            index_list = result.order(key, detail).tolist()
+        else:
+            index_list = []
+
+        def procedures():
+            with result.keep_values():
+                for index in index_list:
+                    name = f'{index + 1}' if names is None else f'{names[index]}'
+                    result.restore(index)
+                    if heading_level is None:
+                        yield Paragraph(name)
+                    else:
+                        yield Heading(name, heading_level)
+                    yield Procedure(calculator)
+        self.add_stream(procedures())
+        return result
+
+    # sheets go to the companion workbook instead of the document, for
+    # results too large to be read in a table.
+    # data is a 2-d numpy array, an iterable of rows or a mapping of column
+    # name to column, which makes the header when it is not given.
+    def add_sheet(self, name, data, header=None):
+        if header is None and hasattr(data, 'keys'):
+            header = list(data.keys())
+        self.sheet_list.append((name, data, header))
+
+    def save_sheets(self, path=None):
+        from .xlsx import save_xlsx
+        return save_xlsx(path, self.sheet_list)
+
+
+# chapters are split at the level 1 headings, the elements before the
+# first level 1 heading make the first chapter.
+# streams and the rows of data tables are taken as the chapters are split.
+def split_chapters(element_list):
+    chapter = list()
+    for element in iter_elements(element_list):
+        if isinstance(element, DataTable):
+            element.keep_rows()
+        if isinstance(element, Heading) and element.level == 1 and len(chapter) > 0:
+            yield chapter
+            chapter = list()
+        chapter.append(element)
+    if len(chapter) > 0:
+        yield chapter
+
+
+def iter_elements(element_list):
+    for element in element_list:
+        if isinstance(element, Stream):
+            yield from iter_elements(element)
+        else:
+            yield element
+
 
 class ReportElement:
     def visit(self, visitor):
@@ -76,13 +336,16 @@ class Block:
         for item in items:
             self.add(item)
 
+    # the notes of streams drop the variables when they are taken
     def remove_duplicate_note(self, symbol_set):
         for item in self._element_list:
             if isinstance(item, Note):
                 item.remove_duplicate_note(symbol_set)
+            elif isinstance(item, Stream):
+                item.symbol_set = symbol_set
 
     def add(self, element):
-        assert isinstance(element, ContextRoot)
+        assert isinstance(element, (ContextRoot, Block))
         if isinstance(element, Block):
             self._element_list.extend(element._element_list)
         else:
@@ -102,11 +365,19 @@ class Block:
         self.add(fig)
         return fig.reference
 
-    def add_table(self, content_by_rows, title=None):
-        tab = Table(content_by_rows, title)
+    def add_table(self, content_by_rows, title=None, header_rows=0, split_rows=None):
+        tab = Table(content_by_rows, title, header_rows=header_rows, split_rows=split_rows)
         self.add(tab)
         return tab.reference
 
+    def add_data_table(self, data, header=None, formats=None, title=None, split_rows=None):
+        tab = DataTable(data, header=header, formats=formats, title=title, split_rows=split_rows)
+        self.add(tab)
+        return tab.reference
+
+    def add_stream(self, iterable):
+        self.add(Stream(iterable))
+
     def visit(self, visitor):
         for element in self._element_list:
             element.visit(visitor)
@@ -122,6 +393,30 @@ class ContextRoot:
         pass
 
 
+# elements taken from an iterable when visited, once only, since a
+# generator is empty the second time.
+class Stream(ContextRoot):
+    def __init__(self, iterable, symbol_set=None):
+        self.iterable = iterable
+        self.symbol_set = symbol_set
+
+    def __iter__(self):
+        assert self.iterable is not None, 'the stream is taken already'
+        iterable, self.iterable = self.iterable, None
+        for element in iterable:
+            if self.symbol_set is not None and isinstance(element, (Note, Block)):
+                element.remove_duplicate_note(self.symbol_set)
+            if isinstance(element, Block):
+                yield from element._element_list
+            else:
+                assert isinstance(element, ContextRoot)
+                yield element
+
+    def visit(self, visitor):
+        for element in self:
+            element.visit(visitor)
+
+
 class Composite:
     def __init__(self, *items):
         self.list_ = list()
@@ -232,11 +527,12 @@ class Bookmark(ContentRoot):
 
 
 class Reference(ContentRoot):
-    def __init__(self, bookmark: Bookmark):
+    def __init__(self, bookmark: Bookmark, brackets=True):
         self.bookmark = bookmark
+        self.brackets = brackets
 
     def visit(self, visitor):
-        return visitor.visit_reference(self.bookmark)
+        return visitor.visit_reference(self.bookmark, brackets=self.brackets)
 
 
 class Footnote(ContentRoot):
@@ -301,7 +597,8 @@ class StandaloneMath(ContextRoot):
 class Definition(ContextRoot):
     def __init__(self, formula_or_calculator):
         self.content = Composite()
-        formula_or_calculator.visit(self)
+        with phase('build Definition'):
+            formula_or_calculator.visit(self)
 
         self.bookmark = Bookmark('式', left='(', right=')')
         self.reference = self.bookmark.reference
@@ -338,7 +635,8 @@ class Definition(ContextRoot):
 class Procedure(ContextRoot):
     def __init__(self, formula_or_calculator):
         self.content = Composite()
-        formula_or_calculator.visit(self)
+        with phase('build Procedure'):
+            formula_or_calculator.visit(self)
 
     def visit(self, visitor):
         visitor.visit_math_procedure(content=self.content)
@@ -422,7 +720,8 @@ class Note(ContextRoot):
     def __init__(self, formula_or_calculator):
         self._list = list()
         self.variable_dict = OrderedDict()
-        formula_or_calculator.visit(self)
+        with phase('build Note'):
+            formula_or_calculator.visit(self)
 
     def remove_duplicate_note(self, var_set):
         ret = list()
@@ -472,6 +771,8 @@ class StandaloneFigure(ContextRoot):
         if title is not None:
             mark = Bookmark('图')
             self.reference = mark.reference
+            if isinstance(title, str):
+                title = Text(title)
             title = Composite(mark, title)
             for item in title:
                 assert isinstance(item, ContentRoot)
@@ -483,16 +784,21 @@ class StandaloneFigure(ContextRoot):
         width = self.figure.width
         height = self.figure.height
         title = self.title
-        visitor.visit_inline_figure(figure=figure,
-                                    format_=format_,
-                                    width=width,
-                                    height=height,
-                                    title=title)
+        visitor.visit_figure(figure=figure,
+                             format_=format_,
+                             width=width,
+                             height=height,
+                             title=title)
 
 
+# header_rows leading rows are repeated on every page by word.
+# with split_rows, the rows after the header are written as tables of at
+# most split_rows rows each, which repeat the header rows and get a
+# continued caption.
 class Table(ContextRoot):
     def __init__(self, content_by_rows: List[List[ContentRoot]],
-                 title: Union[str, ContentRoot] = None):
+                 title: Union[str, ContentRoot] = None,
+                 header_rows=0, split_rows=None):
         self.content_by_rows = list()
         for r in content_by_rows:
             row = list()
@@ -505,20 +811,148 @@ class Table(ContextRoot):
                 row.append(c)
             self.content_by_rows.append(row)
 
-        self.reference = None
-        if title is not None:
-            mark = Bookmark('表')
-            self.reference = mark.reference
-            if isinstance(title, str):
-                title = Text(title)
-            title = Composite(mark, title)
-            for item in title:
-                assert isinstance(item, ContentRoot)
-        self.title = title
+        assert 0 <= header_rows <= len(self.content_by_rows)
+        assert split_rows is None or split_rows > 0
+        self.header_rows = header_rows
+        self.split_rows = split_rows
+        self.title, self.continued_title, self.reference = _make_table_title(title)
+
+    def visit(self, visitor):
+        header = self.content_by_rows[:self.header_rows]
+        body = self.content_by_rows[self.header_rows:]
+        split_rows = self.split_rows or max(len(body), 1)
+
+        title = self.title
+        for start in range(0, max(len(body), 1), split_rows):
+            visitor.visit_table(content_by_rows=header + body[start:start + split_rows],
+                                title=title,
+                                header_rows=self.header_rows)
+            title = self.continued_title
+
+
+# the continued caption refers to the bookmark of the title, as 续表1-1.
+def _make_table_title(title):
+    if title is None:
+        return None, None, None
+    mark = Bookmark('表')
+    if isinstance(title, str):
+        title = Text(title)
+    title = Composite(mark, title)
+    for item in title:
+        assert isinstance(item, ContentRoot)
+    continued_title = Composite(Text('续'), Reference(mark, brackets=False))
+    return title, continued_title, mark.reference
+
+
+# data table takes the cells as plain values, a 2-d numpy array or an
+# iterable of rows, and formats them by column when the report is written.
+# formats is one spec for every column or a spec per column, a spec is a
+# format spec string like '.3f', a callable, or None for str().
+# rows are formatted chunk by chunk and streamed to the writer without
+# building a Text for every cell. the header row is repeated on every page,
+# and split_rows works as in Table.
+# data is a 2-d numpy array, a sequence of rows, or an iterator of rows
+# which is taken once, as the report is saved, and never held whole.
+class DataTable(ContextRoot):
+    chunk_size = 1024
+
+    def __init__(self, data, header=None, formats=None,
+                 title: Union[str, ContentRoot] = None, split_rows=None):
+        self.one_shot = not hasattr(data, '__len__')
+        if hasattr(data, 'ndim') and hasattr(data, 'tolist'):
+            assert data.ndim == 2
+            column_count = data.shape[1]
+        elif header is not None:
+            column_count = len(header)
+        elif self.one_shot:
+            # only the first row is taken for the count of columns
+            data = iter(data)
+            first = next(data, None)
+            assert first is not None, 'an empty data table needs a header'
+            column_count = len(first)
+            data = chain((first,), data)
+        else:
+            assert len(data) > 0, 'an empty data table needs a header'
+            column_count = len(data[0])
+        self.data = data
+        self.column_count = column_count
+        assert column_count > 0
+
+        if header is not None:
+            header = [f'{h}' for h in header]
+            assert len(header) == column_count
+        self.header = header
+
+        if formats is None or isinstance(formats, str) or callable(formats):
+            formats = [formats] * column_count
+        assert len(formats) == column_count
+        self.formats = formats
+
+        assert split_rows is None or split_rows > 0
+        self.split_rows = split_rows
+        self.title, self.continued_title, self.reference = _make_table_title(title)
+
+    # the rows of an iterator are kept, for a table visited more than once
+    # as the chapters of the cache and the processes are.
+    def keep_rows(self):
+        if self.one_shot:
+            self.data = list(self.data)
+            self.one_shot = False
+
+    def _column_chunks(self):
+        if self.one_shot:
+            assert self.data is not None, 'the rows of the data table are taken already'
+            rows, self.data = self.data, None
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if len(chunk) == 0:
+                    return
+                yield list(zip(*chunk))
+
+        data = self.data
+        for start in range(0, len(data), self.chunk_size):
+            chunk = data[start:start + self.chunk_size]
+            if hasattr(chunk, 'tolist'):
+                # one call converts the numbers of a whole column
+                yield chunk.T.tolist()
+            else:
+                yield list(zip(*chunk))
+
+    def rows(self):
+        formatter_list = [_make_formatter(spec) for spec in self.formats]
+        for column_list in self._column_chunks():
+            yield from zip(*[list(map(formatter, column))
+                             for formatter, column in zip(formatter_list, column_list)])
 
     def visit(self, visitor):
-        visitor.visit_table(content_by_rows=self.content_by_rows,
-                            title=self.title)
+        rows = self.rows()
+        if self.split_rows is None:
+            visitor.visit_data_table(header=self.header,
+                                     rows=rows,
+                                     column_count=self.column_count,
+                                     title=self.title)
+            return
+
+        # only one chunk of the formatted rows is kept at a time
+        title = self.title
+        chunk = list(islice(rows, self.split_rows))
+        while True:
+            visitor.visit_data_table(header=self.header,
+                                     rows=chunk,
+                                     column_count=self.column_count,
+                                     title=title)
+            chunk = list(islice(rows, self.split_rows))
+            if len(chunk) == 0:
+                break
+            title = self.continued_title
+
+
+def _make_formatter(spec):
+    if spec is None:
+        return str
+    if callable(spec):
+        return spec
+    return lambda value: format(value, spec)
 
 
 class DefaultCover(ReportElement):
@@ -535,6 +969,11 @@ class DefaultCover(ReportElement):
         self.secret = secret
         self.footer_str = footer_str
 
+    # the cover of a volume, with the number after the name
+    def for_volume(self, number):
+        return DefaultCover(self.project, f'{self.name}（第{number}册）', self.part, self.phase,
+                            self.number, self.secret, self.footer_str)
+
     def visit(self, visitor):
         visitor.visit_cover(project=self.project, name=self.name,
                             part=self.part, phase=self.phase,
@@ -551,18 +990,36 @@ class _Header(ReportElement):
 
 
 class _FigureContent:
-    def __init__(self, file, height=None):
-        image = Image.open(file)
+    # formats which can be embedded into the docx package as they are.
+    # the image file is kept on disk and only copied into the archive
+    # when the report is saved, so no image data stays in memory.
+    EMBEDDABLE_FORMAT = {'PNG': 'png', 'JPEG': 'jpeg', 'GIF': 'gif',
+                         'BMP': 'bmp', 'TIFF': 'tiff'}
 
-        size = image.size
-        dpi = image.info['dpi']
-
-        self.width, self.height = [s / d for s, d in zip(size, dpi)]
-        self.format_ = 'png'
-
-        b = BytesIO()
-        image.save(b, self.format_)
-        self.figure = b.getvalue()
+    def __init__(self, file, height=None):
+        # PIL is only imported by the reports with figures
+        from PIL import Image
+        if not isinstance(file, (bytes, str, os.PathLike)):
+            # the file object of the caller may be closed before the save,
+            # it is copied to a temporary file chunk by chunk.
+            file.seek(0)
+            copy = TemporaryFile()
+            copyfileobj(file, copy, COPY_CHUNK_SIZE)
+            copy.seek(0)
+            file = copy
+        with Image.open(file) as image:
+            size = image.size
+            dpi = image.info.get('dpi', (96, 96))
+
+            self.width, self.height = [s / d for s, d in zip(size, dpi)]
+
+            if image.format in self.EMBEDDABLE_FORMAT:
+                self.format_ = self.EMBEDDABLE_FORMAT[image.format]
+                self.figure = file
+            else:
+                self.format_ = 'png'
+                self.figure = TemporaryFile()
+                image.save(self.figure, self.format_)
 
         if height is not None:
             height /= 25.4
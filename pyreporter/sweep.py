@@ -0,0 +1,258 @@
+import os
+import time
+import queue
+import pickle
+import threading
+from tempfile import NamedTemporaryFile
+import numpy
+from .cases import run_cases
+from .loader import iter_inputs, variable_names, column_names, match_columns
+
+__all__ = ['NpyWriter', 'CsvWriter', 'open_writer', 'run_sweep']
+
+_MAGIC = b'\x93NUMPY\x01\x00'
+
+
+# the npy header for count rows of dtype, padded to size bytes. the first
+# header is given the room of the largest count, so the final one fits in
+# its place.
+def _npy_header(dtype, count, size=None):
+    header = repr({'descr': numpy.lib.format.dtype_to_descr(dtype),
+                   'fortran_order': False,
+                   'shape': (count,)})
+    if size is None:
+        size = (len(_MAGIC) + 2 + len(header) + 20 + 1 + 63) // 64 * 64
+    length = size - len(_MAGIC) - 2
+    assert len(header) < length < 65536
+    return _MAGIC + length.to_bytes(2, 'little') + (header.ljust(length - 1) + '\n').encode('latin1')
+
+
+# rows of the columns appended to a npy file of a structured array, one
+# field per column. the count of rows in the header is written on close.
+# with resume, the (offset, count) of a checkpoint, the file is cut back to
+# the offset and appended to, keeping its header.
+class NpyWriter:
+    def __init__(self, path, name_list=None, dtype_list=None, resume=None):
+        if resume is None:
+            self.dtype = numpy.dtype(list(zip(name_list, dtype_list)))
+            self.count = 0
+            self.file = open(path, 'wb')
+            self.header_size = len(_npy_header(self.dtype, 0))
+            self.file.write(_npy_header(self.dtype, 0))
+        else:
+            offset, self.count = resume
+            self.file = open(path, 'r+b')
+            numpy.lib.format.read_magic(self.file)
+            self.dtype = numpy.lib.format.read_array_header_1_0(self.file)[2]
+            self.header_size = self.file.tell()
+            self.file.truncate(offset)
+            self.file.seek(offset)
+
+    def write(self, column_list):
+        rows = numpy.empty(len(column_list[0]), dtype=self.dtype)
+        for name, column in zip(self.dtype.names, column_list):
+            rows[name] = column
+        self.file.write(rows.tobytes())
+        self.count += len(rows)
+
+    # the offset of the rows written so far, flushed to the disk
+    def tell(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def close(self):
+        self.file.seek(0)
+        self.file.write(_npy_header(self.dtype, self.count, self.header_size))
+        self.file.close()
+
+
+# rows of the columns appended to a csv file with the names as the header,
+# floats in the shortest form that reads back the same. resume works as in
+# NpyWriter.
+class CsvWriter:
+    def __init__(self, path, name_list=None, dtype_list=None, resume=None):
+        if resume is None:
+            self.count = 0
+            self.file = open(path, 'w', newline='', encoding='utf-8')
+            self.file.write(','.join(name_list) + '\n')
+        else:
+            offset, self.count = resume
+            self.file = open(path, 'r+', newline='', encoding='utf-8')
+            self.file.truncate(offset)
+            self.file.seek(offset)
+
+    def write(self, column_list):
+        column_list = [c.astype(int) if c.dtype == bool else c for c in column_list]
+        rows = zip(*[c.tolist() for c in column_list])
+        self.file.write(''.join(','.join(map(repr, row)) + '\n' for row in rows))
+        self.count += len(column_list[0])
+
+    def tell(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+def open_writer(path, name_list=None, dtype_list=None, resume=None):
+    ext = os.path.splitext(os.fspath(path))[1].lower()
+    writer_class = {'.npy': NpyWriter, '.csv': CsvWriter}[ext]
+    return writer_class(path, name_list, dtype_list, resume)
+
+
+def _save_checkpoint(path, state):
+    with NamedTemporaryFile('wb', dir=os.path.dirname(os.path.abspath(path)), delete=False) as f:
+        pickle.dump(state, f, pickle.HIGHEST_PROTOCOL)
+    os.replace(f.name, path)
+
+
+# a checkpoint waiting in the queue of the writer, saved once the rows
+# before it are on the disk
+class _Checkpoint:
+    def __init__(self, path, state):
+        self.path = path
+        self.state = state
+
+
+_DONE = object()
+
+
+class _Failed:
+    def __init__(self, error):
+        self.error = error
+
+
+# put the items of the iterable into the queue from a thread, the queue
+# holds a few of them only, so the thread waits for the consumer. it stops
+# early when stop is set.
+def _produce(iterable, queue_, stop):
+    try:
+        for item in iterable:
+            if stop.is_set():
+                return
+            queue_.put(item)
+        queue_.put(_DONE)
+    except BaseException as e:
+        queue_.put(_Failed(e))
+
+
+def _consume(queue_, function, error_list):
+    while True:
+        item = queue_.get()
+        if item is _DONE:
+            return
+        if error_list:
+            # drain the queue for the producer to finish
+            continue
+        try:
+            function(item)
+        except BaseException as e:
+            error_list.append(e)
+
+
+# evaluate the calculator over the cases of a file too large for the
+# memory, chunk_size cases at a time. the next chunk is read in a thread
+# and the results of the last one written in another while a chunk is
+# computed, with queue_size chunks at most waiting between them, so the
+# memory is set by the chunk size. the output columns, all the inputs and
+# formula variables by default, are appended to output, a npy or csv file,
+# and the reducers are fed every chunk. the count of cases is returned.
+# with a checkpoint file, the count of cases done, the length of output and
+# the states of the reducers are saved every checkpoint_interval seconds,
+# and a sweep started again goes on from the last checkpoint. the file is
+# removed when the sweep is done.
+def run_sweep(calculator, path, variable_list, output=None, columns=None,
+              output_columns=None, reducer_list=(), chunk_size=65536, queue_size=2,
+              checkpoint=None, checkpoint_interval=60):
+    start = 0
+    writer = None
+    if checkpoint is not None and os.path.exists(checkpoint):
+        with open(checkpoint, 'rb') as f:
+            state = pickle.load(f)
+        assert state['input'] == os.path.abspath(path), f'{checkpoint} is the checkpoint of another sweep'
+        start = state['count']
+        input_list = list(match_columns(column_names(path), variable_list, columns).keys())
+        for reducer, reducer_state in zip(reducer_list, state['reducers']):
+            reducer.set_state(reducer_state, calculator, input_list)
+        if state['output'] is not None:
+            writer = open_writer(output, resume=state['output'])
+
+    input_queue = queue.Queue(queue_size)
+    stop = threading.Event()
+    reader = threading.Thread(target=_produce,
+                              args=(iter_inputs(path, variable_list, chunk_size, columns, start),
+                                    input_queue, stop),
+                              daemon=True)
+    reader.start()
+
+    output_queue = queue.Queue(queue_size)
+    error_list = list()
+    writer_thread = None
+    last_checkpoint = time.monotonic()
+    try:
+        while True:
+            item = input_queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failed):
+                raise item.error
+            if error_list:
+                raise error_list[0]
+            result = run_cases(calculator, item, start)
+            start += len(result)
+            for reducer in reducer_list:
+                reducer.update(result)
+
+            if output is not None:
+                output_list = result.variable_list if output_columns is None else output_columns
+                column_list = [result[v] for v in output_list]
+                if writer is None:
+                    name_list = [variable_names(v)[0] for v in output_list]
+                    assert len(set(name_list)) == len(name_list), 'output columns of the same name'
+                    writer = open_writer(output, name_list, [c.dtype for c in column_list])
+                if writer_thread is None:
+                    writer_thread = threading.Thread(target=_consume,
+                                                     args=(output_queue, _write_to(writer), error_list),
+                                                     daemon=True)
+                    writer_thread.start()
+                output_queue.put(column_list)
+
+            if checkpoint is not None and time.monotonic() - last_checkpoint >= checkpoint_interval:
+                last_checkpoint = time.monotonic()
+                state = {'input': os.path.abspath(path), 'count': start, 'output': None,
+                         'reducers': [reducer.get_state() for reducer in reducer_list]}
+                if writer_thread is None:
+                    _save_checkpoint(checkpoint, state)
+                else:
+                    output_queue.put(_Checkpoint(checkpoint, state))
+    finally:
+        if writer_thread is not None:
+            output_queue.put(_DONE)
+            writer_thread.join()
+        if writer is not None:
+            writer.close()
+        # let the reader stop when the run stops early
+        stop.set()
+        while reader.is_alive():
+            try:
+                input_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+    if error_list:
+        raise error_list[0]
+    if checkpoint is not None and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    return start
+
+
+def _write_to(writer):
+    def write(item):
+        if isinstance(item, _Checkpoint):
+            item.state['output'] = (writer.tell(), writer.count)
+            _save_checkpoint(item.path, item.state)
+        else:
+            writer.write(item)
+    return write
@@ -0,0 +1,129 @@
+import json
+from zipfile import ZipFile
+from ..reporter import Report
+from ..batch import load_manifest, run_batch, main
+
+
+def make_report(title):
+    rep = Report()
+    rep.add_heading(title, 1)
+    return rep
+
+
+def broken_report():
+    raise ValueError('no report')
+
+
+SCRIPT = '''
+from pyreporter import Report
+rep = Report()
+rep.add_heading(params['title'], 1)
+rep.save(__import__('sys').argv[1])
+'''
+
+
+def write_manifest(tmp_path):
+    (tmp_path / 'script.py').write_text(SCRIPT, encoding='utf-8')
+    manifest = tmp_path / 'jobs.json'
+    manifest.write_text(json.dumps({'jobs': [
+        {'factory': 'pyreporter.test.test_batch:make_report',
+         'params': {'title': 'from factory'}, 'output': 'factory.docx'},
+        {'script': 'script.py', 'params': {'title': 'from script'}, 'argv': ['script.docx']},
+        {'name': 'broken', 'factory': 'pyreporter.test.test_batch:broken_report', 'output': 'x.docx'},
+    ]}), encoding='utf-8')
+    return manifest
+
+
+def test_run_batch(tmp_path):
+    job_list = load_manifest(write_manifest(tmp_path))
+    result_dict = {r.name: r for r in run_batch(job_list, processes=2)}
+
+    assert result_dict['factory.docx'].error is None
+    assert result_dict['script.py'].error is None
+    assert 'no report' in result_dict['broken'].error
+    for name, title in [('factory.docx', 'from factory'), ('script.docx', 'from script')]:
+        with ZipFile(tmp_path / name) as z:
+            assert title in z.read('word/document.xml').decode('utf-8')
+
+
+def test_main_reports_failure(tmp_path, capsys):
+    assert main(['batch', str(write_manifest(tmp_path)), '-j', '1']) == 1
+    out = capsys.readouterr()
+    assert '2/3 jobs done' in out.out
+    assert 'broken failed' in out.err
+
+
+def test_batch_resume_from_checkpoint(tmp_path, capsys):
+    manifest = write_manifest(tmp_path)
+    checkpoint = tmp_path / 'jobs.done'
+    assert main(['batch', str(manifest), '-j', '1', '--checkpoint', str(checkpoint)]) == 1
+    (tmp_path / 'factory.docx').unlink()
+    capsys.readouterr()
+
+    assert main(['batch', str(manifest), '-j', '1', '--checkpoint', str(checkpoint)]) == 1
+    out = capsys.readouterr().out
+    assert '2 jobs done before, skipped' in out
+    assert 'broken' in out and 'factory.docx' not in out
+    assert not (tmp_path / 'factory.docx').exists()
+
+
+def test_script_exit_code(tmp_path):
+    from ..batch import Job, run_job
+
+    result_list = list()
+    for code in ['', '0', 'None', '2']:
+        script = tmp_path / 'exit.py'
+        script.write_text(f'import sys\nsys.exit({code})\n', encoding='utf-8')
+        result_list.append(run_job(Job('exit', str(script), None, dict(), None, list(), str(tmp_path))))
+    assert [r.error is None for r in result_list] == [True, True, True, False]
+
+
+# jobs of one script are told apart by their number, names given twice are
+# refused.
+def test_manifest_names_are_unique(tmp_path):
+    import pytest
+
+    (tmp_path / 'script.py').write_text(SCRIPT, encoding='utf-8')
+    manifest = tmp_path / 'jobs.json'
+    manifest.write_text(json.dumps([
+        {'script': 'script.py', 'params': {'title': 'one'}, 'argv': ['one.docx']},
+        {'script': 'script.py', 'params': {'title': 'two'}, 'argv': ['two.docx']},
+        {'name': 'three', 'script': 'script.py', 'argv': ['three.docx']},
+    ]), encoding='utf-8')
+    assert [job.name for job in load_manifest(manifest)] == ['script.py#1', 'script.py#2', 'three']
+
+    manifest.write_text(json.dumps([
+        {'name': 'same', 'script': 'script.py'},
+        {'name': 'same', 'script': 'script.py'},
+    ]), encoding='utf-8')
+    with pytest.raises(AssertionError, match='same'):
+        load_manifest(manifest)
+
+
+# jobs of one script are checked off one by one, and a job whose params
+# changed is run again.
+def test_checkpoint_of_jobs_sharing_a_script(tmp_path, capsys):
+    (tmp_path / 'script.py').write_text(SCRIPT, encoding='utf-8')
+    manifest = tmp_path / 'jobs.json'
+    checkpoint = tmp_path / 'jobs.done'
+
+    def run(title_list):
+        manifest.write_text(json.dumps([{'script': 'script.py', 'params': {'title': title},
+                                         'argv': [f'out/{i}.docx']}
+                                        for i, title in enumerate(title_list)]), encoding='utf-8')
+        capsys.readouterr()
+        code = main(['batch', str(manifest), '-j', '1', '--checkpoint', str(checkpoint)])
+        return code, capsys.readouterr().out
+
+    # the output directory is missing, every job fails
+    assert run(['a', 'b', 'c'])[0] == 1
+    (tmp_path / 'out').mkdir()
+    assert run(['a', 'b', 'c'])[0] == 0
+    assert len(checkpoint.read_text(encoding='utf-8').splitlines()) == 3
+
+    (tmp_path / 'out' / '1.docx').unlink()
+    code, out = run(['a', 'changed', 'c'])
+    assert code == 0 and '2 jobs done before, skipped' in out
+    assert 'script.py#2' in out and 'script.py#1' not in out
+    with ZipFile(tmp_path / 'out' / '1.docx') as z:
+        assert 'changed' in z.read('word/document.xml').decode('utf-8')
@@ -23,4 +23,109 @@ def test_variable_list():
     v2 = V('v2')
     v3 = V('v3')
     exp = v1 + v2 + v3
-    assert exp.get_variable_dict() == [v1, v2, v3]
\ No newline at end of file
+    assert exp.get_variable_dict() == [v1, v2, v3]
+
+
+def make_piecewise_calculator():
+    from ..calculator import Calculator, Formula, PiecewiseFormula, Radical, Sin
+    a = V('a', value=1.0)
+    b = V('b', inform='result')
+    c = V('c')
+    calc = Calculator()
+    calc.add(Formula(b, Radical(c, 2) + Sin(a)))
+    calc.add(PiecewiseFormula(c, [a * 2, a * 3], [a < 2, a >= 2]))
+    return calc, a, b, c
+
+
+# a vectorized run gives what the cases computed one by one give, and
+# restores a case with the branch taken by it.
+def test_run_match_scalar_calc():
+    calc, a, b, c = make_piecewise_calculator()
+    values = [0.5, 1.5, 2.5, 4.0]
+    result = calc.run({a: values})
+    assert a.value == 1.0 and b.value is None
+
+    for i, value in enumerate(values):
+        a.set(value)
+        calc.calc()
+        expected = (b.value, c.value, calc.formula_list[1].expression)
+        a.set(1.0)
+        result.restore(i)
+        assert a.value == value
+        assert (b.value, c.value, calc.formula_list[1].expression) == expected
+    assert result.order(b, 2).tolist() == [2, 1]
+
+
+# the reducers fed chunk by chunk keep what a run over all the cases gives
+def test_reducers_over_chunks():
+    import numpy
+    from ..cases import iter_chunks, Top, Maximum, Minimum, Histogram
+
+    calc, a, b, c = make_piecewise_calculator()
+    values = numpy.linspace(0.1, 10, 1000)
+    result = calc.run({a: values})
+    bins = [-1, 0, 2, 4]
+    reducer_list = [Maximum(b), Minimum(b), Top(b, 5), Histogram(b, bins)]
+    calc.reduce(iter_chunks({a: values}, 64), reducer_list)
+    maximum, minimum, top, histogram = reducer_list
+
+    assert maximum.value == result[b].max() and maximum.index[0] == result[b].argmax()
+    assert minimum.value == result[b].min() and minimum.index[0] == result[b].argmin()
+    assert top.index.tolist() == result.order(b, 5).tolist()
+    assert histogram.counts.tolist() == numpy.histogram(result[b], bins)[0].tolist()
+    assert histogram.outside == 1000 - histogram.counts.sum()
+
+    maximum.restore()
+    assert a.value == values[result[b].argmax()]
+    assert calc.formula_list[1].expression is calc.formula_list[1].expression_list[1]
+
+
+# the columns written by save read back with the labels of the variables
+def test_result_files(tmp_path):
+    from ..calculator import Unit, Calculator, Formula
+    from ..cases import load_results
+
+    a = V('a', inform='span', unit=Unit('m'))
+    q = V('q', 'k', unit=Unit('kN') / Unit('m') ** 2)
+    r = V('r', inform='result', unit=Unit('kN'))
+    calc = Calculator()
+    calc.add(Formula(r, a * a * q))
+    result = calc.run({a: [1.0, 2.0, 3.0], q: [4.0, 5.0, 6.5]})
+
+    ext_list = ['arrow', 'npz', 'csv', 'npy']
+    try:
+        import pyarrow
+    except ImportError:
+        ext_list.remove('arrow')
+    for ext in ext_list:
+        path = tmp_path / f'result.{ext}'
+        result.save(path)
+        column_dict, meta_list = load_results(path)
+        assert list(column_dict.keys()) == ['case', 'a', 'q-k', 'r']
+        assert column_dict['case'].tolist() == [0, 1, 2]
+        assert column_dict['r'].tolist() == [4.0, 20.0, 58.5]
+        if ext in ('arrow', 'npz'):
+            assert [m['unit'] for m in meta_list] == ['m', 'kN/m^2', 'kN']
+            assert meta_list[2]['inform'] == 'result' and meta_list[1]['subscript'] == 'k'
+
+
+# compound units keep their grouping, and a variable named case does not
+# take the column of the case numbers
+def test_unit_text_and_case_column(tmp_path):
+    from ..calculator import Unit, Calculator, Formula
+    from ..cases import unit_text, load_results
+
+    kN, m, s = Unit('kN'), Unit('m'), Unit('s')
+    assert unit_text(kN / (m * s)) == 'kN/(m·s)'
+    assert unit_text((kN / m) ** 2) == '(kN/m)^2'
+    assert unit_text(kN * m / s ** 2) == 'kN·m/s^2'
+
+    case = V('case')
+    r = V('r')
+    calc = Calculator()
+    calc.add(Formula(r, case * 2))
+    calc.run({case: [5.0, 6.0]}).save(tmp_path / 'result.npz')
+    column_dict, meta_list = load_results(tmp_path / 'result.npz')
+    assert column_dict['case'].tolist() == [0, 1]
+    assert column_dict['case#2'].tolist() == [5.0, 6.0]
+    assert [m['name'] for m in meta_list] == ['case#2', 'r']
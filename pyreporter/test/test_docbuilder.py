@@ -0,0 +1,36 @@
+from io import BytesIO
+from zipfile import ZipFile
+from ..docbuilder import ReportBuilder
+from .test_report import make_png, make_report, read_parts
+
+
+def test_builder_match_docx(tmp_path):
+    png = tmp_path / 'fig.png'
+    make_png(png)
+    direct = read_parts(BytesIO(make_report(png).save()))
+
+    rep = make_report(png)
+    rep.set_writer(ReportBuilder())
+    assert read_parts(BytesIO(rep.save())) == direct
+
+
+def test_builder_methods():
+    builder = ReportBuilder()
+    builder.set_header('header')
+    builder.heading(1, 'first')
+    para = builder.paragraph('see ')
+    mark = para.bookmark('式', left='(', right=')')
+    para.reference(mark)
+    para.footnote('note')
+    builder.heading(1, 'second')
+    builder.table([['a', 'b'], ['1', '2']], title='cases', header_rows=1)
+
+    with ZipFile(BytesIO(builder.save())) as z:
+        xml = z.read('word/document.xml').decode('utf-8')
+        footnotes = z.read('word/footnotes.xml').decode('utf-8')
+        assert 'word/header1.xml' in z.namelist()
+
+    assert xml.count('<w:br w:type="page" />') == 1
+    assert xml.count('<w:tblHeader />') == 1
+    assert '<w:t>式1</w:t></w:r><w:r><w:noBreakHyphen /></w:r><w:r><w:t>1</w:t>' in xml
+    assert '<w:r><w:t>note</w:t></w:r>' in footnotes
@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+# the directory holding the pyreporter package
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+IMPORT_CHECK = '''
+import sys
+import pyreporter
+from pyreporter.docx import read_part
+LAZY_LIST = ['PIL', 'pyreporter.docbuilder', 'pyreporter.textdocx', 'pyreporter.xlsx',
+             'pyreporter.cache', 'pyreporter.volume']
+assert [name for name in LAZY_LIST if name in sys.modules] == []
+assert read_part.cache_info().currsize == 0
+
+rep = pyreporter.Report()
+rep.add_heading('no figure', 1)
+rep.save()
+assert [name for name in LAZY_LIST if name in sys.modules] == []
+assert read_part.cache_info().currsize > 0
+assert pyreporter.ReportBuilder.__module__ == 'pyreporter.docbuilder'
+'''
+
+
+# PIL, the static parts, the writers other than DocX and the modules of
+# the cache, volumes and workbooks are left until a figure is made, a
+# report is saved or they are used, so the batch workers import the
+# package quickly.
+def test_import_is_lazy():
+    subprocess.run([sys.executable, '-c', IMPORT_CHECK], cwd=ROOT, check=True)
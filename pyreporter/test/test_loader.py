@@ -0,0 +1,50 @@
+import json
+import numpy
+from ..calculator import Variable, SerialVariable, Calculator, Formula, Sum
+from ..loader import load_inputs
+
+
+def make_calculator():
+    a = Variable('a', inform='first')
+    q = Variable('q', 'k')
+    l = SerialVariable('l')
+    r = Variable('r')
+    calc = Calculator()
+    calc.add(Formula(r, a * q + Sum(l, [l])))
+    return calc, a, q, l, r
+
+
+# the columns are found by the names of the variables in every format, and
+# the arrays of npy and npz are mapped instead of read.
+def test_load_inputs(tmp_path):
+    size = 50
+    first = numpy.linspace(0, 1, size)
+    second = numpy.arange(size, dtype=float)
+    expected = first * second + (second + 1) + (second + 2)
+
+    with open(tmp_path / 'cases.csv', 'w', encoding='utf-8') as f:
+        f.write('first,q_k,other,l[1],l[2]\n')
+        for x, y in zip(first.tolist(), second.tolist()):
+            f.write(f'{x!r},{y!r},text,{y + 1!r},{y + 2!r}\n')
+    with open(tmp_path / 'cases.jsonl', 'w', encoding='utf-8') as f:
+        for x, y in zip(first.tolist(), second.tolist()):
+            f.write(json.dumps({'a': x, 'q-k': y, 'l[1]': y + 1, 'l[2]': y + 2}) + '\n')
+    numpy.savez(tmp_path / 'cases.npz', a=first, q_k=second, **{'l[1]': second + 1, 'l[2]': second + 2})
+    structured = numpy.zeros(size, dtype=[('a', 'f8'), ('q-k', 'f8'), ('l[1]', 'f8'), ('l[2]', 'f8')])
+    structured['a'], structured['q-k'], structured['l[1]'], structured['l[2]'] = first, second, second + 1, second + 2
+    numpy.save(tmp_path / 'cases.npy', structured)
+
+    for name in ['cases.csv', 'cases.jsonl', 'cases.npz', 'cases.npy']:
+        calc, a, q, l, r = make_calculator()
+        inputs = load_inputs(tmp_path / name, [a, q, l])
+        assert len(l) == 2 and list(inputs.keys()) == [a, q, l[0], l[1]]
+        if name.endswith('.npz'):
+            assert all(isinstance(column, numpy.memmap) for column in inputs.values())
+        assert numpy.allclose(calc.run(inputs)[r], expected)
+
+    calc, a, q, l, r = make_calculator()
+    numpy.save(tmp_path / 'plain.npy', numpy.column_stack([first, second, second + 1, second + 2]))
+    l.new()
+    l.new()
+    inputs = load_inputs(tmp_path / 'plain.npy', [a, q, l], columns={a: 0, q: 1, l[0]: 2, l[1]: 3})
+    assert numpy.allclose(calc.run(inputs)[r], expected)
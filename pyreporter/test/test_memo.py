@@ -0,0 +1,144 @@
+from io import BytesIO
+import numpy
+from ..calculator import Variable, Calculator, TrailSolver, Formula, PiecewiseFormula
+from ..memo import CalcCache
+from ..reporter import Report, Procedure
+from .test_report import read_parts
+
+
+def make_calculator():
+    a = Variable('a', value=1.0)
+    b = Variable('b')
+    c = Variable('c')
+    calc = Calculator()
+    calc.add(Formula(b, c * 2 + a))
+    calc.add(PiecewiseFormula(c, [a * 2, a * 3], [a < 2, a >= 2]))
+    return calc, a, b, c
+
+
+def render(calc):
+    rep = Report()
+    rep.add(Procedure(calc))
+    return read_parts(BytesIO(rep.save()))
+
+
+class Counted:
+    def __init__(self, calc):
+        self.count = 0
+        self.calc_ = calc.calc
+
+    def __call__(self):
+        self.count += 1
+        return self.calc_()
+
+
+# a hit puts back what the calculation gives, without calculating, for the
+# same structure and inputs of a calculator made again.
+def test_calc_cache_hit_restores_state(tmp_path):
+    calc, a, b, c = make_calculator()
+    a.set(3.0)
+    cache = CalcCache(tmp_path / 'memo')
+    assert cache.calc(calc) == 21.0
+    expected = render(calc)
+
+    calc, a, b, c = make_calculator()
+    a.set(3.0)
+    calc.calc = counted = Counted(calc)
+    assert CalcCache(tmp_path / 'memo').calc(calc) == 21.0
+    assert counted.count == 0
+    assert (b.value, c.value) == (21.0, 9.0)
+    assert render(calc) == expected
+
+    a.set(1.0)
+    assert cache.calc(calc) == 5.0 and counted.count == 1
+
+
+def test_solve_and_run_cache(tmp_path):
+    x = Variable('x')
+    y = Variable('y')
+    solver = TrailSolver()
+    solver.add(Formula(y, x * x))
+    solver.set_unknown(x)
+    cache = CalcCache(tmp_path / 'memo')
+    root = cache.solve(solver, 2.0, tol=1e-8)
+    x.set(5.0)
+    assert cache.solve(solver, 2.0, tol=1e-8) == root and x.value == root
+    assert cache.hits == 1
+
+    calc, a, b, c = make_calculator()
+    values = numpy.array([0.5, 1.5, 2.5])
+    first = cache.run(calc, {a: values})
+    second = cache.run(calc, {a: values})
+    assert cache.hits == 2
+    assert second.variable_list == first.variable_list
+    assert all(numpy.array_equal(first[v], second[v]) for v in first.variable_list)
+    second.restore(2)
+    assert calc.formula_list[1].expression is calc.formula_list[1].expression_list[1]
+
+
+def test_cache_eviction(tmp_path):
+    cache = CalcCache(tmp_path / 'memo', max_size=1000)
+    calc, a, b, c = make_calculator()
+    for i in range(50):
+        a.set(float(i))
+        cache.calc(calc)
+    assert sum(p.stat().st_size for p in (tmp_path / 'memo').iterdir()) <= 1000
+    # the latest one is kept
+    assert cache.calc(calc) == 49.0 * 7 and cache.hits == 1
+
+
+# without sequence the formulas are evaluated in the order added, an output
+# read before it is assigned is an input of the key.
+def test_calc_cache_key_of_unsequenced_calculator(tmp_path):
+    def make(sequence):
+        a = Variable('a', value=1.0)
+        b = Variable('b', value=0.0)
+        r = Variable('r')
+        calc = Calculator(sequence=sequence)
+        calc.add(Formula(r, b * 2))
+        calc.add(Formula(b, a + 1))
+        return calc
+
+    cache = CalcCache(tmp_path / 'memo')
+    assert cache.calc(make(True)) == 4.0
+    calc = make(False)
+    assert cache.calc(calc) == 0.0
+    # b is 2.0 now, which the next calc reads
+    assert cache.calc(calc) == 4.0
+    assert cache.hits == 0
+    assert cache.calc(make(False)) == 0.0 and cache.hits == 1
+
+
+# entries removed by another process are passed over by the eviction
+def test_cache_eviction_of_removed_entries(tmp_path, monkeypatch):
+    import os
+
+    cache = CalcCache(tmp_path / 'memo', max_size=1000)
+    calc, a, b, c = make_calculator()
+    remove = os.remove
+
+    def remove_twice(path):
+        remove(path)
+        remove(path)
+
+    monkeypatch.setattr(os, 'remove', remove_twice)
+    for i in range(50):
+        a.set(float(i))
+        cache.calc(calc)
+    assert sum(p.stat().st_size for p in (tmp_path / 'memo').iterdir()) <= 1000
+
+
+# a shard which can not be read, broken or of another format, is a miss
+def test_unreadable_shard_is_a_miss(tmp_path):
+    from ..memo import calculator_key
+
+    cache = CalcCache(tmp_path / 'memo')
+    calc, a, b, c = make_calculator()
+    inputs = {a: numpy.array([0.5, 2.5])}
+    path = tmp_path / 'memo' / (calculator_key(calc, 'run', inputs=inputs) + '.npz')
+    for data in [lambda f: numpy.savez(f, index=numpy.arange(2)), lambda f: f.write(b'PK\x03\x04broken')]:
+        with open(path, 'wb') as f:
+            data(f)
+        result = cache.run(calc, inputs)
+        assert result[b].tolist() == [2.5, 17.5]
+    assert cache.hits == 0 and cache.misses == 2
@@ -0,0 +1,68 @@
+from io import BytesIO
+from ..reporter import Report, Footnote, Text
+from ..merge import merge_docx
+from ..batch import main
+from .test_report import make_png, make_report, read_parts
+
+
+def add_second_part(rep, png):
+    rep.add_heading('part two', 1)
+    table = rep.add_table([['x', 'y'], [1, 2]], title='cases')
+    rep.add_paragraph('see ', table, Footnote(Text('note of part two')))
+    rep.add_figure(str(png), title='figure of part two')
+    rep.add_heading('part two.one', 2)
+    return rep
+
+
+# merging the saved documents gives what rendering all of them in one
+# report gives, with the marks, footnotes, images and fields numbered again.
+def test_merge_match_direct_render(tmp_path):
+    png = tmp_path / 'fig.png'
+    make_png(png)
+    make_report(png).save(tmp_path / 'first.docx')
+    add_second_part(Report(), png).save(tmp_path / 'second.docx')
+
+    direct = make_report(png)
+    add_second_part(direct, png)
+    expected = read_parts(BytesIO(direct.save()))
+
+    merged = merge_docx([tmp_path / 'first.docx', tmp_path / 'second.docx'],
+                        cover=direct.cover, header='header')
+    assert read_parts(BytesIO(merged)) == expected
+
+
+def test_merge_command(tmp_path, capsys):
+    png = tmp_path / 'fig.png'
+    make_png(png)
+    for name in ['a', 'b']:
+        add_second_part(Report(), png).save(tmp_path / f'{name}.docx')
+
+    assert main(['merge', str(tmp_path / 'all.docx'), str(tmp_path / 'a.docx'), str(tmp_path / 'b.docx')]) == 0
+    parts = read_parts(tmp_path / 'all.docx')
+    xml = parts['word/document.xml'].decode('utf-8')
+    assert xml.count('<w:br w:type="page" />') == 1
+    assert xml.count('w:anchor="_Mark') == 4
+    assert '<w:t>表2</w:t></w:r><w:r><w:noBreakHyphen /></w:r><w:r><w:t>1</w:t>' in xml
+    assert 'word/media/image2.png' in parts
+
+
+# text of the report looking like the markup of a cover, catalog, heading
+# or footnote is kept as it is.
+def test_merge_keep_text_like_markup(tmp_path):
+    text = ('<w:tblpPr /> 目录 <w:bookmarkStart w:id="1" w:name="_Mark1" /> '
+            'REF _Mark1 \\h id="1" name="image1" <w:footnote w:id="3">')
+
+    def make():
+        rep = Report()
+        rep.add_paragraph(text)
+        rep.add_heading(text, 1)
+        rep.add_paragraph(text, Footnote(Text(text)))
+        return rep
+
+    make().save(tmp_path / 'a.docx')
+    merged = merge_docx([tmp_path / 'a.docx', tmp_path / 'a.docx'])
+
+    direct = make()
+    for element in make().block._element_list:
+        direct.add(element)
+    assert read_parts(BytesIO(merged)) == read_parts(BytesIO(direct.save()))
@@ -0,0 +1,58 @@
+from io import BytesIO
+from ..reporter import Report, Procedure
+from ..calculator import Variable, Calculator, Formula
+from ..profiler import Profiler, active_profiler
+from .test_report import read_parts
+
+
+def make_report():
+    a = Variable('a', value=2)
+    b = Variable('b')
+    calc = Calculator()
+    calc.add(Formula(b, a * 3))
+    calc.calc()
+    rep = Report()
+    rep.add_heading('first', 1)
+    rep.add(Procedure(calc))
+    return rep
+
+
+# the phases of the code and of the save are recorded, and the document is
+# the one saved without profiling.
+def test_profile_phases(tmp_path):
+    expected = read_parts(BytesIO(make_report().save()))
+
+    with Profiler() as profiler:
+        rep = make_report()
+    assert active_profiler() is None
+    name_set = {p.name for p in profiler.summary()}
+    assert {'calc', 'build Procedure', 'total'} <= name_set
+
+    profiler = Profiler(cprofile=True)
+    assert read_parts(BytesIO(rep.save(profile=profiler))) == expected
+    phase_dict = {p.name: p for p in profiler.summary()}
+    assert {'render Heading', 'render Procedure', 'serialize', 'write parts', 'write figures'} <= set(phase_dict)
+    assert phase_dict['render Heading'].count == 1
+    profiler.dump(tmp_path / 'save.prof')
+    assert (tmp_path / 'save.prof').stat().st_size > 0
+
+
+def after_save():
+    pass
+
+
+# a profiler given to save inside its own with goes on after the save, and
+# total is counted once.
+def test_profiler_given_to_save_inside_with():
+    import pstats
+
+    rep = make_report()
+    with Profiler(cprofile=True) as profiler:
+        rep.save(profile=profiler)
+        assert active_profiler() is profiler
+        after_save()
+    assert active_profiler() is None
+    phase_dict = {p.name: p for p in profiler.summary()}
+    assert phase_dict['total'].count == 1 and 'render Heading' in phase_dict
+    stats = pstats.Stats(profiler.cprofile).stats
+    assert any(name == 'after_save' for _, _, name in stats)
@@ -0,0 +1,535 @@
+from io import BytesIO
+from zipfile import ZipFile
+from PIL import Image
+from ..reporter import Report
+from ..docx import DocX
+
+
+def make_png(path, size=(40, 20)):
+    Image.new('RGB', size, 'white').save(path, 'png', dpi=(96, 96))
+
+
+def test_figure_streamed_from_path(tmp_path):
+    png = tmp_path / 'fig.png'
+    make_png(png)
+
+    rep = Report()
+    rep.add_heading('figure', 1)
+    rep.add_figure(str(png), title='fig')
+    rep.save(tmp_path / 'out.docx')
+
+    with ZipFile(tmp_path / 'out.docx') as z:
+        assert z.read('word/media/image1.png') == png.read_bytes()
+
+
+def test_figure_streamed_from_file_object(tmp_path):
+    bmp = tmp_path / 'fig.bmp'
+    Image.new('RGB', (10, 10)).save(bmp, 'bmp')
+
+    rep = Report()
+    with open(bmp, 'rb') as f:
+        rep.add_figure(f, height=10)
+        rep.save(tmp_path / 'out.docx')
+
+    with ZipFile(tmp_path / 'out.docx') as z:
+        assert z.read('word/media/image1.bmp') == bmp.read_bytes()
+
+
+def test_figure_from_file_object_closed_before_save(tmp_path):
+    bmp = tmp_path / 'fig.bmp'
+    Image.new('RGB', (10, 10)).save(bmp, 'bmp')
+
+    rep = Report()
+    with open(bmp, 'rb') as f:
+        rep.add_figure(f, height=10)
+    rep.save(tmp_path / 'out.docx')
+
+    with ZipFile(tmp_path / 'out.docx') as z:
+        assert z.read('word/media/image1.bmp') == bmp.read_bytes()
+
+
+def make_report(png):
+    from ..reporter import DefaultCover, Footnote, Text, Table, Definition, Procedure, Note
+    from ..calculator import Variable, Calculator, Formula, Radical, Sin, Pr
+
+    a = Variable('a', value=2, inform='first', unit=None)
+    b = Variable('b', 'x', value=3, inform='second')
+    c = Variable('c', inform='result')
+    d = Variable('d', inform='large', unit=None)
+    calc = Calculator()
+    calc.add(Formula(c, a * b + a / b))
+    calc.add(Formula(d, Radical(Pr(a + b) ** 2, 2) * Sin(a) * 123456))
+    calc.calc()
+
+    rep = Report()
+    rep.set_cover(DefaultCover())
+    rep.set_header('header')
+    rep.add_paragraph('before any heading ', Text('a < b & "c"', font='楷体', bold=True))
+    rep.add_heading('first', 1)
+    forward_table = Table([['x']], title='forward')
+    rep.add_paragraph('see ', forward_table.reference)
+    definition = Definition(calc)
+    rep.add(definition)
+    rep.add(Note(calc))
+    later_table = rep.add_table([['a', 'b'], [1, 2.5]], title='table')
+    rep.add_heading('second', 1)
+    rep.add_heading('second.one', 2)
+    rep.add_paragraph('see ', definition.reference, Footnote(Text('note')))
+    rep.add_figure(str(png), title='figure')
+    rep.add(Procedure(calc))
+    rep.add_heading('third', 1)
+    rep.add_heading('third.one.one', 3)
+    rep.add_paragraph('see ', later_table, Footnote(Text('another')))
+    rep.add(forward_table)
+    return rep
+
+
+def read_parts(path):
+    with ZipFile(path) as z:
+        return {name: z.read(name) for name in z.namelist()}
+
+
+def test_cached_chapters_match_direct_render(tmp_path):
+    png = tmp_path / 'fig.png'
+    make_png(png)
+
+    make_report(png).save(tmp_path / 'direct.docx')
+
+    for name in ['first.docx', 'second.docx']:
+        rep = make_report(png)
+        rep.set_cache(tmp_path / 'cache')
+        rep.save(tmp_path / name)
+
+    direct = read_parts(tmp_path / 'direct.docx')
+    assert read_parts(tmp_path / 'first.docx') == direct
+    assert read_parts(tmp_path / 'second.docx') == direct
+    assert len(list((tmp_path / 'cache').iterdir())) == 4
+
+
+def test_text_writer_match_element_writer(tmp_path):
+    from ..textdocx import TextDocX
+
+    png = tmp_path / 'fig.png'
+    make_png(png)
+    make_report(png).save(tmp_path / 'direct.docx')
+    direct = read_parts(tmp_path / 'direct.docx')
+
+    for mode in ['direct', 'cache', 'parallel']:
+        rep = make_report(png)
+        rep.set_writer(TextDocX())
+        if mode == 'cache':
+            rep.set_cache(tmp_path / 'cache')
+        elif mode == 'parallel':
+            rep.set_processes(2)
+        assert read_parts(BytesIO(rep.save())) == direct
+
+
+def test_parallel_chapters_match_direct_render(tmp_path):
+    png = tmp_path / 'fig.png'
+    make_png(png)
+
+    make_report(png).save(tmp_path / 'direct.docx')
+
+    rep = make_report(png)
+    rep.set_processes(2)
+    rep.save(tmp_path / 'parallel.docx')
+
+    assert read_parts(tmp_path / 'parallel.docx') == read_parts(tmp_path / 'direct.docx')
+
+
+# text looking like the ids of the xml is left as it is by the renumbering
+# of the chapters.
+def test_parallel_chapters_keep_text_like_ids(tmp_path):
+    def make():
+        rep = Report()
+        for i in range(2):
+            rep.add_heading(f'chapter {i}', 1)
+            rep.add_paragraph('REF _Mark1 \\h and id="3" name="image3" and r:embed="rId2"')
+        return rep
+
+    direct = read_parts(BytesIO(make().save()))
+    rep = make()
+    rep.set_processes(2)
+    parallel = read_parts(BytesIO(rep.save()))
+    assert parallel == direct
+    assert direct['word/document.xml'].count(b'REF _Mark1 \\h and id="3" name="image3"') == 2
+
+
+# a write only stream, like a pipe or a socket
+class Stream:
+    def __init__(self):
+        self.chunks = list()
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def test_save_to_file_object_and_bytes(tmp_path):
+    png = tmp_path / 'fig.png'
+    make_png(png)
+    make_report(png).save(tmp_path / 'direct.docx')
+    direct = read_parts(tmp_path / 'direct.docx')
+
+    data = make_report(png).save()
+    assert read_parts(BytesIO(data)) == direct
+
+    stream = Stream()
+    assert make_report(png).save(stream) is None
+    assert read_parts(BytesIO(b''.join(stream.chunks))) == direct
+
+
+def test_text_writer_math_cache():
+    from ..textdocx import TextDocX
+    from ..reporter import Math
+    from ..calculator import Number, Unit
+
+    def make(writer):
+        rep = Report()
+        rep.set_writer(writer)
+        for value in [1, 1.0, 1, 1.0]:
+            rep.add_paragraph(Math(Number(value), Unit('kN/m³')))
+        return rep
+
+    writer = TextDocX()
+    data = make(writer).save()
+    assert read_parts(BytesIO(data)) == read_parts(BytesIO(make(DocX()).save()))
+    assert len([key for key in writer.run_cache if key[0] == 'number']) == 2
+
+
+def test_text_writer_math_cache_drops_freed_expressions():
+    from ..textdocx import TextDocX
+    from ..calculator import Variable, Number
+
+    a = Variable('a', value=2)
+    number = Number(1.5)
+    writer = TextDocX()
+    writer.visit_inline_math([a, number])
+    assert id(a) in writer.math_cache and id(number) in writer.math_cache
+    del number
+    assert list(writer.math_cache) == [id(a)]
+
+
+def test_compact_mode(tmp_path):
+    from ..textdocx import TextDocX
+
+    png = tmp_path / 'fig.png'
+    make_png(png)
+
+    parts = dict()
+    for name, writer in [('full', DocX()), ('compact', DocX(compact=True)), ('text', TextDocX(compact=True))]:
+        rep = make_report(png)
+        rep.set_writer(writer)
+        parts[name] = read_parts(BytesIO(rep.save()))
+
+    assert parts['compact'] == parts['text']
+    assert b'Cambria Math' not in parts['compact']['word/document.xml']
+    assert b'w:styleId="ac"' in parts['compact']['word/styles.xml']
+    assert len(parts['compact']['word/document.xml']) < len(parts['full']['word/document.xml'])
+    assert DocX(compact=True).cache_seed() != DocX().cache_seed()
+
+
+def test_field_results_computed_at_save(tmp_path):
+    png = tmp_path / 'fig.png'
+    make_png(png)
+    xml = read_parts(BytesIO(make_report(png).save()))['word/document.xml'].decode('utf-8')
+
+    # chapter numbers of the bookmarks: definition, table, figure, forward table
+    assert xml.count('STYLEREF 1 \\s"><w:r><w:t>0<') == 0
+    assert [xml.count(f'STYLEREF 1 \\s"><w:r><w:t>{i}<') for i in [1, 2, 3]] == [2, 1, 1]
+    # the forward reference in the first chapter to the table of the third
+    assert '<w:r><w:t>表3</w:t></w:r><w:r><w:noBreakHyphen /></w:r><w:r><w:t>1</w:t></w:r>' in xml
+    assert '<w:r><w:fldChar w:fldCharType="separate" /></w:r><w:r><w:t>0</w:t></w:r>' \
+           '<w:r><w:fldChar w:fldCharType="end" /></w:r><w:r><w:t>)' not in xml
+
+
+def test_data_table_match_table():
+    import numpy as np
+    from ..textdocx import TextDocX
+
+    data = np.array([[1.0, 2.5, 3.0], [-4.25, 0.125, 6e-7], [7.0, 8.0, 1e10]])
+    header = ['a', 'b<c', 'd']
+
+    def make(writer, data_table, formats=None):
+        rep = Report()
+        rep.set_writer(writer)
+        rep.add_heading('results', 1)
+        if data_table:
+            rep.add_data_table(data, header=header, formats=formats, title='cases')
+        else:
+            cells = [[format(v, formats or '') for v in row] for row in data.tolist()]
+            rep.add_table([header] + cells, title='cases', header_rows=1)
+        return read_parts(BytesIO(rep.save()))
+
+    for writer in [DocX, TextDocX, lambda: DocX(compact=True)]:
+        assert make(writer(), True) == make(writer(), False)
+        assert make(writer(), True, '.3f') == make(writer(), False, '.3f')
+
+    rows = iter([('x', 1.5), ('', 2)])
+    rep = Report()
+    rep.add_data_table(rows, formats=[None, '.2f'])
+    xml = read_parts(BytesIO(rep.save()))['word/document.xml'].decode('utf-8')
+    assert '<w:t>1.50</w:t>' in xml and '<w:t>2.00</w:t>' in xml and '<w:t />' in xml
+
+
+def test_data_table_rows_taken_lazily(tmp_path):
+    import pytest
+    from ..reporter import DataTable
+
+    taken = list()
+
+    def rows():
+        for i in range(3):
+            taken.append(i)
+            yield (i, i * 0.5)
+
+    rep = Report()
+    rep.add_heading('results', 1)
+    rep.add_data_table(rows(), formats=[None, '.2f'])
+    assert taken == [0]
+    direct = read_parts(BytesIO(rep.save()))
+    assert taken == [0, 1, 2]
+    assert '<w:t>1.00</w:t>' in direct['word/document.xml'].decode('utf-8')
+
+    # the cache visits the chapters twice, which keeps the rows
+    rep = Report()
+    rep.add_heading('results', 1)
+    rep.add_data_table(rows(), formats=[None, '.2f'])
+    rep.set_cache(tmp_path / 'cache')
+    assert read_parts(BytesIO(rep.save())) == direct
+
+    rep = Report()
+    rep.add_data_table(iter([]), header=['x', 'y'])
+    assert '<w:t>y</w:t>' in read_parts(BytesIO(rep.save()))['word/document.xml'].decode('utf-8')
+    with pytest.raises(AssertionError, match='needs a header'):
+        DataTable([])
+    with pytest.raises(AssertionError, match='needs a header'):
+        DataTable(iter([]))
+
+
+def test_split_table_repeats_header():
+    import numpy as np
+    from ..textdocx import TextDocX
+
+    data = np.arange(20.0).reshape(10, 2)
+    parts = dict()
+    for name, writer in [('docx', DocX), ('text', TextDocX)]:
+        for kind in ['table', 'data']:
+            rep = Report()
+            rep.set_writer(writer())
+            rep.add_heading('results', 1)
+            if kind == 'table':
+                ref = rep.add_table([['x', 'y']] + data.tolist(), title='cases', header_rows=1, split_rows=4)
+            else:
+                ref = rep.add_data_table(data, header=['x', 'y'], title='cases', split_rows=4)
+            rep.add_paragraph('see ', ref)
+            parts[name, kind] = read_parts(BytesIO(rep.save()))
+
+    assert len(set(map(str, parts.values()))) == 1
+    xml = parts['text', 'data']['word/document.xml'].decode('utf-8')
+    assert xml.count('<w:tbl>') == 3
+    assert xml.count('<w:tblHeader />') == 3
+    assert xml.count('<w:t>续</w:t>') == 2
+    # the continued caption refers to the table without brackets
+    assert xml.count('<w:t>表1</w:t></w:r><w:r><w:noBreakHyphen /></w:r><w:r><w:t>1</w:t></w:r>') == 3
+    assert xml.count('<w:t>(</w:t>') == 1
+
+
+def test_volumes_split_at_chapters(tmp_path):
+    import re
+    from ..reporter import DefaultCover, Table, Footnote, Text
+
+    def make():
+        rep = Report()
+        rep.set_cover(DefaultCover(name='calc'))
+        rep.set_header('header')
+        later = Table([['x']], title='later')
+        rep.add_heading('one', 1)
+        first = rep.add_table([['a']], title='first')
+        rep.add_paragraph('see ', later.reference, ' and ', first, Footnote(Text('note')))
+        rep.add_heading('two', 1)
+        rep.add_heading('two.one', 2)
+        rep.add_paragraph('see ', first)
+        rep.add_heading('three', 1)
+        rep.add(later)
+        return rep
+
+    direct = read_parts(BytesIO(make().save()))
+    rep = make()
+    rep.set_volume_limit(pages=100)
+    data_list = rep.save()
+    assert len(data_list) == 1 and read_parts(BytesIO(data_list[0])) == direct
+    rep = make()
+    rep.set_volume_limit(pages=100)
+    assert rep.save(str(tmp_path / 'one.docx')) == [str(tmp_path / 'one.docx')]
+    assert read_parts(tmp_path / 'one.docx') == direct
+
+    rep = make()
+    rep.set_volume_limit(size=1)
+    path_list = rep.save(str(tmp_path / 'calc.docx'))
+    assert path_list == [str(tmp_path / f'calc-{i}.docx') for i in [1, 2, 3]]
+
+    parts = [read_parts(path) for path in path_list]
+    xml = [p['word/document.xml'].decode('utf-8') for p in parts]
+    assert ['<w:t>calc（第2册）</w:t>' in x for x in xml] == [False, True, False]
+    assert [re.findall(r'w:history="1"><w:r><w:t>([\d.]+)', x) for x in xml] == [['1'], ['2', '2.1'], ['3']]
+    assert '<w:startOverride w:val="3"/>' in parts[2]['word/numbering.xml'].decode('utf-8')
+    # the table of the third volume is referred to from the first as text
+    assert ('<w:t>(</w:t></w:r><w:r><w:t>表3</w:t></w:r><w:r><w:noBreakHyphen /></w:r>'
+            '<w:r><w:t>1</w:t></w:r><w:r><w:t>)</w:t>') in xml[0]
+    assert xml[0].count('>REF _Mark') == 1 and '>REF _Mark' not in xml[1]
+    assert '<w:t>表1</w:t></w:r><w:r><w:noBreakHyphen /></w:r><w:r><w:t>1</w:t>' in xml[1]
+
+
+# a volume is saved before the chapters of the next ones are taken
+def test_volumes_saved_as_chapters_come(tmp_path):
+    from ..reporter import Paragraph, Heading
+
+    seen = list()
+
+    def chapters():
+        for index in range(3):
+            yield Heading(f'chapter {index}', 1)
+            seen.append([(tmp_path / f'calc-{i}.docx').exists() for i in [1, 2, 3]])
+            yield Paragraph(f'chapter {index}')
+
+    rep = Report()
+    rep.add_stream(chapters())
+    rep.set_volume_limit(size=1)
+    rep.save(str(tmp_path / 'calc.docx'))
+    assert seen == [[False, False, False], [False, False, False], [True, False, False]]
+
+
+# the marked elements of a stream are freed once they are rendered, and
+# the notes of a stream added through a block drop the variables noted.
+def test_stream_elements_freed(tmp_path):
+    import gc
+    import weakref
+    from ..reporter import Block, Note, Heading
+    from ..docbuilder import ReportBuilder
+    from ..calculator import Variable, Calculator, Formula
+
+    for writer in [DocX, ReportBuilder]:
+        ref_list = list()
+
+        def headings():
+            for index in range(3):
+                heading = Heading(f'case {index}', 2)
+                ref_list.append(weakref.ref(heading))
+                yield heading
+
+        rep = Report()
+        rep.set_writer(writer())
+        rep.add_heading('cases', 1)
+        rep.add_stream(headings())
+        rep.save(tmp_path / 'out.docx')
+        gc.collect()
+        assert len(ref_list) == 3 and all(ref() is None for ref in ref_list)
+
+    a = Variable('a', value=1, inform='first')
+    b = Variable('b', inform='result')
+    calc = Calculator()
+    calc.add(Formula(b, a * 2))
+    calc.calc()
+
+    def make(through):
+        rep = Report()
+        rep.add(Note(calc))
+        if through == 'block':
+            block = Block()
+            block.add_stream(iter([Note(calc)]))
+            rep.add(block)
+        elif through == 'stream of blocks':
+            block = Block()
+            block.add_stream(iter([Note(calc)]))
+            rep.add_stream(iter([block]))
+        else:
+            rep.add_stream(iter([Note(calc)]))
+        return read_parts(BytesIO(rep.save()))
+
+    assert make('block') == make('stream of blocks') == make('report')
+
+
+# the cases of a stream are made while the report is saved, and render as
+# the same elements added one by one.
+def test_stream_taken_at_save(tmp_path):
+    from ..reporter import Block, Note, Table
+    from ..calculator import Variable, Calculator, Formula
+
+    def case(index):
+        a = Variable('a', value=index, inform='first')
+        b = Variable('b', inform='result')
+        calc = Calculator()
+        calc.add(Formula(b, a * 2))
+        calc.calc()
+        block = Block()
+        block.add_heading(f'case {index}', 1)
+        block.add_paragraph(f'case {index}')
+        block.add(Note(calc))
+        return block
+
+    def make(taken=None):
+        rep = Report()
+        rep.set_header('header')
+        later = Table([['x']], title='later')
+        rep.add_paragraph('see ', later.reference)
+        if taken is None:
+            for index in range(3):
+                for element in case(index)._element_list:
+                    rep.add(element)
+        else:
+            def cases():
+                for index in range(3):
+                    taken.append(index)
+                    yield case(index)
+            rep.add_stream(cases())
+        rep.add(later)
+        return rep
+
+    direct = read_parts(BytesIO(make().save()))
+    for mode in ['direct', 'cache', 'volume']:
+        taken = list()
+        rep = make(taken)
+        if mode == 'cache':
+            rep.set_cache(tmp_path / 'cache')
+        elif mode == 'volume':
+            rep.set_volume_limit(pages=100)
+        assert taken == []
+        data = rep.save()
+        assert read_parts(BytesIO(data[0] if mode == 'volume' else data)) == direct
+        assert taken == [0, 1, 2]
+
+
+def test_cases_match_hand_built_report():
+    from ..reporter import Procedure
+    from .test_calc import make_piecewise_calculator
+
+    calc, a, b, c = make_piecewise_calculator()
+    values = [0.5, 1.5, 2.5, 4.0]
+    rep = Report()
+    rep.add_cases(calc, {a: values}, names=['w', 'x', 'y', 'z'], detail=2, heading_level=2, title='cases')
+
+    expected = Report()
+    rows = list()
+    for name, value in zip(['w', 'x', 'y', 'z'], values):
+        a.set(value)
+        calc.calc()
+        rows.append((name, value, b.value))
+    expected.add_data_table(rows, header=['工况', 'a', 'result'], formats=[None, '.4g', '.4g'], title='cases')
+    for name, value in [('y', 2.5), ('x', 1.5)]:
+        a.set(value)
+        calc.calc()
+        expected.add_heading(name, 2)
+        expected.add(Procedure(calc))
+
+    # the values of the calculator are put back after the cases are saved
+    a.set(3.0)
+    calc.calc()
+    before = (a.value, b.value, c.value)
+    branch = calc.formula_list[1].expression
+    assert read_parts(BytesIO(rep.save())) == read_parts(BytesIO(expected.save()))
+    assert (a.value, b.value, c.value) == before
+    assert calc.formula_list[1].expression is branch
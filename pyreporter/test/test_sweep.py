@@ -0,0 +1,105 @@
+import numpy
+from ..calculator import Variable, Calculator, Formula, Sin
+from ..cases import Maximum
+from ..loader import load_inputs
+from ..sweep import run_sweep
+
+
+def make_calculator():
+    a = Variable('a')
+    q = Variable('q', 'k')
+    r = Variable('r')
+    calc = Calculator()
+    calc.add(Formula(r, a * q + Sin(a)))
+    return calc, a, q, r
+
+
+def write_csv(path, size):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('a,q_k\n')
+        for i in range(size):
+            f.write(f'{i / 10!r},{i!r}\n')
+
+
+# the chunks written one by one make the columns of a run over the whole
+# file, in npy and csv
+def test_sweep_match_run(tmp_path):
+    write_csv(tmp_path / 'cases.csv', 1000)
+    calc, a, q, r = make_calculator()
+    result = calc.run(load_inputs(tmp_path / 'cases.csv', [a, q]))
+
+    for name in ['out.npy', 'out.csv']:
+        maximum = Maximum(r)
+        count = run_sweep(calc, tmp_path / 'cases.csv', [a, q], tmp_path / name,
+                          reducer_list=[maximum], chunk_size=64)
+        assert count == 1000
+        assert maximum.value == result[r].max() and maximum.index[0] == result[r].argmax()
+        calc_, a_, q_, r_ = make_calculator()
+        output = load_inputs(tmp_path / name, [a_, q_, r_])
+        for variable, variable_ in [(a, a_), (q, q_), (r, r_)]:
+            assert numpy.array_equal(output[variable_], result[variable])
+
+
+def test_sweep_stops_on_error(tmp_path):
+    write_csv(tmp_path / 'cases.csv', 1000)
+    calc, a, q, r = make_calculator()
+
+    class Failing:
+        def update(self, result):
+            if result.index[0] >= 128:
+                raise RuntimeError('stop')
+
+    try:
+        run_sweep(calc, tmp_path / 'cases.csv', [a, q], tmp_path / 'out.npy',
+                  reducer_list=[Failing()], chunk_size=64)
+    except RuntimeError as e:
+        assert str(e) == 'stop'
+    else:
+        assert False
+    assert len(numpy.load(tmp_path / 'out.npy')) == 128
+
+
+# counts the cases it is fed, and fails after stop_at of them
+class Counter:
+    def __init__(self, stop_at=None):
+        self.count = 0
+        self.stop_at = stop_at
+
+    def update(self, result):
+        self.count += len(result)
+        if self.stop_at is not None and self.count > self.stop_at:
+            raise RuntimeError('killed')
+
+    def get_state(self):
+        return None
+
+    def set_state(self, state, calculator, input_list):
+        pass
+
+
+# a sweep broken after some chunks goes on from its last checkpoint, and
+# ends with the output and reducers of a sweep never broken.
+def test_sweep_resume_from_checkpoint(tmp_path):
+    write_csv(tmp_path / 'cases.csv', 1000)
+    calc, a, q, r = make_calculator()
+    result = calc.run(load_inputs(tmp_path / 'cases.csv', [a, q]))
+    checkpoint = tmp_path / 'sweep.checkpoint'
+
+    for name in ['out.npy', 'out.csv']:
+        maximum = Maximum(r)
+        try:
+            run_sweep(calc, tmp_path / 'cases.csv', [a, q], tmp_path / name, reducer_list=[maximum, Counter(500)],
+                      chunk_size=64, checkpoint=checkpoint, checkpoint_interval=0)
+        except RuntimeError:
+            pass
+        assert checkpoint.exists()
+
+        maximum, counter = Maximum(r), Counter()
+        count = run_sweep(calc, tmp_path / 'cases.csv', [a, q], tmp_path / name, reducer_list=[maximum, counter],
+                          chunk_size=64, checkpoint=checkpoint, checkpoint_interval=0)
+        assert count == 1000 and counter.count < 600
+        assert not checkpoint.exists()
+        assert maximum.value == result[r].max() and maximum.index[0] == result[r].argmax()
+        calc_, a_, q_, r_ = make_calculator()
+        output = load_inputs(tmp_path / name, [a_, q_, r_])
+        assert numpy.array_equal(output[r_], result[r])
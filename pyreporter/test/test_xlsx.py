@@ -0,0 +1,59 @@
+from io import BytesIO
+from zipfile import ZipFile
+from xml.etree.ElementTree import fromstring
+import numpy as np
+from ..reporter import Report
+from ..xlsx import save_xlsx, column_name
+
+NS = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+def read_sheet(data, number):
+    with ZipFile(BytesIO(data)) as z:
+        strings = [si.find('s:t', NS).text for si in fromstring(z.read('xl/sharedStrings.xml'))]
+        sheet = fromstring(z.read(f'xl/worksheets/sheet{number}.xml'))
+
+    rows = list()
+    for row in sheet.iterfind('s:sheetData/s:row', NS):
+        values = list()
+        for c in row:
+            v = c.find('s:v', NS).text
+            values.append(strings[int(v)] if c.get('t') == 's' else float(v))
+        rows.append(values)
+    return rows
+
+
+def test_save_xlsx():
+    data = save_xlsx(None, [
+        ('results', np.array([[1.5, 2.0], [3.25, -4e-8]]), ['a', 'b']),
+        ('cases', {'name': ['x < y', 'x < y', 'z'], 'value': np.arange(3)}, ['name', 'value']),
+        ('rows', iter([(1, 'p'), (2, float('nan'))]), None),
+    ])
+
+    assert read_sheet(data, 1) == [['a', 'b'], [1.5, 2.0], [3.25, -4e-8]]
+    assert read_sheet(data, 2) == [['name', 'value'], ['x < y', 0.0], ['x < y', 1.0], ['z', 2.0]]
+    assert read_sheet(data, 3) == [[1.0, 'p'], [2.0, 'nan']]
+    with ZipFile(BytesIO(data)) as z:
+        assert 'uniqueCount="8"' in z.read('xl/sharedStrings.xml').decode('utf-8')
+        assert 'name="cases"' in z.read('xl/workbook.xml').decode('utf-8')
+    assert [column_name(i) for i in [0, 25, 26, 701, 702]] == ['A', 'Z', 'AA', 'ZZ', 'AAA']
+
+
+def test_report_companion_workbook(tmp_path):
+    rep = Report()
+    rep.add_heading('results', 1)
+    rep.add_data_table(np.eye(2), header=['x', 'y'], title='cases', sheet='cases')
+    rep.add_sheet('sweep', {'h': np.linspace(0, 1, 3), 'q': np.ones(3)})
+    rep.save(str(tmp_path / 'report.docx'))
+
+    data = (tmp_path / 'report.xlsx').read_bytes()
+    assert read_sheet(data, 1) == [['x', 'y'], [1.0, 0.0], [0.0, 1.0]]
+    assert read_sheet(data, 2) == [['h', 'q'], [0.0, 1.0], [0.5, 1.0], [1.0, 1.0]]
+
+
+def test_columns_of_different_lengths():
+    import pytest
+
+    for columns in [{'a': np.arange(3), 'b': np.arange(2)}, {'a': [1, 2], 'b': iter([1, 2, 3])}]:
+        with pytest.raises(AssertionError, match='different lengths'):
+            save_xlsx(None, [('results', columns, ['a', 'b'])])
@@ -0,0 +1,607 @@
+import weakref
+from functools import lru_cache
+from .docx import DocX, Raw, FigureFile, TEXT_SIZE, PAGE_WIDTH, MIN_TABLE_CELL_WIDTH, parse_xml, serialize
+from .fragment import PAGE_BREAK_HOLDER
+import math
+
+__all__ = ['TextDocX']
+
+# runs of numbers are cached by value, the cache is cleared when it holds
+# more, as the values of many cases are seldom repeated.
+RUN_CACHE_SIZE = 65536
+
+
+# the same escaping as xml.etree.ElementTree
+def escape_text(text):
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
+
+
+def escape_attrib(text):
+    text = escape_text(text)
+    if '"' in text:
+        text = text.replace('"', '&quot;')
+    if '\r' in text:
+        text = text.replace('\r', '&#13;')
+    if '\n' in text:
+        text = text.replace('\n', '&#10;')
+    if '\t' in text:
+        text = text.replace('\t', '&#09;')
+    return text
+
+
+def element(tag, inner=''):
+    return f'<{tag}>{inner}</{tag}>' if inner else f'<{tag} />'
+
+
+# make_element drops the text which is not a string
+def text_element(tag, text, attrib=''):
+    if isinstance(text, str) and text:
+        return f'<{tag}{attrib}>{escape_text(text)}</{tag}>'
+    return f'<{tag}{attrib} />'
+
+
+# a visitor returns a string for a single element, and a list of strings
+# for a composite, as DocX returns an Element or a Composite.
+def items(ret):
+    return [ret] if isinstance(ret, str) else ret
+
+
+def join(ret):
+    return ret if isinstance(ret, str) else ''.join(ret)
+
+
+BR = '<w:r><w:br /></w:r>'
+
+BOOKMARK = ('<w:bookmarkStart w:id="{number}" w:name="{text}" />'
+            '<w:r>{type_}</w:r>'
+            '<w:r><w:t xml:space="preserve" /></w:r>'
+            '<w:fldSimple w:instr=" STYLEREF 1 \\s"><w:r><w:t>0</w:t></w:r></w:fldSimple>'
+            '<w:r><w:noBreakHyphen /></w:r>'
+            '<w:r><w:fldChar w:fldCharType="begin" /></w:r>'
+            '<w:r><w:instrText xml:space="preserve"> </w:instrText></w:r>'
+            '<w:r><w:instrText xml:space="preserve">SEQ </w:instrText></w:r>'
+            '<w:r>{instr}</w:r>'
+            '<w:r><w:instrText xml:space="preserve"> \\* ARABIC \\s 1</w:instrText></w:r>'
+            '<w:r><w:instrText xml:space="preserve" /></w:r>'
+            '<w:r><w:fldChar w:fldCharType="separate" /></w:r>'
+            '<w:r><w:t>1</w:t></w:r>'
+            '<w:r><w:fldChar w:fldCharType="end" /></w:r>'
+            '<w:bookmarkEnd w:id="{number}" />')
+
+REFERENCE = ('<w:r><w:fldChar w:fldCharType="begin" /></w:r>'
+             '<w:r><w:instrText>REF {text} \\h</w:instrText></w:r>'
+             '<w:r><w:fldChar w:fldCharType="separate" /></w:r>'
+             '<w:r><w:t>0</w:t></w:r>'
+             '<w:r><w:fldChar w:fldCharType="end" /></w:r>')
+
+BRACKETED_REFERENCE = '<w:r><w:t>(</w:t></w:r>' + REFERENCE + '<w:r><w:t>)</w:t></w:r>'
+
+FOOTNOTE_REFERENCE = ('<w:r><w:rPr><w:rStyle w:val="aa" /></w:rPr>'
+                      '<w:footnoteReference w:id="{number}" /></w:r>')
+
+FOOTNOTE = ('<w:footnote w:id="{number}"><w:p>'
+            '<w:pPr><w:pStyle w:val="a9" /></w:pPr>'
+            '<w:r><w:rPr><w:rStyle w:val="aa" /></w:rPr><w:footnoteRef /></w:r>'
+            '<w:r xml:space="preserve"> </w:r>'
+            '{content}</w:p></w:footnote>')
+
+HEADING = ('<w:p><w:pPr><w:pStyle w:val="{level}" /></w:pPr>'
+           '<w:bookmarkStart w:id="{number}" w:name="{text}" />'
+           '{content}'
+           '<w:bookmarkEnd w:id="{number}" /></w:p>')
+
+PARAGRAPH = ('<w:p><w:pPr><w:spacing w:before="156" w:after="156" /><w:ind w:firstLine="420" /></w:pPr>'
+             '{content}</w:p>')
+
+COMPACT_PARAGRAPH = '<w:p><w:pPr><w:pStyle w:val="ac" /></w:pPr>{content}</w:p>'
+
+CENTER_CELL = ('<w:tc><w:tcPr><w:vAlign w:val="center" /></w:tcPr>'
+               '<w:p><w:pPr><w:jc w:val="center" /></w:pPr>{content}</w:p></w:tc>')
+
+HEADER_ROW_PROPERTY = '<w:trPr><w:tblHeader /></w:trPr>'
+
+COMPACT_CELL = '<w:tc><w:p><w:pPr><w:pStyle w:val="ae" /></w:pPr>{content}</w:p></w:tc>'
+
+MATH_DEFINITION = ('<w:tbl><w:tblPr><w:jc w:val="center" /><w:tblLayout w:type="fixed" /></w:tblPr>'
+                   '<w:tblGrid><w:gridCol w:w="8000" /><w:gridCol w:w="1000" /></w:tblGrid>'
+                   '<w:tr><w:trPr><w:cantSplit /><w:jc w:val="center" /></w:trPr>'
+                   '{math}{bookmark}</w:tr></w:tbl>')
+
+MATH_NOTE_HEAD = '<w:p><w:r><w:t>式中：</w:t></w:r></w:p>'
+
+MATH_NOTE_PROPERTY = ('<w:pPr><w:tabs>'
+                      '<w:tab w:val="right" w:pos="500" />'
+                      '<w:tab w:val="center" w:pos="600" />'
+                      '<w:tab w:val="left" w:pos="700" />'
+                      '</w:tabs></w:pPr>')
+
+COMPACT_MATH_NOTE_PROPERTY = '<w:pPr><w:pStyle w:val="ad" /></w:pPr>'
+
+MATH_NOTE = ('<w:p>{property}'
+             '<w:r><w:tab /></w:r>{var}'
+             '<w:r><w:tab /></w:r><w:r><w:t>―</w:t></w:r>'
+             '<w:r><w:tab /></w:r><w:r>{inform}</w:r>'
+             '{unit}</w:p>')
+
+FIGURE_RUN = ('<w:r><w:drawing><wp:inline>'
+              '<wp:extent cx="{cx}" cy="{cy}" />'
+              '<wp:effectExtent l="0" t="0" r="0" b="0" />'
+              '<wp:docPr id="{fig_id}" name="image{fig_id}" />'
+              '<wp:cNvGraphicFramePr><a:graphicFrameLocks'
+              ' xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" noChangeAspect="1" />'
+              '</wp:cNvGraphicFramePr>'
+              '<a:graphic xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main">'
+              '<a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+              '<pic:pic xmlns:pic="http://schemas.openxmlformats.org/drawingml/2006/picture">'
+              '<pic:nvPicPr><pic:cNvPr id="{fig_id}" name="image{fig_id}" /><pic:cNvPicPr /></pic:nvPicPr>'
+              '<pic:blipFill><a:blip r:embed="{rel_id}" /><a:stretch><a:fillRect /></a:stretch></pic:blipFill>'
+              '<pic:spPr><a:xfrm><a:off x="0" y="0" /><a:ext cx="{cx}" cy="{cy}" /></a:xfrm>'
+              '<a:prstGeom prst="rect"><a:avLst /></a:prstGeom></pic:spPr>'
+              '</pic:pic></a:graphicData></a:graphic>'
+              '</wp:inline></w:drawing></w:r>')
+
+TABLE_TITLE = ('<w:p><w:pPr><w:pStyle w:val="a9" /><w:jc w:val="center" /><w:keepNext /></w:pPr>'
+               '{content}</w:p>')
+
+TABLE_HEAD = ('<w:tbl><w:tblPr><w:tblStyle w:val="{style}" /><w:jc w:val="center" /><w:tblLayout w:type="fixed" />'
+              '</w:tblPr>')
+
+CATALOG_TITLE = ('<w:p><w:pPr><w:jc w:val="center" /></w:pPr>'
+                 '<w:r><w:rPr><w:b /><w:sz w:val="32" /></w:rPr><w:t>目录</w:t></w:r></w:p>')
+
+CATALOG_PROPERTY = ('<w:pPr><w:pStyle w:val="{style}" />'
+                    '<w:tabs><w:tab w:val="left" w:pos="{pos}" />'
+                    '<w:tab w:val="right" w:leader="dot" w:pos="8296" /></w:tabs>'
+                    '<w:rPr><w:noProof /><w:rStyle w:val="a3" /></w:rPr></w:pPr>')
+
+CATALOG_BEGIN = ('<w:r><w:fldChar w:fldCharType="begin" /></w:r>'
+                 '<w:r><w:instrText xml:space="preserve"> </w:instrText></w:r>'
+                 '<w:r><w:instrText>TOC \\o "1-3" \\h \\z \\u</w:instrText></w:r>'
+                 '<w:r><w:instrText xml:space="preserve"> </w:instrText></w:r>'
+                 '<w:r><w:fldChar w:fldCharType="separate" /></w:r>')
+
+CATALOG_LINK = ('<w:hyperlink w:anchor="{text}" w:history="1">'
+                '<w:r><w:t>{number}</w:t></w:r><w:r><w:tab /></w:r>'
+                '{content}'
+                '<w:r><w:tab /></w:r>'
+                '<w:r><w:fldChar w:fldCharType="begin" /></w:r>'
+                '<w:r><w:instrText xml:space="preserve"> PAGEREF {text} \\h </w:instrText></w:r>'
+                '<w:r><w:fldChar w:fldCharType="separate" /></w:r>'
+                '<w:r><w:t>0</w:t></w:r>'
+                '<w:r><w:fldChar w:fldCharType="end" /></w:r>'
+                '</w:hyperlink>')
+
+
+@lru_cache(maxsize=None)
+def text_run_head(font, size, italic, bold, underline):
+    if not (font or size or italic or bold or underline):
+        return '<w:r>'
+    prop = ''
+    if font is not None:
+        prop += f'<w:rFonts w:eastAsia="{escape_attrib(font)}" />'
+    if size is not None:
+        prop += f'<w:sz w:val="{TEXT_SIZE[size]}" />'
+    if italic:
+        prop += '<w:i />'
+    if bold:
+        prop += '<w:b />'
+    return f'<w:r>{element("w:rPr", prop)}'
+
+
+@lru_cache(maxsize=None)
+def math_run_head(sty, align, color, compact):
+    head = '<m:r>'
+    if sty or align:
+        prop = ''
+        if sty:
+            prop += f'<m:sty m:val="{escape_attrib(sty)}" />'
+        if align:
+            prop += '<m:aln />'
+        head += element('m:rPr', prop)
+    if not compact or color is not None:
+        head += '<w:rPr>'
+        if not compact:
+            head += '<w:rFonts w:ascii="Cambria Math" w:hAnsi="Cambria Math" />'
+        if color is not None:
+            head += f'<w:color w:val="{escape_attrib(color)}" />'
+        head += '</w:rPr>'
+    return head
+
+
+# DocX writes the xml text directly instead of building element trees,
+# the documents of both are the same byte by byte.
+# the document level parts, e.g. cover, header and relationships, are
+# still built by DocX, contents of body are added to the parts as Raw.
+class TextDocX(DocX):
+    def __init__(self, compact=False):
+        super().__init__(compact)
+        # xml of math expressions by id, with a weak reference which drops
+        # the entry when the expression is freed, so the expressions of
+        # streams and cases are not kept alive. the symbol and formula of a
+        # Formula are the same objects in Definition and Procedure.
+        self.math_cache = dict()
+        # xml of runs and subscripts by their text and style
+        self.run_cache = dict()
+
+    def _parse_fragment_xml(self, xml):
+        return xml
+
+    # lists returned are shared, never change them
+    def _visit_math(self, exp):
+        key = id(exp)
+        entry = self.math_cache.get(key)
+        if entry is None:
+            cache = self.math_cache
+
+            def drop(ref):
+                if cache.get(key, (None,))[0] is ref:
+                    del cache[key]
+            entry = cache[key] = (weakref.ref(exp, drop), exp.visit(self))
+        return entry[1]
+
+    # ===============================================================
+    # document.xml START
+    # ---------------------------------------------------------------
+
+    def visit_composite(self, list_):
+        ret = list()
+        for ele in list_:
+            ret.extend(items(ele.visit(self)))
+        return ret
+
+    def visit_text(self, text, font, size, italic, bold, underline):
+        head = text_run_head(font, size, italic, bold, underline)
+        return f'{head}{text_element("w:t", text)}</w:r>'
+
+    def visit_inline_math(self, content):
+        return element('m:oMath', ''.join(join(self._visit_math(item)) for item in content))
+
+    def visit_inline_figure(self, *, figure, format_, width, height):
+        width = int(width * 914400)
+        height = int(height * 914400)
+
+        fig_id = len(self.figure_list) + 1
+        rel_id = self._get_rel_id().text
+
+        self.figure_list.append(FigureFile(path=f'word/media/image{fig_id}.{format_}', figure=figure))
+        self._write_relationship(id_=rel_id,
+                                 type_='http://schemas.openxmlformats.org/officeDocument/2006/relationships/image',
+                                 target=f'media/image{fig_id}.{format_}')
+
+        return FIGURE_RUN.format(cx=width, cy=height, fig_id=fig_id, rel_id=rel_id)
+
+    def visit_bookmark(self, *, type_, bookmark, left, right):
+        number, text = self._retrieve_mark_id(bookmark)
+
+        ret = BOOKMARK.format(number=number, text=text,
+                              type_=text_element('w:t', type_),
+                              instr=text_element('w:instrText', type_))
+        if left is not None:
+            ret = f'<w:r>{text_element("w:t", left)}</w:r>{ret}'
+        if right is not None:
+            ret = f'{ret}<w:r>{text_element("w:t", right)}</w:r>'
+        return [ret]
+
+    def visit_reference(self, bookmark, brackets=True):
+        template = BRACKETED_REFERENCE if brackets else REFERENCE
+        return [template.format(text=self._retrieve_mark_id(bookmark).text)]
+
+    def visit_footnote(self, content):
+        number, _ = self._get_footnote_id()
+
+        # keep the place, footnotes inside come after this one
+        foot = Raw('')
+        self.footnotes_elements.add(foot)
+        foot.xml = FOOTNOTE.format(number=number, content=join(content.visit(self)))
+
+        return FOOTNOTE_REFERENCE.format(number=number)
+
+    def visit_heading(self, *, content, level, heading):
+        number, text = self._retrieve_mark_id(heading)
+
+        body = self.body_elements
+        if level == 1:
+            if len(self.catalog_elements) > 0:
+                body.add(self._make_page_break())
+            elif self.fragment:
+                body.add(Raw(PAGE_BREAK_HOLDER))
+
+        body.add(Raw(HEADING.format(level=level, number=number, text=text,
+                                    content=join(content.visit(self)))))
+
+        if level <= 3:
+            catalog_content = join(content.visit(self))
+            if self.fragment:
+                self.fragment_catalog_list.append((level, int(number), Raw(catalog_content)))
+            self._write_catalog_entry(level, text, catalog_content)
+
+    def visit_paragraph(self, content):
+        template = COMPACT_PARAGRAPH if self.compact else PARAGRAPH
+        self.body_elements.add(Raw(template.format(content=join(content.visit(self)))))
+
+    def _make_math_para(self, content):
+        return element('m:oMathPara', BR.join(join(line.visit(self)) for line in content))
+
+    def visit_standalone_math(self, content):
+        self.body_elements.add(Raw(f'<w:p>{self._make_math_para(content)}</w:p>'))
+
+    def visit_math_definition(self, content, bookmark):
+        m_p = self._make_math_para(content)
+        self.body_elements.add(Raw(MATH_DEFINITION.format(
+            math=CENTER_CELL.format(content=m_p),
+            bookmark=CENTER_CELL.format(content=join(bookmark.visit(self))))))
+
+    def visit_math_procedure(self, content):
+        self.body_elements.add(Raw(f'<w:p>{self._make_math_para(content)}</w:p>'))
+
+    def visit_math_note(self, var_list):
+        body = self.body_elements
+        prop = COMPACT_MATH_NOTE_PROPERTY if self.compact else MATH_NOTE_PROPERTY
+        if len(var_list) > 0:
+            body.add(Raw(MATH_NOTE_HEAD))
+        for var in var_list:
+            var_xml = element('m:oMath', join(self._visit_math(var)))
+            if var.unit is not None:
+                unit = '<w:r><w:t>，</w:t></w:r>' + element('m:oMath', join(self._visit_math(var.unit)))
+            else:
+                unit = ''
+            body.add(Raw(MATH_NOTE.format(property=prop, var=var_xml, inform=text_element('w:t', var.inform), unit=unit)))
+
+    def visit_figure(self, figure, format_, width, height, title):
+        prop = '<w:pPr><w:jc w:val="center" /><w:keepNext /></w:pPr>' if title is not None \
+            else '<w:pPr><w:jc w:val="center" /></w:pPr>'
+        run = self.visit_inline_figure(figure=figure, format_=format_, width=width, height=height)
+        self.body_elements.add(Raw(f'<w:p>{prop}{run}</w:p>'))
+
+        if title is not None:
+            self.body_elements.add(Raw(f'<w:p><w:pPr><w:pStyle w:val="a9" /></w:pPr>'
+                                       f'{join(title.visit(self))}</w:p>'))
+
+    def visit_table(self, content_by_rows, title, header_rows=0):
+        cell_template = COMPACT_CELL if self.compact else CENTER_CELL
+        parts = self._make_table(len(content_by_rows[0]), title)
+        for i, row in enumerate(content_by_rows):
+            cells = ''.join(cell_template.format(content=join(cell.visit(self))) for cell in row)
+            parts.append(element('w:tr', HEADER_ROW_PROPERTY + cells if i < header_rows else cells))
+        parts.append('</w:tbl>')
+        self.body_elements.add(Raw(''.join(parts)))
+
+    def visit_data_table(self, header, rows, column_count, title):
+        cell_head, cell_tail = (COMPACT_CELL if self.compact else CENTER_CELL).split('{content}')
+        cell_head += '<w:r>'
+        cell_tail = '</w:r>' + cell_tail
+        parts = self._make_table(column_count, title)
+        if header is not None:
+            parts.append('<w:tr>' + HEADER_ROW_PROPERTY)
+            for text in header:
+                parts.append(cell_head + text_element('w:t', text) + cell_tail)
+            parts.append('</w:tr>')
+        for row in rows:
+            parts.append('<w:tr>')
+            for text in row:
+                parts.append(cell_head + text_element('w:t', text) + cell_tail)
+            parts.append('</w:tr>')
+        parts.append('</w:tbl>')
+        self.body_elements.add(Raw(''.join(parts)))
+
+    def _make_table(self, column_count, title):
+        width = min(PAGE_WIDTH // column_count,
+                    MIN_TABLE_CELL_WIDTH)
+
+        if title is not None:
+            self.body_elements.add(Raw(TABLE_TITLE.format(content=join(title.visit(self)))))
+
+        return [TABLE_HEAD.format(style='af' if self.compact else 'ab'),
+                '<w:tblGrid>', f'<w:gridCol w:w="{width}" />' * column_count, '</w:tblGrid>']
+
+    def _write_catalog_entry(self, level, text, content):
+        log = self.catalog_elements
+
+        para = '<w:p>' + CATALOG_PROPERTY.format(style=level * 10, pos=420 + 630 * (level - 1))
+        if len(log) == 0:
+            log.add(Raw(CATALOG_TITLE))
+            para += CATALOG_BEGIN
+
+        number = self._get_catalog_number(level)
+        para += CATALOG_LINK.format(text=text, number=number, content=content) + '</w:p>'
+        log.add(Raw(para))
+
+    # ---------------------------------------------------------------
+    # document.xml END
+    # ===============================================================
+
+    # ===============================================================
+    # math START
+    # ---------------------------------------------------------------
+
+    def _make_operator(self, left, operator, right):
+        return items(self._visit_math(left)) + [self._make_m_r(operator, sty='p')] + items(self._visit_math(right))
+
+    def visit_negative(self, exp):
+        return [self._make_m_r('-', sty='p')] + items(self._visit_math(exp))
+
+    def visit_add(self, left, right):
+        return self._make_operator(left, '+', right)
+
+    def visit_sub(self, left, right):
+        return self._make_operator(left, '-', right)
+
+    def visit_mul(self, left, right):
+        return self._make_operator(left, '⋅', right)
+
+    def visit_div(self, left, right, type_='bar'):
+        return (f'<m:f><m:fPr><m:type m:val="{type_}" /></m:fPr>'
+                f'{element("m:num", join(self._visit_math(left)))}'
+                f'{element("m:den", join(self._visit_math(right)))}</m:f>')
+
+    def visit_pow(self, exp, index):
+        ret_exp = self._visit_math(exp)
+        if isinstance(ret_exp, list):
+            if ret_exp[0].startswith('<m:sSub>'):
+                sup = element('m:sup', join(self._visit_math(index)))
+                return [f'<m:sSubSup>{ret_exp[0][8:-9]}{sup}</m:sSubSup>'] + ret_exp[1:]
+        elif ret_exp[ret_exp.index('>') + 1:].startswith('<m:sSub>'):
+            # the first child of a single element, which is rare enough
+            # to be done on the elements.
+            ele = parse_xml(ret_exp).elements[0]
+            ele[0].tag = 'm:sSubSup'
+            ele[0].add(self._to_elements('m:sup', self._visit_math(index)))
+            return serialize([ele])
+        return self._make_m_sSup(exp, index)
+
+    def _to_elements(self, tag, ret):
+        return parse_xml(element(tag, join(ret))).elements[0]
+
+    def visit_radical(self, exp, index):
+        if index.value == 2:
+            return (f'<m:rad><m:radPr><m:degHide m:val="on" /></m:radPr>'
+                    f'{element("m:e", join(self._visit_math(exp)))}</m:rad>')
+        return (f'<m:rad><m:radPr />{element("m:deg", join(self._visit_math(index)))}'
+                f'{element("m:e", join(self._visit_math(exp)))}</m:rad>')
+
+    def visit_lesser_than(self, left, right):
+        return self._make_operator(left, '<', right)
+
+    def visit_lesser_or_equal(self, left, right):
+        return self._make_operator(left, '≤', right)
+
+    def visit_equal(self, left, right):
+        return self._make_operator(left, '=', right)
+
+    def visit_not_equal(self, left, right):
+        return self._make_operator(left, '≠', right)
+
+    def visit_greater_than(self, left, right):
+        return self._make_operator(left, '>', right)
+
+    def visit_greater_or_equal(self, left, right):
+        return self._make_operator(left, '≥', right)
+
+    # numbers of procedures are new objects every time, they are cached by
+    # value. the type is in the key as 1 == 1.0 but f'{1}' != f'{1.0}'.
+    def visit_number(self, value, precision):
+        key = ('number', type(value), value, precision)
+        if key not in self.run_cache:
+            if len(self.run_cache) > RUN_CACHE_SIZE:
+                self.run_cache.clear()
+            self.run_cache[key] = self._make_number(value, precision)
+        return self.run_cache[key]
+
+    def _make_number(self, value, precision):
+        if abs(value) < 1e-10:
+            ret = self._make_m_r('0')
+        elif abs(value) > 10000 or abs(value) < 0.001 and value != 0:
+            sup = math.floor(math.log10(abs(value)))
+            base = value / math.pow(10, sup)
+            ret = [self._make_m_r(f'{base:.2f}'),
+                   self._make_m_r('⋅', sty='p'),
+                   self._make_m_sSup('10', f'{sup}')]
+        else:
+            if precision is None:
+                value = f'{value}'
+            elif precision == 'auto':
+                if isinstance(value, int):
+                    value = f'{value}'
+                elif abs(value) > 1:
+                    value = f'{value:.3f}'
+                else:
+                    precision = abs(math.floor(math.log10(abs(value)))) + 2
+                    value = f'{value:.{precision}f}'
+            else:
+                value = f'{value:.{precision}f}'
+            ret = self._make_m_r(value)
+
+        return ret
+
+    def visit_serial_variable(self, var, sub, index):
+        if sub is None:
+            return self._make_m_sSub(var, f'{index}')
+        elif isinstance(sub, str):
+            return self._make_m_sSub(var, sub + f'-{index}')
+        else:
+            return (f'<m:sSub><m:e>{self._make_m_r(var)}</m:e>'
+                    f'<m:sub>{join(self._visit_math(sub))}{self._make_m_r(f"-{index}")}</m:sub></m:sSub>')
+
+    def visit_multi_line(self, list_, included):
+        arr = element('m:eqArr', ''.join(element('m:e', join(self._visit_math(item))) for item in list_))
+        if included is None:
+            return arr
+        elif included == 'left':
+            return f'<m:d><m:dPr><m:begChr m:val="{{" /><m:endChr m:val="" /></m:dPr><m:e>{arr}</m:e></m:d>'
+        elif included == 'right':
+            return f'<m:d><m:dPr><m:begChr m:val="" /><m:endChr m:val="}}" /></m:dPr><m:e>{arr}</m:e></m:d>'
+        else:
+            raise TypeError('Unknown included type: %s in math multi line' % included)
+
+    def _make_m_r(self, text, *, sty=None, align=False, color=None):
+        key = (text, sty, align, color)
+        if key not in self.run_cache:
+            self.run_cache[key] = f'{math_run_head(sty, align, color, self.compact)}{text_element("m:t", text)}</m:r>'
+        return self.run_cache[key]
+
+    def _make_m_sSub(self, base, sub):
+        if isinstance(base, str) and isinstance(sub, str):
+            key = ('sSub', base, sub)
+            if key not in self.run_cache:
+                self.run_cache[key] = (f'<m:sSub><m:e>{self._make_m_r(base)}</m:e>'
+                                       f'{element("m:sub", self._make_m_r(sub))}</m:sSub>')
+            return self.run_cache[key]
+        base = self._make_m_r(base) if isinstance(base, str) else join(self._visit_math(base))
+        sub = self._make_m_r(sub) if isinstance(sub, str) else join(self._visit_math(sub))
+        return f'<m:sSub>{element("m:e", base)}{element("m:sub", sub)}</m:sSub>'
+
+    def _make_m_sSup(self, base, sup):
+        if isinstance(base, str):
+            base = self._make_m_r(base)
+        else:
+            base = self._visit_math(base)
+            if isinstance(base, list):
+                wrap = base[-1].startswith('<m:sSup>')
+            else:
+                # the last child of a single element
+                wrap = base.endswith('</m:sSup></' + base[1:base.index('>')].split(' ')[0] + '>')
+            base = join(base)
+            if wrap:
+                base = f'<m:d><m:dPr><m:begChr m:val="(" /><m:endChr m:val=")" /></m:dPr><m:e>{base}</m:e></m:d>'
+        sup = self._make_m_r(sup) if isinstance(sup, str) else join(self._visit_math(sup))
+        return f'<m:sSup>{element("m:e", base)}{element("m:sup", sup)}</m:sSup>'
+
+    def _make_m_func(self, name, exp):
+        return (f'<m:func><m:fName>{self._make_m_r(name, sty="p")}</m:fName>'
+                f'<m:e>{self._make_m_d(exp, left="(", right=")")}</m:e></m:func>')
+
+    def _make_m_d(self, *exps, left=None, right=None):
+        pr = ''
+        if left is not None:
+            pr += f'<m:begChr m:val="{escape_attrib(left)}" />'
+        if right is not None:
+            pr += f'<m:endChr m:val="{escape_attrib(right)}" />'
+        e = ''.join(element('m:e', join(self._visit_math(exp))) for exp in exps)
+        return f'<m:d>{element("m:dPr", pr)}{e}</m:d>'
+
+    def _make_m_nary(self, exp, sub=None, sup=None, name=None, limLoc='subSup'):
+        pr = ''
+        if name:
+            pr += f'<m:chr m:val="{escape_attrib(name)}" />'
+        if sub is None:
+            pr += '<m:subHide m:val="on" />'
+        if sup is None:
+            pr += '<m:supHide m:val="on" />'
+        pr += '<m:ctrlPr><w:rPr><w:i /></w:rPr></m:ctrlPr>'
+
+        ret = f'<m:nary><m:naryPr>{pr}</m:naryPr>'
+        if sub is not None:
+            ret += element('m:sub', join(self._visit_math(sub)))
+        if sup is not None:
+            ret += element('m:sup', join(self._visit_math(sup)))
+        return ret + element('m:e', join(self._visit_math(exp))) + '</m:nary>'
+
+    # ---------------------------------------------------------------
+    # math END
+    # ===============================================================
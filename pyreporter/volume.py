@@ -0,0 +1,125 @@
+import os
+import shutil
+from io import BytesIO
+from tempfile import NamedTemporaryFile
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED
+from .walker import Walker
+from .docx import COPY_CHUNK_SIZE
+
+__all__ = ['PageCounter', 'VolumeSplitter', 'resolve_volume']
+
+# a4 paper with the margins of the section, in lines of the document grid
+PAGE_LINES = (16838 - 1440 * 2) // 312
+CHARACTERS_PER_LINE = 38
+LINES_PER_INCH = 1440 / 312
+
+
+# estimate the pages of a slice of report from the counts of its elements,
+# without rendering it. a line of math takes about two lines of text.
+class PageCounter(Walker):
+    def __init__(self):
+        self.lines = 0
+
+    @property
+    def pages(self):
+        return self.lines / PAGE_LINES
+
+    def visit_heading(self, *, content, level, heading):
+        self.lines += 2
+        super().visit_heading(content=content, level=level, heading=heading)
+
+    def visit_paragraph(self, content):
+        self.lines += 1
+        super().visit_paragraph(content)
+
+    def visit_standalone_math(self, content):
+        self.lines += 2 * len(content)
+        super().visit_standalone_math(content)
+
+    def visit_math_definition(self, content, bookmark):
+        self.lines += 2 * len(content)
+        super().visit_math_definition(content, bookmark)
+
+    def visit_math_procedure(self, content):
+        self.lines += 2 * len(content)
+        super().visit_math_procedure(content)
+
+    def visit_math_note(self, var_list):
+        self.lines += 1 + len(var_list)
+        super().visit_math_note(var_list)
+
+    def visit_figure(self, figure, format_, width, height, title):
+        self.lines += height * LINES_PER_INCH + 1
+        super().visit_figure(figure, format_, width, height, title)
+
+    def visit_table(self, content_by_rows, title, header_rows=0):
+        self.lines += len(content_by_rows) + 1
+        super().visit_table(content_by_rows, title, header_rows)
+
+    def visit_data_table(self, header, rows, column_count, title):
+        self.lines += 2
+        super().visit_data_table(header, rows, column_count, title)
+
+    def node(self, kind, *values):
+        if kind == 'row' and len(values) > 0 and isinstance(values[0], str):
+            # rows of data table hold the formatted strings
+            self.lines += 1
+        elif kind == 'text':
+            self.lines += len(values[0]) / CHARACTERS_PER_LINE
+        elif kind == 'multi line':
+            self.lines += 2 * (values[0] - 1)
+
+
+# a volume is closed before the chapter which would take it over the
+# pages or the bytes of document.xml given, the chapters are added one by
+# one as they are rendered. a chapter over the limit by itself makes a
+# volume alone.
+class VolumeSplitter:
+    def __init__(self, pages=None, size=None):
+        self.pages = pages
+        self.size = size
+        self.volume_pages = self.volume_size = 0
+        self.empty = True
+
+    # True when the chapter starts a new volume
+    def add(self, chapter_pages, chapter_size):
+        over = (self.pages is not None and self.volume_pages + chapter_pages > self.pages
+                or self.size is not None and self.volume_size + chapter_size > self.size)
+        new = over and not self.empty
+        if new:
+            self.volume_pages = self.volume_size = 0
+        self.volume_pages += chapter_pages
+        self.volume_size += chapter_size
+        self.empty = False
+        return new
+
+
+_FIELD_PARTS = ('word/document.xml', 'word/footnotes.xml')
+
+
+# resolve the references of a saved volume to the volumes saved after it,
+# by the resolver of the volume. the parts holding the fields are written
+# again, the others, as the figures, are copied as they are. target is the
+# path of the volume, or the docx as bytes, which is returned resolved.
+def resolve_volume(target, resolver):
+    if isinstance(target, bytes):
+        src, dst = BytesIO(target), BytesIO()
+    else:
+        src = target
+        dst = NamedTemporaryFile('wb', dir=os.path.dirname(os.path.abspath(target)),
+                                 suffix='.tmp', delete=False)
+    with ZipFile(src) as zin, ZipFile(dst, 'w', ZIP_DEFLATED) as zout:
+        for info in zin.infolist():
+            copy = ZipInfo(info.filename, info.date_time)
+            copy.compress_type = info.compress_type
+            if info.filename in _FIELD_PARTS:
+                xml = resolver.resolve_references(zin.read(info).decode('utf-8'))
+                zout.writestr(copy, xml.encode('utf-8'))
+            else:
+                with zin.open(info) as f, zout.open(copy, 'w', force_zip64=True) as g:
+                    shutil.copyfileobj(f, g, COPY_CHUNK_SIZE)
+    if isinstance(target, bytes):
+        return dst.getvalue()
+    dst.close()
+    os.replace(dst.name, target)
+    return target
@@ -0,0 +1,223 @@
+__all__ = ['Walker']
+
+
+# walker is a visitor which goes through every element of report,
+# content and math expression without building anything.
+# subclasses watch the report by overriding node() or the visit methods.
+class Walker:
+    def node(self, kind, *values):
+        pass
+
+    def _visit(self, item):
+        if item is None:
+            self.node('none')
+        elif isinstance(item, str):
+            self.node('str', item)
+        else:
+            item.visit(self)
+
+    # ===============================================================
+    # report START
+    # ---------------------------------------------------------------
+
+    def visit_cover(self, **kwargs):
+        self.node('cover', *sorted(kwargs.items()))
+
+    def visit_header(self, header):
+        self.node('header', header)
+
+    def visit_heading(self, *, content, level, heading):
+        self.node('heading', level)
+        self._visit(content)
+
+    def visit_paragraph(self, content):
+        self.node('paragraph')
+        content.visit(self)
+
+    def visit_standalone_math(self, content):
+        self.node('standalone math')
+        content.visit(self)
+
+    def visit_math_definition(self, content, bookmark):
+        self.node('math definition')
+        content.visit(self)
+        bookmark.visit(self)
+
+    def visit_math_procedure(self, content):
+        self.node('math procedure')
+        content.visit(self)
+
+    def visit_math_note(self, var_list):
+        self.node('math note', len(var_list))
+        for var in var_list:
+            var.visit(self)
+            self._visit(var.inform)
+            self._visit(var.unit)
+
+    def visit_figure(self, figure, format_, width, height, title):
+        self.node('figure', format_, width, height)
+        self._visit(title)
+
+    def visit_table(self, content_by_rows, title, header_rows=0):
+        self.node('table', len(content_by_rows), header_rows)
+        for row in content_by_rows:
+            self.node('row', len(row))
+            for cell in row:
+                cell.visit(self)
+        self._visit(title)
+
+    def visit_data_table(self, header, rows, column_count, title):
+        self.node('data table', column_count, header)
+        for row in rows:
+            self.node('row', *row)
+        self._visit(title)
+
+    # ---------------------------------------------------------------
+    # report END
+    # ===============================================================
+
+    # ===============================================================
+    # content START
+    # ---------------------------------------------------------------
+
+    def visit_composite(self, list_):
+        self.node('composite', len(list_))
+        for item in list_:
+            item.visit(self)
+
+    def visit_text(self, text, font, size, italic, bold, underline):
+        self.node('text', text, font, size, italic, bold, underline)
+
+    def visit_inline_math(self, content):
+        self.node('inline math')
+        content.visit(self)
+
+    def visit_inline_figure(self, *, figure, format_, width, height):
+        self.node('inline figure', format_, width, height)
+
+    def visit_bookmark(self, *, type_, bookmark, left, right):
+        self.node('bookmark', type_, left, right)
+
+    def visit_reference(self, bookmark, brackets=True):
+        self.node('reference', brackets)
+
+    def visit_footnote(self, content):
+        self.node('footnote')
+        content.visit(self)
+
+    # ---------------------------------------------------------------
+    # content END
+    # ===============================================================
+
+    # ===============================================================
+    # math START
+    # ---------------------------------------------------------------
+
+    def _visit_operator(self, kind, *exps):
+        self.node(kind)
+        for exp in exps:
+            exp.visit(self)
+
+    def visit_negative(self, exp):
+        self._visit_operator('negative', exp)
+
+    def visit_add(self, left, right):
+        self._visit_operator('add', left, right)
+
+    def visit_sub(self, left, right):
+        self._visit_operator('sub', left, right)
+
+    def visit_mul(self, left, right):
+        self._visit_operator('mul', left, right)
+
+    def visit_div(self, left, right):
+        self._visit_operator('div', left, right)
+
+    def visit_flat_div(self, left, right):
+        self._visit_operator('flat div', left, right)
+
+    def visit_pow(self, exp, index):
+        self._visit_operator('pow', exp, index)
+
+    def visit_radical(self, exp, index):
+        self._visit_operator('radical', exp, index)
+
+    def visit_lesser_than(self, left, right):
+        self._visit_operator('lesser than', left, right)
+
+    def visit_lesser_or_equal(self, left, right):
+        self._visit_operator('lesser or equal', left, right)
+
+    def visit_equal(self, left, right):
+        self._visit_operator('equal', left, right)
+
+    def visit_not_equal(self, left, right):
+        self._visit_operator('not equal', left, right)
+
+    def visit_greater_than(self, left, right):
+        self._visit_operator('greater than', left, right)
+
+    def visit_greater_or_equal(self, left, right):
+        self._visit_operator('greater or equal', left, right)
+
+    def visit_sin(self, exp):
+        self._visit_operator('sin', exp)
+
+    def visit_cos(self, exp):
+        self._visit_operator('cos', exp)
+
+    def visit_tan(self, exp):
+        self._visit_operator('tan', exp)
+
+    def visit_cot(self, exp):
+        self._visit_operator('cot', exp)
+
+    def visit_arcsin(self, exp):
+        self._visit_operator('arcsin', exp)
+
+    def visit_arccos(self, exp):
+        self._visit_operator('arccos', exp)
+
+    def visit_arctan(self, exp):
+        self._visit_operator('arctan', exp)
+
+    def visit_arccot(self, exp):
+        self._visit_operator('arccot', exp)
+
+    def visit_parenthesis(self, exp):
+        self._visit_operator('parenthesis', exp)
+
+    def visit_square_bracket(self, exp):
+        self._visit_operator('square bracket', exp)
+
+    def visit_brace(self, exp):
+        self._visit_operator('brace', exp)
+
+    def visit_sum(self, exp):
+        self._visit_operator('sum', exp)
+
+    def visit_variable(self, var, sub):
+        self.node('variable', var)
+        self._visit(sub)
+
+    def visit_serial_variable(self, var, sub, index):
+        self.node('serial variable', var, index)
+        self._visit(sub)
+
+    def visit_number(self, value, precision):
+        self.node('number', value, precision)
+
+    def visit_unit(self, symbol):
+        self.node('unit', symbol)
+
+    def visit_math_text(self, text, align, sty, color):
+        self.node('math text', text, align, sty, color)
+
+    def visit_multi_line(self, list_, included):
+        self.node('multi line', len(list_), included)
+        for item in list_:
+            item.visit(self)
+
+    # ---------------------------------------------------------------
+    # math END
+    # ===============================================================
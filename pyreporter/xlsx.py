@@ -0,0 +1,242 @@
+from zipfile import ZipFile, ZIP_DEFLATED
+from io import BytesIO
+import itertools
+import math
+import re
+from .textdocx import escape_text, escape_attrib
+
+__all__ = ['XlsxWriter', 'save_xlsx']
+
+ROW_CHUNK_SIZE = 1024
+
+CONTENT_TYPES = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                 '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                 '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                 '<Default Extension="xml" ContentType="application/xml"/>'
+                 '<Override PartName="/xl/workbook.xml" '
+                 'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                 '<Override PartName="/xl/styles.xml" '
+                 'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+                 '<Override PartName="/xl/sharedStrings.xml" '
+                 'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+                 '{sheets}</Types>')
+
+SHEET_CONTENT_TYPE = ('<Override PartName="/xl/worksheets/sheet{number}.xml" '
+                      'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>')
+
+RELS = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/></Relationships>')
+
+WORKBOOK = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<sheets>{sheets}</sheets></workbook>')
+
+WORKBOOK_SHEET = '<sheet name="{name}" sheetId="{number}" r:id="rId{number}"/>'
+
+WORKBOOK_RELS = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                 '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                 '{sheets}'
+                 '<Relationship Id="rId{styles}" '
+                 'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+                 'Target="styles.xml"/>'
+                 '<Relationship Id="rId{strings}" '
+                 'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" '
+                 'Target="sharedStrings.xml"/></Relationships>')
+
+WORKBOOK_SHEET_REL = ('<Relationship Id="rId{number}" '
+                      'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                      'Target="worksheets/sheet{number}.xml"/>')
+
+STYLES = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+          '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+          '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+          '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+          '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+          '<fill><patternFill patternType="gray125"/></fill></fills>'
+          '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+          '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+          '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+          '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+          '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+          '</styleSheet>')
+
+SHEET_HEAD = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+              '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+              '{pane}<sheetData>')
+
+# the header rows stay on the screen when scrolling
+FROZEN_PANE = ('<sheetViews><sheetView workbookViewId="0">'
+               '<pane ySplit="{rows}" topLeftCell="A{top}" activePane="bottomLeft" state="frozen"/>'
+               '</sheetView></sheetViews>')
+
+SHEET_TAIL = '</sheetData></worksheet>'
+
+SHARED_STRINGS_HEAD = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                       '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                       'count="{count}" uniqueCount="{unique}">')
+
+# the cell of a column shorter than the others
+_MISSING = object()
+
+# characters not allowed in xml 1.0
+_ILLEGAL_CHARACTER = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# sheet names are at most 31 characters, without []:*?/\
+_ILLEGAL_SHEET_NAME = re.compile(r'[\[\]:*?/\\]')
+
+
+def column_name(index):
+    name = ''
+    index += 1
+    while index > 0:
+        index, rest = divmod(index - 1, 26)
+        name = chr(ord('A') + rest) + name
+    return name
+
+
+# data is a 2-d numpy array, an iterable of rows, or a mapping of column
+# name to column, whose columns have the same length. numbers of the arrays
+# are converted a chunk at a time.
+def iter_rows(data):
+    if hasattr(data, 'ndim') and hasattr(data, 'tolist'):
+        assert data.ndim == 2
+        for start in range(0, len(data), ROW_CHUNK_SIZE):
+            yield from data[start:start + ROW_CHUNK_SIZE].tolist()
+    elif hasattr(data, 'keys'):
+        column_list = [data[key] for key in data.keys()]
+        if all(hasattr(column, 'tolist') for column in column_list):
+            length_set = {len(column) for column in column_list}
+            assert len(length_set) <= 1, 'the columns have different lengths'
+            length = length_set.pop() if length_set else 0
+            for start in range(0, length, ROW_CHUNK_SIZE):
+                yield from zip(*[column[start:start + ROW_CHUNK_SIZE].tolist() for column in column_list])
+        else:
+            # the columns may be iterators, their lengths are known at the end
+            for row in itertools.zip_longest(*column_list, fillvalue=_MISSING):
+                assert all(value is not _MISSING for value in row), 'the columns have different lengths'
+                yield row
+    else:
+        yield from data
+
+
+# the workbook is written into the zip file as the rows come, so only the
+# shared strings are kept in memory. strings are shared since the text of
+# results repeats a lot, as names of the cases or units.
+class XlsxWriter:
+    def __init__(self, file):
+        self.zip = ZipFile(file, 'w', ZIP_DEFLATED)
+        self.sheet_list = list()
+        self.string_dict = dict()
+        self.string_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.zip.close()
+
+    def add_sheet(self, name, data, header=None):
+        name = _ILLEGAL_SHEET_NAME.sub('_', name)[:31] or f'Sheet{len(self.sheet_list) + 1}'
+        assert name.lower() not in (n.lower() for n in self.sheet_list), f'duplicate sheet name {name}'
+        self.sheet_list.append(name)
+        number = len(self.sheet_list)
+
+        rows = iter_rows(data)
+        header_rows = 0
+        if header is not None:
+            rows = itertools.chain([header], rows)
+            header_rows = 1
+        pane = FROZEN_PANE.format(rows=header_rows, top=header_rows + 1) if header_rows else ''
+
+        column_names = list()
+        with self.zip.open(f'xl/worksheets/sheet{number}.xml', 'w', force_zip64=True) as f:
+            f.write(SHEET_HEAD.format(pane=pane).encode('utf-8'))
+            buffer = list()
+            for i, row in enumerate(rows, start=1):
+                row = list(row)
+                while len(column_names) < len(row):
+                    column_names.append(column_name(len(column_names)))
+                style = ' s="1"' if i <= header_rows else ''
+                buffer.append(f'<row r="{i}">')
+                for column, value in zip(column_names, row):
+                    # the numbers are most of the cells
+                    kind = type(value)
+                    if kind is int or kind is float and math.isfinite(value):
+                        buffer.append(f'<c r="{column}{i}"{style}><v>{value!r}</v></c>')
+                    else:
+                        buffer.append(self._cell(f'{column}{i}', value, style))
+                buffer.append('</row>')
+                if i % ROW_CHUNK_SIZE == 0:
+                    f.write(''.join(buffer).encode('utf-8'))
+                    buffer.clear()
+            f.write(''.join(buffer).encode('utf-8'))
+            f.write(SHEET_TAIL.encode('utf-8'))
+
+    def _cell(self, ref, value, style):
+        if value is None:
+            return ''
+        if hasattr(value, 'item'):
+            # numpy scalar
+            value = value.item()
+        if isinstance(value, bool):
+            return f'<c r="{ref}"{style} t="b"><v>{int(value)}</v></c>'
+        if isinstance(value, (int, float)) and math.isfinite(value):
+            return f'<c r="{ref}"{style}><v>{value!r}</v></c>'
+        return f'<c r="{ref}"{style} t="s"><v>{self._string_index(str(value))}</v></c>'
+
+    def _string_index(self, text):
+        self.string_count += 1
+        index = self.string_dict.get(text)
+        if index is None:
+            index = len(self.string_dict)
+            self.string_dict[text] = index
+        return index
+
+    def close(self):
+        if len(self.sheet_list) == 0:
+            self.add_sheet('Sheet1', [])
+        count = len(self.sheet_list)
+        z = self.zip
+        z.writestr('[Content_Types].xml', CONTENT_TYPES.format(
+            sheets=''.join(SHEET_CONTENT_TYPE.format(number=i) for i in range(1, count + 1))))
+        z.writestr('_rels/.rels', RELS)
+        z.writestr('xl/workbook.xml', WORKBOOK.format(
+            sheets=''.join(WORKBOOK_SHEET.format(name=escape_attrib(name), number=i)
+                           for i, name in enumerate(self.sheet_list, start=1))))
+        z.writestr('xl/_rels/workbook.xml.rels', WORKBOOK_RELS.format(
+            sheets=''.join(WORKBOOK_SHEET_REL.format(number=i) for i in range(1, count + 1)),
+            styles=count + 1, strings=count + 2))
+        z.writestr('xl/styles.xml', STYLES)
+
+        with z.open('xl/sharedStrings.xml', 'w', force_zip64=True) as f:
+            f.write(SHARED_STRINGS_HEAD.format(count=self.string_count,
+                                               unique=len(self.string_dict)).encode('utf-8'))
+            buffer = list()
+            for text in self.string_dict:
+                text = escape_text(_ILLEGAL_CHARACTER.sub('', text))
+                space = ' xml:space="preserve"' if text != text.strip() else ''
+                buffer.append(f'<si><t{space}>{text}</t></si>')
+                if len(buffer) == ROW_CHUNK_SIZE:
+                    f.write(''.join(buffer).encode('utf-8'))
+                    buffer.clear()
+            f.write(''.join(buffer).encode('utf-8'))
+            f.write(b'</sst>')
+        z.close()
+
+
+# sheet_list holds (name, data, header).
+# path is a path or a file object, with None the workbook is returned as bytes.
+def save_xlsx(path, sheet_list):
+    file = BytesIO() if path is None else path
+    with XlsxWriter(file) as writer:
+        for name, data, header in sheet_list:
+            writer.add_sheet(name, data, header)
+    if path is None:
+        return file.getvalue()